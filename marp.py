@@ -9,18 +9,12 @@ GitHub: https://github.com/Ggorets0dev/maid-readings-processor
 __VERSION__ = "0.28.1"
 
 import sys
-import pyfiglet
 from colorama import init
 from models.exceptions import CalledAsModuleError, user_exception_hook
 from tools.command_parser import CommandParser
-from tools.subparsers.show_subparser import ShowSubParser
-from tools.subparsers.check_subparser import CheckSubParser
-from tools.subparsers.reduce_subparser import ReduceSubParser
-from tools.subparsers.calc_subparser import CalcSubParser
-from tools.subparsers.template_subparser import TemplateSubParser
-from tools.subparsers.split_subparser import SplitSubParser
-from tools.subparsers.alias_subparser import AliasSubParser
-from tools.subparsers.graph_subparser import GraphSubParser
+from tools.command_registry import CommandRegistry
+from tools.display_utils import Color
+from tools.profiler import Profiler
 
 # NOTE - Colorama initialization for Windows
 init()
@@ -29,43 +23,29 @@ init()
 sys.excepthook = user_exception_hook
 
 if __name__ == "__main__":
-    parser = CommandParser.create_parser()
+    parser = CommandParser.create_parser(sys.argv[1:])
     namespace = parser.parse_args(sys.argv[1:])
+    Color.set_enabled(not namespace.no_color and sys.stdout.isatty())
 
     if namespace.version:
+        # NOTE - Fonts are loaded only to display the version
+        import pyfiglet
         print(pyfiglet.figlet_format('marp', font = 'ogre'), end='')
         print(f"Version: {__VERSION__}")
         print("Developer: Ggorets0dev <nikgorets4work@gmail.com>")
         print("GitHub: https://github.com/Ggorets0dev/maid-readings-processor")
 
     # SECTION - Processing commands from subparsers
-    elif namespace.command == 'show':
-        ShowSubParser.run_show(namespace)
-    
-    elif namespace.command == 'check':
-        CheckSubParser.run_check(namespace)
-
-    elif namespace.command == 'reduce':
-        ReduceSubParser.run_reduce(namespace)
-
-    elif namespace.command == 'calc':
-        CalcSubParser.run_calc(namespace)
-
-    elif namespace.command == 'template':
-        TemplateSubParser.run_templates(namespace)
-
-    elif namespace.command == 'split':
-        SplitSubParser.run_split(namespace)
-
-    elif namespace.command == 'alias':
-        AliasSubParser.run_alias(namespace)
-
-    elif namespace.command == 'graph':
-        GraphSubParser.run_graph(namespace)
+    elif namespace.command:
+        CommandRegistry.run(namespace)
     # !SECTION
 
-    elif not namespace.command:  
+    else:
         parser.print_help()
 
-else:
+    if namespace.profile:
+        Profiler.finish()
+
+# NOTE - Worker processes import this file under another name
+elif __name__ != '__mp_main__':
     raise CalledAsModuleError
@@ -0,0 +1,22 @@
+'''BenchmarkResult location'''
+
+from dataclasses import dataclass
+
+@dataclass
+class BenchmarkResult:
+    '''Time of a command on a file without the cache and with it'''
+    case: str
+    lines_cnt: int
+    cold_sec: float
+    warm_sec: float
+    succeeded: bool = True
+
+    @property
+    def cold_lines_per_sec(self) -> float:
+        '''Lines of the file processed per second on the first call'''
+        return self.lines_cnt / self.cold_sec if self.cold_sec != 0 else 0
+
+    @property
+    def warm_lines_per_sec(self) -> float:
+        '''Lines of the file processed per second when the cache is ready'''
+        return self.lines_cnt / self.warm_sec if self.warm_sec != 0 else 0
@@ -0,0 +1,72 @@
+'''BinaryFormat location'''
+
+import os
+from typing import Iterable, Tuple
+import numpy as np
+from models.exceptions import InvalidResourceError
+
+class BinaryFormat:
+    '''Packed file with a table of headers and fixed-width readings (little-endian), read without parsing'''
+
+    MAGIC = b'MARPBIN1'
+    EXTENSION = '.marpb'
+
+    PREAMBLE_DTYPE = np.dtype([('magic', 'S8'), ('headers_cnt', '<u8'), ('readings_cnt', '<u8')])
+    HEADER_DTYPE = np.dtype([
+        ('datetime', '<i8'),
+        ('spokes_cnt', '<u4'),
+        ('wheel_circ', '<u4'),
+        ('max_voltage', '<u4'),
+        ('save_delay', '<f8'),
+        ('start', '<u8')
+    ])
+
+    # NOTE - Same widths as the values of the device (millis() is a 32-bit counter, the analog value is 10-bit)
+    READING_DTYPE = np.dtype([('millis_passed', '<u4'), ('impulse_cnt', '<u2'), ('analog_voltage', '<u2')])
+
+    @staticmethod
+    def is_binary(file_path: str) -> bool:
+        '''Check if the file starts with the signature of the format'''
+        try:
+            with open(file_path, 'rb') as file_r:
+                return file_r.read(len(BinaryFormat.MAGIC)) == BinaryFormat.MAGIC
+        except OSError:
+            return False
+
+    @staticmethod
+    def read_tables(file_path: str) -> Tuple[np.ndarray, np.ndarray]:
+        '''Memory-mapped tables of headers and readings'''
+        preamble = np.fromfile(file_path, dtype=BinaryFormat.PREAMBLE_DTYPE, count=1)
+        if len(preamble) != 1 or preamble['magic'][0] != BinaryFormat.MAGIC:
+            raise InvalidResourceError(file_path)
+
+        headers_cnt, readings_cnt = int(preamble['headers_cnt'][0]), int(preamble['readings_cnt'][0])
+        headers_offset = BinaryFormat.PREAMBLE_DTYPE.itemsize
+        readings_offset = headers_offset + headers_cnt * BinaryFormat.HEADER_DTYPE.itemsize
+
+        if os.path.getsize(file_path) != readings_offset + readings_cnt * BinaryFormat.READING_DTYPE.itemsize:
+            raise InvalidResourceError(file_path)
+
+        return BinaryFormat.map_table(file_path, BinaryFormat.HEADER_DTYPE, headers_offset, headers_cnt), \
+            BinaryFormat.map_table(file_path, BinaryFormat.READING_DTYPE, readings_offset, readings_cnt)
+
+    @staticmethod
+    def map_table(file_path: str, dtype: np.dtype, offset: int, records_cnt: int) -> np.ndarray:
+        '''Table of records in the file (empty tables can not be mapped)'''
+        if records_cnt == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(file_path, dtype=dtype, mode='r', offset=offset, shape=(records_cnt,))
+
+    @staticmethod
+    def pack_preamble(headers_cnt: int, readings_cnt: int) -> bytes:
+        '''Signature and sizes of the tables as they are written at the beginning of the file'''
+        return np.array([(BinaryFormat.MAGIC, headers_cnt, readings_cnt)], dtype=BinaryFormat.PREAMBLE_DTYPE).tobytes()
+
+    @staticmethod
+    def write_tables(file_path: str, headers: np.ndarray, readings_blocks: Iterable[np.ndarray], readings_cnt: int) -> None:
+        '''Write the table of headers and the table of readings (given by consecutive blocks) with a preamble'''
+        with open(file_path, 'wb') as file_w:
+            file_w.write(BinaryFormat.pack_preamble(len(headers), readings_cnt))
+            file_w.write(headers.astype(BinaryFormat.HEADER_DTYPE, copy=False).tobytes())
+            for readings in readings_blocks:
+                file_w.write(readings.astype(BinaryFormat.READING_DTYPE, copy=False).tobytes())
@@ -8,17 +8,25 @@ class Config:
 
     PATH = os.path.join(os.path.split(os.path.abspath(__file__))[0], '..', 'config.yaml')
 
+    # NOTE - Durations in seconds, configs written before rides were found get them by default
+    DEFAULT_RIDE_DETECTION = {
+        'minimal_stop_duration': 300,
+        'minimal_ride_duration': 60
+    }
+
     def __init__(self, config : dict) -> None:
         self.minimal_voltage_search = config['minimal_voltage_search']
         self.normal_speed_interval = config['normal_speed_interval']
         self.normal_voltage_interval = config['normal_voltage_interval']
+        self.ride_detection = config.get('ride_detection', dict(Config.DEFAULT_RIDE_DETECTION))
 
     def save(self) -> None:
         '''Write all available parameters in the document (rewrite)'''
         config = {
             'minimal_voltage_search': self.minimal_voltage_search,
             'normal_speed_interval': self.normal_speed_interval,
-            'normal_voltage_interval': self.normal_voltage_interval
+            'normal_voltage_interval': self.normal_voltage_interval,
+            'ride_detection': self.ride_detection
         }
 
         with open(Config.PATH, 'w', encoding='UTF-8') as file_write:
@@ -36,7 +44,8 @@ class Config:
             'normal_voltage_interval': {
                 'min': 0,
                 'max': 60
-            }})
+            },
+            'ride_detection': dict(Config.DEFAULT_RIDE_DETECTION)})
         return config
 
     @classmethod
@@ -1,6 +1,7 @@
 '''CountedReading location'''
 
 from datetime import time
+import numpy as np
 from colorama import Fore, Style
 from models.reading import Reading
 from tools.display_utils import Color
@@ -52,3 +53,14 @@ class CountedReading:
             return vin
         else:
             return 0.0
+
+    @staticmethod
+    def calculate_speeds(impulse_cnt : np.ndarray, spokes_cnt : int, wheel_circ : int, save_delay : float) -> np.ndarray:
+        '''Speeds in km/h for an array of impulse counts (same operations as calculate_speed)'''
+        return (impulse_cnt / spokes_cnt * wheel_circ / 1_000_000) * (60 * 60 / save_delay)
+
+    @staticmethod
+    def calculate_voltages(analog_voltage : np.ndarray, max_voltage : int) -> np.ndarray:
+        '''Real volts for an array of analog values (same operations as calculate_voltage)'''
+        vin = analog_voltage * max_voltage / 1023
+        return np.where(vin >= 5, vin, 0.0)
@@ -0,0 +1,112 @@
+'''DayRollups location'''
+
+from datetime import datetime
+from typing import Dict, Optional
+import numpy as np
+from models.sections_readings import SectionsReadings
+from tools.accumulators import TravelDistanceAccumulator
+
+class DayRollups:
+    '''Totals of the readings of every section by day, so that whole days are calculated without the readings
+
+    Readings taken exactly at midnight get a row of their own, because both ends of the requested intervals are inclusive.
+    Pairs of consecutive readings from different rows of one section are kept as separate rows with travel values only.
+    '''
+
+    MILLIS_IN_DAY = 24 * 60 * 60 * 1000
+
+    DTYPES = {
+        'section': np.int64,
+        'first_datetime': 'datetime64[ms]',
+        'last_datetime': 'datetime64[ms]',
+        'readings_cnt': np.int64,
+        'speed_sum': np.float64,
+        'speed_max': np.float64,
+        'voltage_min': np.float64,
+        'voltage_max': np.float64,
+        'travel_time': np.float64,
+        'travel_distance': np.float64
+    }
+
+    def __init__(self, columns : Dict[str, np.ndarray]) -> None:
+        self.columns = columns
+
+    @classmethod
+    def from_store(cls, store, first_section=0, previous=None):
+        '''Rollups of the store, rows of the sections before the first section are taken from the previous rollups if they are passed
+
+        Sections are rolled up in chunks of the store (a chunk always has whole sections)
+        '''
+        kept_rows = { column: previous.columns[column][previous.columns['section'] < first_section] for column in DayRollups.DTYPES } if previous is not None else None
+        columns = store.collect_chunks(DayRollups.DTYPES, DayRollups.roll_up, first_section, kept_rows)
+
+        order = np.lexsort((columns['first_datetime'], columns['section']))
+        return cls({ column: values[order] for column, values in columns.items() })
+
+    @staticmethod
+    def roll_up(readings : SectionsReadings) -> Dict[str, np.ndarray]:
+        '''Rows of the sections of the readings (pieces of days and pairs of readings between them, not sorted)'''
+        sections, millis_passed, speeds_kmh, voltages_v, readings_datetimes = readings.sections, readings.millis_passed, readings.speeds_kmh, readings.voltages_v, readings.datetimes
+
+        # NOTE - Row of a reading changes with its section, its day or with a reading taken exactly at midnight
+        readings_millis = readings_datetimes.astype(np.int64)
+        days = readings_millis // DayRollups.MILLIS_IN_DAY * 2 + (readings_millis % DayRollups.MILLIS_IN_DAY != 0)
+        is_row_start = np.ones(len(sections), dtype=bool)
+        is_row_start[1:] = (sections[1:] != sections[:-1]) | (days[1:] != days[:-1])
+        row_starts = np.flatnonzero(is_row_start)
+        row_ends = np.append(row_starts[1:], len(sections)) - 1
+
+        # NOTE - Only pairs of readings of one section are traveled
+        is_pair = sections[1:] == sections[:-1]
+        pairs_travel_time, pairs_travel_distance = TravelDistanceAccumulator.pairs_travel(millis_passed, speeds_kmh)
+        is_inner_pair = is_pair & ~is_row_start[1:]
+        pairs_rows = np.cumsum(is_row_start)[:-1] - 1
+
+        pieces = {
+            'section': sections[row_starts],
+            'first_datetime': readings_datetimes[row_starts],
+            'last_datetime': readings_datetimes[row_ends],
+            'readings_cnt': row_ends - row_starts + 1,
+            'speed_sum': np.add.reduceat(speeds_kmh, row_starts) if len(row_starts) != 0 else np.empty(0),
+            'speed_max': np.maximum.reduceat(speeds_kmh, row_starts) if len(row_starts) != 0 else np.empty(0),
+            'voltage_min': np.minimum.reduceat(voltages_v, row_starts) if len(row_starts) != 0 else np.empty(0),
+            'voltage_max': np.maximum.reduceat(voltages_v, row_starts) if len(row_starts) != 0 else np.empty(0),
+            'travel_time': np.bincount(pairs_rows[is_inner_pair], weights=pairs_travel_time[is_inner_pair], minlength=len(row_starts)),
+            'travel_distance': np.bincount(pairs_rows[is_inner_pair], weights=pairs_travel_distance[is_inner_pair], minlength=len(row_starts))
+        }
+
+        bridges_inxs = np.flatnonzero(is_pair & is_row_start[1:])
+        bridges = {
+            'section': sections[bridges_inxs],
+            'first_datetime': readings_datetimes[bridges_inxs],
+            'last_datetime': readings_datetimes[bridges_inxs + 1],
+            'readings_cnt': np.zeros(len(bridges_inxs), dtype=np.int64),
+            'speed_sum': np.zeros(len(bridges_inxs)),
+            'speed_max': np.full(len(bridges_inxs), -np.inf),
+            'voltage_min': np.full(len(bridges_inxs), np.inf),
+            'voltage_max': np.full(len(bridges_inxs), -np.inf),
+            'travel_time': pairs_travel_time[bridges_inxs],
+            'travel_distance': pairs_travel_distance[bridges_inxs]
+        }
+
+        return { column: np.concatenate((pieces[column], bridges[column])) for column in DayRollups.DTYPES }
+
+    def select(self, sections : range, datetime_start : datetime, datetime_end : datetime) -> Optional[Dict[str, np.ndarray]]:
+        '''Rows of the sections within the interval (None if the interval ends inside a row, then the readings have to be used)'''
+        first_row, last_row = np.searchsorted(self.columns['section'], [sections.start, sections.stop], side='left')
+        rows = { column: values[first_row:last_row] for column, values in self.columns.items() }
+        datetime_start, datetime_end = np.datetime64(datetime_start, 'ms'), np.datetime64(datetime_end, 'ms')
+
+        is_piece = rows['readings_cnt'] != 0
+        is_start_inside = (rows['first_datetime'] < datetime_start) & (datetime_start <= rows['last_datetime'])
+        is_end_inside = (rows['first_datetime'] <= datetime_end) & (datetime_end < rows['last_datetime'])
+        if (is_piece & (is_start_inside | is_end_inside)).any():
+            return None
+
+        in_interval = (rows['first_datetime'] >= datetime_start) & (rows['last_datetime'] <= datetime_end)
+        return { column: values[in_interval] for column, values in rows.items() }
+
+    def sum_sections(self, sections : range, column : str) -> np.ndarray:
+        '''Total of the column for each of the sections'''
+        first_row, last_row = np.searchsorted(self.columns['section'], [sections.start, sections.stop], side='left')
+        return np.bincount(self.columns['section'][first_row:last_row] - sections.start, weights=self.columns[column][first_row:last_row], minlength=len(sections))
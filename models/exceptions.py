@@ -19,14 +19,16 @@ class Error(Exception):
     # NOTE - Codes of all available errors, KEY MUST BE A CLASS NAME
     CODES = {
         'Error': 0,
-        'ResourceSizeExceededError': 1,
         'ResourceNotFoundError': 2,
         'ResourceWrongEncodingError': 3,
         'ReadingWithoutHeaderError': 4,
         'CalledAsModuleError': 5,
         'InvalidDateTimePassedError': 6,
         'InvalidDatePassedError': 7,
-        'InvalidResourceError': 8
+        'InvalidResourceError': 8,
+        'BinaryFormatRangeError': 9,
+        'InvalidQueryError': 10,
+        'UnfinishedReductionError': 11
     }
     
     def __init__(self) -> None:
@@ -35,12 +37,6 @@ class Error(Exception):
         self.code = Error.CODES[self.name]
         logger.error(f"Raised {self.name} (code: {self.code})")
 
-class ResourceSizeExceededError(Error):
-    '''There are too many lines in the file requested for processing'''
-    def __init__(self, file_path : str, lines_cnt : int, max_lines_cnt : int) -> None:
-        super().__init__()
-        logger.error(f"File {file_path} size ({lines_cnt} lines) in lines exceeds the allowable size ({max_lines_cnt} lines), before processing, divide the file with the reduce command")
-
 class ResourceNotFoundError(Error):
     '''Failed to find the requested file'''
     def __init__(self, file_path : str) -> None:
@@ -59,6 +55,26 @@ class InvalidResourceError(Error):
         super().__init__()
         logger.error(f"File {file_path} did not pass validation, no futher operations are possible")
 
+class BinaryFormatRangeError(Error):
+    '''Values of the file do not fit into the fields of the binary format'''
+    def __init__(self, file_path : str, column : str) -> None:
+        super().__init__()
+        logger.error(f"Values of {column} in the file {file_path} are too large for the binary format, the file can not be converted")
+
+class InvalidQueryError(Error):
+    '''Request to the serve command can not be answered'''
+    def __init__(self, message : str, status : int = 400) -> None:
+        super().__init__()
+        self.message = message
+        self.status = status
+        logger.error(message)
+
+class UnfinishedReductionError(Error):
+    '''File is being reduced in place and its reduction was interrupted'''
+    def __init__(self, file_path : str) -> None:
+        super().__init__()
+        logger.error(f"Reduction of the file {file_path} in place was interrupted, finish it with: marp reduce -i {file_path} -ip")
+
 class ReadingWithoutHeaderError(Error):
     '''Reading is not attached to any Header'''
     def __init__(self, line_inx : int) -> None:
@@ -0,0 +1,69 @@
+'''FileVerdict location'''
+
+from dataclasses import dataclass, field, asdict
+
+@dataclass
+class FileVerdict:
+    '''Result of the single-pass file validation
+
+    Only the first MAXIMAL_BAD_LINES_CNT numbers of failed lines are kept, the rest are only counted
+    '''
+    MAXIMAL_BAD_LINES_CNT = 1000
+
+    lines_cnt: int = 0
+    is_utf8: bool = True
+    pattern_bad_lines: list = field(default_factory=list)
+    time_bad_lines: list = field(default_factory=list)
+    pattern_bad_lines_cnt: int = 0
+    time_bad_lines_cnt: int = 0
+
+    @property
+    def passed_pattern(self) -> bool:
+        '''Whether all lines match the Header or Reading patterns'''
+        return self.pattern_bad_lines_cnt == 0
+
+    @property
+    def passed_time(self) -> bool:
+        '''Whether the time sequence is maintained'''
+        return self.time_bad_lines_cnt == 0
+
+    @property
+    def is_valid(self) -> bool:
+        '''Whether the file can be processed by commands'''
+        return self.is_utf8 and self.passed_pattern and self.passed_time
+
+    @property
+    def is_truncated(self) -> bool:
+        '''Whether some numbers of failed lines were not kept'''
+        return len(self.pattern_bad_lines) != self.pattern_bad_lines_cnt or len(self.time_bad_lines) != self.time_bad_lines_cnt
+
+    def add_pattern_bad_line(self, line_inx : int) -> None:
+        '''Count a line that does not match the patterns'''
+        if len(self.pattern_bad_lines) < FileVerdict.MAXIMAL_BAD_LINES_CNT:
+            self.pattern_bad_lines.append(line_inx)
+        self.pattern_bad_lines_cnt += 1
+
+    def add_time_bad_line(self, line_inx : int) -> None:
+        '''Count a line that breaks the time sequence'''
+        if len(self.time_bad_lines) < FileVerdict.MAXIMAL_BAD_LINES_CNT:
+            self.time_bad_lines.append(line_inx)
+        self.time_bad_lines_cnt += 1
+
+    def merge(self, part) -> None:
+        '''Add the result of the next part of the file (its line numbers are counted from the start of the part)'''
+        self.is_utf8 = self.is_utf8 and part.is_utf8
+        self.pattern_bad_lines.extend(self.lines_cnt + line_inx for line_inx in part.pattern_bad_lines[:FileVerdict.MAXIMAL_BAD_LINES_CNT - len(self.pattern_bad_lines)])
+        self.time_bad_lines.extend(self.lines_cnt + line_inx for line_inx in part.time_bad_lines[:FileVerdict.MAXIMAL_BAD_LINES_CNT - len(self.time_bad_lines)])
+        self.pattern_bad_lines_cnt += part.pattern_bad_lines_cnt
+        self.time_bad_lines_cnt += part.time_bad_lines_cnt
+        self.lines_cnt += part.lines_cnt
+
+    @staticmethod
+    def format_lines(bad_lines : list, bad_lines_cnt : int) -> str:
+        '''Numbers of failed lines for messages'''
+        more = f" and {bad_lines_cnt - len(bad_lines)} more" if bad_lines_cnt > len(bad_lines) else ''
+        return ', '.join(map(str, bad_lines)) + more
+
+    def to_dict(self) -> dict:
+        '''Converting to a dictionary for saving in cache'''
+        return asdict(self)
@@ -2,7 +2,8 @@
 
 from datetime import datetime
 from colorama import Fore, Style
-from tools.additional_datetime_utils import is_datetime
+from typing import Optional
+from tools.additional_datetime_utils import parse_datetime
 from tools.display_utils import Color
 
 class Header:
@@ -13,7 +14,7 @@ class Header:
 
     def __init__(self, header : str) -> None:
         header_parts = header.split(' ')
-        self.datetime = datetime.strptime(header_parts[1], '%d.%m.%Y-%H:%M:%S')
+        self.datetime = parse_datetime(header_parts[1])
         self.spokes_cnt = int(header_parts[3])
         self.wheel_circ = int(header_parts[5])
         self.max_voltage = int(header_parts[7])
@@ -39,11 +40,30 @@ class Header:
         header = cls("{H} " + f"01.01.2000-00:00:00 ( {0} | {0} | {0} | {0} )")
         return header
 
+    @classmethod
+    def from_values(cls, header_datetime : datetime, spokes_cnt : int, wheel_circ : int, max_voltage : int, save_delay : float):
+        '''Creating an instance from already parsed values'''
+        header = cls.__new__(cls)
+        header.datetime = header_datetime
+        header.spokes_cnt = spokes_cnt
+        header.wheel_circ = wheel_circ
+        header.max_voltage = max_voltage
+        header.save_delay = save_delay
+        return header
+
+    @classmethod
+    def parse(cls, header : str) -> Optional['Header']:
+        '''Checking and parsing the string in one pass (None if the string is not Header)'''
+        header_parts = header.split(' ')
+        if len(header_parts) != len(Header.PATTERN.split(' ')) or not (header_parts[3].isdigit() and header_parts[5].isdigit() and header_parts[7].isdigit()):
+            return None
+
+        try:
+            return cls.from_values(parse_datetime(header_parts[1]), int(header_parts[3]), int(header_parts[5]), int(header_parts[7]), float(header_parts[9]))
+        except ValueError:
+            return None
+
     @staticmethod
     def is_header(header : str) -> bool:
         '''Trying to determine if the string is Header'''
-        header_parts = header.split(' ')
-        try:
-            return len(header_parts) == len(Header.PATTERN.split(' ')) and is_datetime(header_parts[1]) and header_parts[3].isdigit() and header_parts[5].isdigit() and header_parts[7].isdigit() and (isinstance(float(header_parts[9]), float))
-        except IndexError:
-            return False
+        return Header.parse(header) is not None
@@ -0,0 +1,51 @@
+'''HeaderIndex location'''
+
+from datetime import datetime
+from typing import Dict, List
+import numpy as np
+
+class HeaderIndex:
+    '''Position of every header in the file and the time covered by its section'''
+
+    DTYPES = {
+        'datetime': 'datetime64[s]',
+        'offset': np.int64,
+        'line_inx': np.int64,
+        'last_millis': np.int64
+    }
+
+    def __init__(self, columns : Dict[str, np.ndarray]) -> None:
+        self.columns = columns
+
+    @classmethod
+    def from_lists(cls, columns : Dict[str, List]):
+        '''Creating an index from values collected while reading the file'''
+        return cls({ column: np.array(columns[column], dtype=dtype) for column, dtype in HeaderIndex.DTYPES.items() })
+
+    @property
+    def headers_cnt(self) -> int:
+        '''Number of indexed headers'''
+        return len(self.columns['datetime'])
+
+    def find_sections(self, datetime_start : datetime, datetime_end : datetime) -> range:
+        '''Indexes of the sections which may have readings within the interval (binary search)
+
+        Range ends with the first section that has readings later than the end, since line by line processing stops there
+        '''
+        if self.headers_cnt == 0:
+            return range(0)
+
+        sections_ends = self.columns['datetime'].astype('datetime64[ms]') + self.columns['last_millis'].astype('timedelta64[ms]')
+
+        # NOTE - Running maximum keeps the array sorted even if some section ends after the next header
+        first_inx = int(np.searchsorted(np.maximum.accumulate(sections_ends), np.datetime64(datetime_start, 'ms'), side='left'))
+        exceeding_inxs = np.flatnonzero(sections_ends[first_inx:] > np.datetime64(datetime_end, 'ms'))
+        last_inx = first_inx + int(exceeding_inxs[0]) + 1 if len(exceeding_inxs) != 0 else self.headers_cnt
+        return range(first_inx, last_inx)
+
+    def find_headers(self, datetime_start : datetime, datetime_end : datetime) -> range:
+        '''Indexes of the headers written within the interval (binary search)'''
+        headers_datetimes = self.columns['datetime'].astype('datetime64[ms]')
+        first_inx = int(np.searchsorted(headers_datetimes, np.datetime64(datetime_start, 'ms'), side='left'))
+        last_inx = int(np.searchsorted(headers_datetimes, np.datetime64(datetime_end, 'ms'), side='right'))
+        return range(first_inx, max(first_inx, last_inx))
@@ -0,0 +1,13 @@
+'''LineGraphConfig location'''
+
+from dataclasses import dataclass, field
+import numpy as np
+
+@dataclass
+class LineGraphConfig:
+    '''Storing data about the future line graph (times of the points and their values, NaN breaks the line)'''
+    values_x: np.ndarray = field(default_factory=lambda: np.empty(0, dtype='datetime64[ms]'))
+    values_y: np.ndarray = field(default_factory=lambda: np.empty(0))
+    label_x: str = 'X axis'
+    label_y: str = 'Y axis'
+    label_fig: str = "Graph with the X and Y axes"
@@ -0,0 +1,60 @@
+'''NpyWriter location'''
+
+import os
+import struct
+import numpy as np
+
+class NpyWriter:
+    '''One-dimensional array written to a .npy file by chunks, so that the whole array is never kept in memory
+
+    Header of the file has a fixed size and is rewritten with the final length when the writer is closed
+    '''
+
+    MAGIC = b'\x93NUMPY\x01\x00'
+    HEADER_SIZE = 128
+
+    def __init__(self, file_path : str, dtype : np.dtype, is_temporary=False) -> None:
+        self.file_path = file_path
+        self.dtype = np.dtype(dtype)
+        self.is_temporary = is_temporary
+        self.length = 0
+        self.file_w = open(file_path, 'wb')
+        self.write_header()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def write_header(self) -> None:
+        '''Write the description of the array at the beginning of the file (format version 1.0)'''
+        description = repr({ 'descr': np.lib.format.dtype_to_descr(self.dtype), 'fortran_order': False, 'shape': (self.length,) })
+        header = (description.ljust(NpyWriter.HEADER_SIZE - len(NpyWriter.MAGIC) - 3) + '\n').encode('latin1')
+
+        self.file_w.seek(0)
+        self.file_w.write(NpyWriter.MAGIC + struct.pack('<H', len(header)) + header)
+        self.file_w.seek(0, os.SEEK_END)
+
+    def write(self, values : np.ndarray) -> None:
+        '''Append values to the end of the array'''
+        self.file_w.write(np.ascontiguousarray(values, dtype=self.dtype).tobytes())
+        self.length += len(values)
+
+    def close(self) -> None:
+        '''Write the final length and close the file'''
+        if not self.file_w.closed:
+            self.write_header()
+            self.file_w.close()
+
+    def to_array(self) -> np.ndarray:
+        '''Memory-mapped array of the written file (a temporary or empty file is removed, the array stays available while mapped)'''
+        self.close()
+        values = np.load(self.file_path, mmap_mode='r') if self.length != 0 else np.empty(0, dtype=self.dtype)
+
+        if self.is_temporary or self.length == 0:
+            try:
+                os.remove(self.file_path)
+            except OSError:
+                pass
+        return values
@@ -1,37 +1,95 @@
 '''ReadableFile location'''
 
 import os
+import glob
 import time
+from typing import List
 from loguru import logger
-from models.exceptions import ResourceSizeExceededError, ResourceNotFoundError, ResourceWrongEncodingError, InvalidResourceError
+from models.exceptions import ResourceNotFoundError, ResourceWrongEncodingError, InvalidResourceError, UnfinishedReductionError
+from models.reduction_journal import ReductionJournal
+from models.file_verdict import FileVerdict
 from tools.file_parser import FileParser
+from models.binary_format import BinaryFormat
 
 class ReadableFile:
     '''File which can be handled by functions'''
-    MAXIMAL_FILE_LENGTH = 10_500_000
-    VISIBLE_FILE_LENGTH = MAXIMAL_FILE_LENGTH / 5
+    VISIBLE_FILE_LENGTH = 2_100_000
+    AVERAGE_LINE_SIZE = 20
+    INPUT_EXTENSIONS = ('.txt', BinaryFormat.EXTENSION)
 
     def __init__(self, file_path : str) -> None:
-        if os.path.isfile(file_path):
-            lines_cnt = FileParser.count_lines(file_path)
-            if lines_cnt < ReadableFile.MAXIMAL_FILE_LENGTH:
-                
-                # NOTE - Large file size time warning
-                if lines_cnt > ReadableFile.VISIBLE_FILE_LENGTH:
-                    start_time = time.time()
-                    logger.warning(f"Specified file has a large size in the form of {lines_cnt} line, the check may take some time")
-
-                if FileParser.is_utf8(file_path):
-                    if FileParser.validate_readings_by_pattern(file_path=file_path, log_success=False) and FileParser.validate_readings_by_time(file_path=file_path, log_success=False):
-                        self.name = file_path
-
-                        if lines_cnt > ReadableFile.VISIBLE_FILE_LENGTH:
-                            logger.success(f"Verification of the file successfully completed, time spent: {round(time.time() - start_time, 3)} seconds")
-                    else:
-                        raise InvalidResourceError(file_path)
-                else:
-                    raise ResourceWrongEncodingError(file_path)
+        ReadableFile.check_state(file_path)
+
+        # NOTE - Large file size time warning (number of lines is estimated, it is counted during the check)
+        start_time = time.time()
+        is_large = os.path.getsize(file_path) > ReadableFile.VISIBLE_FILE_LENGTH * ReadableFile.AVERAGE_LINE_SIZE and not BinaryFormat.is_binary(file_path)
+        if is_large:
+            logger.warning(f"Specified file has a large size in the form of about {os.path.getsize(file_path) // ReadableFile.AVERAGE_LINE_SIZE} lines, the check may take some time if it was not performed before")
+
+        self.name = file_path
+        self.verdict = ReadableFile.check_verdict(file_path)
+
+        if is_large:
+            logger.success(f"Verification of the file successfully completed, time spent: {round(time.time() - start_time, 3)} seconds")
+
+    @staticmethod
+    def check(file_path : str) -> FileVerdict:
+        '''Verdict of the file checked again as an input (it may have changed since), without the messages about large files'''
+        ReadableFile.check_state(file_path)
+        return ReadableFile.check_verdict(file_path)
+
+    @staticmethod
+    def check_state(file_path : str) -> None:
+        '''Raise an error if the file is missing or its reduction in place is not finished'''
+        if not os.path.isfile(file_path):
+            raise ResourceNotFoundError(file_path)
+
+        if ReductionJournal(file_path).exists():
+            raise UnfinishedReductionError(file_path)
+
+    @staticmethod
+    def check_verdict(file_path : str) -> FileVerdict:
+        '''Verdict of the file, raise an error if it is not in UTF-8 or did not pass validation'''
+        verdict = FileParser.get_verdict(file_path)
+
+        if not verdict.is_utf8:
+            raise ResourceWrongEncodingError(file_path)
+
+        elif not verdict.is_valid:
+            if FileParser.validate_readings_by_pattern(file_path=file_path, log_success=False):
+                FileParser.validate_readings_by_time(file_path=file_path, log_success=False)
+            raise InvalidResourceError(file_path)
+
+        return verdict
+
+    @classmethod
+    def collect(cls, paths : List[str]) -> List['ReadableFile']:
+        '''Checked files of the passed paths, several files are checked at once by separate processes'''
+        file_paths = ReadableFile.expand_paths(paths)
+        if len(file_paths) > 1:
+            FileParser.get_verdicts(file_paths)
+
+        return [cls(file_path) for file_path in file_paths]
+
+    @staticmethod
+    def expand_paths(paths : List[str]) -> List[str]:
+        '''Files of the passed paths: files as they are, files with readings of directories and matches of glob patterns (without repetitions)'''
+        file_paths, seen_paths = [], set()
+
+        for path in paths:
+            if os.path.isfile(path):
+                matches = [path]
+            elif os.path.isdir(path):
+                matches = sorted(os.path.join(path, name) for name in os.listdir(path) if not name.startswith('.') and os.path.splitext(name)[1] in ReadableFile.INPUT_EXTENSIONS and os.path.isfile(os.path.join(path, name)))
             else:
-                raise ResourceSizeExceededError(file_path, lines_cnt, ReadableFile.MAXIMAL_FILE_LENGTH)
-        else:
-            raise ResourceNotFoundError(file_path)
\ No newline at end of file
+                matches = sorted(match for match in glob.glob(path) if os.path.isfile(match))
+
+            if len(matches) == 0:
+                raise ResourceNotFoundError(path)
+
+            for match in matches:
+                if os.path.abspath(match) not in seen_paths:
+                    seen_paths.add(os.path.abspath(match))
+                    file_paths.append(match)
+
+        return file_paths
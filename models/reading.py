@@ -30,6 +30,15 @@ class Reading:
         reading = cls("{R} " + f"{0} | {0} | {0}")
         return reading
 
+    @classmethod
+    def from_values(cls, millis_passed : int, impulse_cnt : int, analog_voltage : int):
+        '''Creating an instance from already parsed values'''
+        reading = cls.__new__(cls)
+        reading.millis_passed = millis_passed
+        reading.impulse_cnt = impulse_cnt
+        reading.analog_voltage = analog_voltage
+        return reading
+
     @staticmethod
     def is_reading(reading : str) -> bool:
         '''Trying to determine if the string is Reading'''
@@ -0,0 +1,408 @@
+'''ReadingsStore location'''
+
+import os
+from datetime import datetime
+from array import array
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from models.header import Header
+from models.sidecar import Sidecar
+from models.header_index import HeaderIndex
+from models.day_rollups import DayRollups
+from models.rides import Rides
+from models.counted_reading import CountedReading
+from models.sections_readings import SectionsReadings
+from models.binary_format import BinaryFormat
+from models.widened_column import WidenedColumn
+from models.exceptions import ResourceNotFoundError, BinaryFormatRangeError
+from tools.parallel import Parallel
+from tools.profiler import Profiler
+from tools.line_scanner import LineScanner
+
+class ReadingsStore:
+    '''Headers and readings of a file stored by columns (one array per value)'''
+
+    HEADERS_DTYPES = {
+        'datetime': 'datetime64[s]',
+        'spokes_cnt': np.int64,
+        'wheel_circ': np.int64,
+        'max_voltage': np.int64,
+        'save_delay': np.float64,
+        'start': np.int64,
+        'end': np.int64,
+        'offset': np.int64,
+        'body_offset': np.int64,
+        'end_offset': np.int64,
+        'line_inx': np.int64,
+        'blank_lines_cnt': np.int64
+    }
+    READINGS_DTYPES = {
+        'millis_passed': np.int64,
+        'impulse_cnt': np.int64,
+        'analog_voltage': np.int64
+    }
+
+    # NOTE - Number of readings copied or converted at once, so that whole columns are never copied in memory
+    BLOCK_SIZE = 1 << 20
+
+    # NOTE - Number of readings of whole sections calculated at once for the rollups and the rides
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, headers : Dict[str, np.ndarray], readings : Dict[str, np.ndarray]) -> None:
+        self.headers = headers
+        self.readings = readings
+
+    @property
+    def headers_cnt(self) -> int:
+        '''Number of headers (sections) in the file'''
+        return len(self.headers['datetime'])
+
+    @property
+    def readings_cnt(self) -> int:
+        '''Number of readings in the file'''
+        return len(self.readings['millis_passed'])
+
+    def section_bounds(self, header_inx : int) -> Tuple[int, int]:
+        '''Indexes of the first and after the last reading of the section'''
+        return int(self.headers['start'][header_inx]), int(self.headers['end'][header_inx])
+
+    def get_header(self, header_inx : int) -> Header:
+        '''Header of the section'''
+        return Header.from_values(
+            self.headers['datetime'][header_inx].item(),
+            int(self.headers['spokes_cnt'][header_inx]),
+            int(self.headers['wheel_circ'][header_inx]),
+            int(self.headers['max_voltage'][header_inx]),
+            float(self.headers['save_delay'][header_inx])
+        )
+
+    def iter_sections(self, datetime_start : datetime, datetime_end : datetime, sections : range) -> Iterator[Tuple[int, np.ndarray, np.ndarray, np.ndarray]]:
+        '''Header index and readings (millis, impulses, analog voltages) of each of the sections that fall within the interval
+
+        As in the line by line processing, everything after the first reading later than the end is ignored
+        '''
+        datetime_start, datetime_end = np.datetime64(datetime_start, 'ms'), np.datetime64(datetime_end, 'ms')
+        headers_datetimes = self.headers['datetime'].astype('datetime64[ms]')
+
+        for header_inx in sections:
+            start, end = self.section_bounds(header_inx)
+            millis_passed = self.readings['millis_passed'][start:end]
+            readings_datetimes = headers_datetimes[header_inx] + millis_passed.astype('timedelta64[ms]')
+
+            after_end = readings_datetimes > datetime_end
+            is_last = bool(after_end.any())
+            limit = int(np.argmax(after_end)) if is_last else len(millis_passed)
+
+            in_interval = np.flatnonzero(readings_datetimes[:limit] >= datetime_start) + start
+            yield header_inx, self.readings['millis_passed'][in_interval], self.readings['impulse_cnt'][in_interval], self.readings['analog_voltage'][in_interval]
+
+            if is_last:
+                break
+
+    def iter_chunks(self, first_section : int = 0) -> Iterator[SectionsReadings]:
+        '''Calculated readings of the sections starting from the first one in chunks of about CHUNK_SIZE readings (a chunk always has whole sections)'''
+        section_start = first_section
+
+        while section_start < self.headers_cnt:
+            readings_limit = int(self.headers['start'][section_start]) + ReadingsStore.CHUNK_SIZE
+            section_end = max(section_start + 1, int(np.searchsorted(self.headers['end'], readings_limit, side='right')))
+            yield self.get_sections_readings(range(section_start, section_end))
+            section_start = section_end
+
+    def get_sections_readings(self, sections : range) -> SectionsReadings:
+        '''Speeds, voltages and times of all readings of the sections using the configuration of their headers'''
+        first_reading, last_reading = int(self.headers['start'][sections.start]), int(self.headers['end'][sections.stop - 1])
+        section_inxs = np.arange(sections.start, sections.stop, dtype=np.int64)
+        readings_sections = np.repeat(section_inxs, self.headers['end'][section_inxs] - self.headers['start'][section_inxs])
+
+        millis_passed = self.readings['millis_passed'][first_reading:last_reading]
+        impulse_cnt = self.readings['impulse_cnt'][first_reading:last_reading]
+        return SectionsReadings(
+            readings_sections,
+            millis_passed,
+            impulse_cnt,
+            CountedReading.calculate_speeds(impulse_cnt, self.headers['spokes_cnt'][readings_sections], self.headers['wheel_circ'][readings_sections], self.headers['save_delay'][readings_sections]),
+            CountedReading.calculate_voltages(self.readings['analog_voltage'][first_reading:last_reading], self.headers['max_voltage'][readings_sections]),
+            self.headers['datetime'][readings_sections].astype('datetime64[ms]') + millis_passed.astype('timedelta64[ms]')
+        )
+
+    def collect_chunks(self, dtypes : Dict[str, object], find_rows : Callable[[SectionsReadings], Dict[str, np.ndarray]], first_section : int = 0, kept_rows : Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+        '''Rows found by the function in every chunk of the sections starting from the first one, joined after the kept rows into columns of the types'''
+        chunks = [kept_rows] if kept_rows is not None else []
+        chunks.extend(find_rows(readings) for readings in self.iter_chunks(first_section))
+
+        return {
+            column: np.concatenate([np.asarray(chunk[column], dtype=dtype) for chunk in chunks]) if len(chunks) != 0 else np.empty(0, dtype=dtype)
+            for column, dtype in dtypes.items()
+        }
+
+    @classmethod
+    @Profiler.measure('parse')
+    def load(cls, file_path : str):
+        '''Store of the file, taken from the sidecar cache if the file has not changed (otherwise the file is ingested)'''
+        if not os.path.isfile(file_path):
+            raise ResourceNotFoundError(file_path)
+
+        # NOTE - Binary files are already stored by columns and are not cached
+        if BinaryFormat.is_binary(file_path):
+            return cls.from_binary(file_path)
+
+        sidecar = Sidecar(file_path)
+        fingerprint = sidecar.fingerprint()
+        arrays = sidecar.load_arrays('store', fingerprint)
+
+        if arrays is not None:
+            return cls.from_arrays(arrays)
+
+        previous = cls.load_previous(sidecar, fingerprint)
+        store = cls.ingest(sidecar, previous)
+        sidecar.save_arrays('store', fingerprint, store.to_arrays())
+        cls.save_rollups(sidecar, fingerprint, store, previous)
+        return store
+
+    @classmethod
+    @Profiler.measure('parse')
+    def load_rollups(cls, file_path : str) -> DayRollups:
+        '''Rollups of the file by day, taken from the sidecar cache if the file has not changed (otherwise they are built with the store)'''
+        if not os.path.isfile(file_path):
+            raise ResourceNotFoundError(file_path)
+
+        if BinaryFormat.is_binary(file_path):
+            return DayRollups.from_store(cls.from_binary(file_path))
+
+        sidecar = Sidecar(file_path)
+        fingerprint = sidecar.fingerprint()
+        arrays = sidecar.load_arrays('rollups', fingerprint)
+
+        # NOTE - Rollups are saved when the file is ingested, cached store without them is rolled up separately
+        if arrays is None:
+            store = cls.load(file_path)
+            arrays = sidecar.load_arrays('rollups', fingerprint)
+            if arrays is None:
+                return cls.save_rollups(sidecar, fingerprint, store)
+
+        return DayRollups(arrays)
+
+    @staticmethod
+    def save_rollups(sidecar : Sidecar, fingerprint : dict, store, previous = None) -> DayRollups:
+        '''Roll up the store and cache the result, if the store of the beginning of the file is passed, only sections starting from its last one are rolled up'''
+        previous_rollups, first_section = None, 0
+        previous_fingerprint = sidecar.load_fingerprint('rollups')
+
+        if previous is not None and previous.headers_cnt != 0 and previous_fingerprint is not None and sidecar.is_appended(fingerprint, previous_fingerprint):
+            arrays = sidecar.load_arrays('rollups', previous_fingerprint)
+            if arrays is not None:
+                previous_rollups, first_section = DayRollups(arrays), previous.headers_cnt - 1
+
+        rollups = DayRollups.from_store(store, first_section, previous_rollups)
+        sidecar.save_arrays('rollups', fingerprint, rollups.columns)
+        return rollups
+
+    @classmethod
+    @Profiler.measure('parse')
+    def load_rides(cls, file_path : str, minimal_stop_duration : float, minimal_ride_duration : float) -> Rides:
+        '''Rides of the file, taken from the sidecar cache if neither the file nor the durations have changed (otherwise they are found in the store)'''
+        if not os.path.isfile(file_path):
+            raise ResourceNotFoundError(file_path)
+
+        if BinaryFormat.is_binary(file_path):
+            return Rides.from_store(cls.from_binary(file_path), minimal_stop_duration, minimal_ride_duration)
+
+        # NOTE - Rides found with other durations are not used
+        sidecar = Sidecar(file_path)
+        fingerprint = dict(sidecar.fingerprint(), minimal_stop_duration=minimal_stop_duration, minimal_ride_duration=minimal_ride_duration)
+        arrays = sidecar.load_arrays('rides', fingerprint)
+
+        if arrays is not None:
+            return Rides(arrays)
+
+        rides = Rides.from_store(cls.load(file_path), minimal_stop_duration, minimal_ride_duration)
+        sidecar.save_arrays('rides', fingerprint, rides.columns)
+        return rides
+
+    @classmethod
+    def load_previous(cls, sidecar : Sidecar, fingerprint : dict):
+        '''Store saved before new lines were appended to the file (None if the file was changed in another way)'''
+        previous_fingerprint = sidecar.load_fingerprint('store')
+        if previous_fingerprint is None or not sidecar.is_appended(fingerprint, previous_fingerprint):
+            return None
+
+        arrays = sidecar.load_arrays('store', previous_fingerprint)
+        return cls.from_arrays(arrays) if arrays is not None else None
+
+    @classmethod
+    def ingest(cls, sidecar : Sidecar, previous = None):
+        '''Parse the file (which must be already validated) into columns, parts of the file are parsed in parallel
+
+        Readings of the parts are written to the sidecar as soon as they are ready, so only the headers are kept in memory.
+        If the store of the beginning of the file is passed, only lines starting from its last header are parsed
+        '''
+        file_path = sidecar.file_path
+        headers = { column: [] for column in ReadingsStore.HEADERS_DTYPES }
+        writers = { column: sidecar.open_writer('store', f"readings.{column}", dtype) for column, dtype in ReadingsStore.READINGS_DTYPES.items() }
+        readings_cnt = lines_cnt = start_offset = 0
+
+        # NOTE - Appended lines may continue the last section, so it is parsed again together with them
+        if previous is not None and previous.headers_cnt != 0:
+            start_offset = int(previous.headers['offset'][-1])
+            readings_cnt = int(previous.headers['start'][-1])
+            lines_cnt = int(previous.headers['line_inx'][-1]) - 1
+
+            headers = { column: values[:-1].tolist() for column, values in previous.headers.items() }
+            for column, writer in writers.items():
+                for block_start in range(0, readings_cnt, ReadingsStore.BLOCK_SIZE):
+                    writer.write(previous.readings[column][block_start:min(block_start + ReadingsStore.BLOCK_SIZE, readings_cnt)])
+
+        for part_headers, part_readings, part_lines_cnt, leading_blank_lines_cnt in Parallel.imap(ReadingsStore.ingest_range, [(file_path, start, end) for start, end in Parallel.split_by_headers(file_path, start_offset)]):
+            if len(headers['datetime']) != 0:
+                headers['blank_lines_cnt'][-1] += leading_blank_lines_cnt
+
+            for column, values in part_headers.items():
+                if column == 'start':
+                    values = [value + readings_cnt for value in values]
+                elif column == 'line_inx':
+                    values = [value + lines_cnt for value in values]
+                headers[column].extend(values)
+
+            for column, values in part_readings.items():
+                if len(values) != 0:
+                    writers[column].write(np.frombuffer(values, dtype=np.int64))
+
+            readings_cnt += len(part_readings['millis_passed'])
+            lines_cnt += part_lines_cnt
+            Profiler.count_lines(part_lines_cnt)
+
+        # NOTE - Section ends at the start of the next one
+        headers['end'] = headers['start'][1:] + [readings_cnt] if len(headers['start']) != 0 else []
+        headers['end_offset'] = headers['offset'][1:] + [os.path.getsize(file_path)] if len(headers['offset']) != 0 else []
+
+        return cls(
+            { column: np.array(values, dtype=ReadingsStore.HEADERS_DTYPES[column]) for column, values in headers.items() },
+            { column: writer.to_array() for column, writer in writers.items() }
+        )
+
+    @staticmethod
+    def ingest_range(file_path : str, start_offset : int, end_offset : int) -> Tuple[Dict[str, List], Dict[str, array], int, int]:
+        '''Parse lines of the byte range: headers columns (without ends), readings columns, number of lines and empty lines before the first header'''
+        headers = { column: [] for column in ReadingsStore.HEADERS_DTYPES if column not in ('end', 'end_offset') }
+        readings = { column: array('q') for column in ReadingsStore.READINGS_DTYPES }
+        millis_passed, impulse_cnt, analog_voltage = readings.values()
+        leading_blank_lines_cnt = lines_cnt = 0
+
+        with LineScanner(file_path) as scanner:
+            for lines_cnt, (offset, size, line) in enumerate(scanner.iter_lines(start_offset, end_offset), start=1):
+                record = LineScanner.parse_line(line)
+
+                if isinstance(record, tuple):
+                    millis_passed.append(record[0])
+                    impulse_cnt.append(record[1])
+                    analog_voltage.append(record[2])
+
+                elif record is not None:
+                    headers['datetime'].append(record.datetime)
+                    headers['spokes_cnt'].append(record.spokes_cnt)
+                    headers['wheel_circ'].append(record.wheel_circ)
+                    headers['max_voltage'].append(record.max_voltage)
+                    headers['save_delay'].append(record.save_delay)
+                    headers['start'].append(len(millis_passed))
+                    headers['offset'].append(offset)
+                    headers['body_offset'].append(offset + size)
+                    headers['line_inx'].append(lines_cnt)
+                    headers['blank_lines_cnt'].append(0)
+
+                elif len(headers['datetime']) != 0:
+                    headers['blank_lines_cnt'][-1] += 1
+
+                else:
+                    leading_blank_lines_cnt += 1
+
+        return headers, readings, lines_cnt, leading_blank_lines_cnt
+
+    @classmethod
+    def from_binary(cls, file_path : str):
+        '''Creating a store from a binary file (nothing is parsed, readings are widened only when they are taken)'''
+        headers_table, readings_table = BinaryFormat.read_tables(file_path)
+        readings_cnt = len(readings_table)
+        headers_offset = BinaryFormat.PREAMBLE_DTYPE.itemsize
+        readings_offset = headers_offset + len(headers_table) * BinaryFormat.HEADER_DTYPE.itemsize
+
+        start = headers_table['start'].astype(np.int64)
+        end = np.append(start[1:], readings_cnt).astype(np.int64)
+        headers = {
+            'datetime': headers_table['datetime'].astype('datetime64[s]'),
+            'spokes_cnt': headers_table['spokes_cnt'].astype(np.int64),
+            'wheel_circ': headers_table['wheel_circ'].astype(np.int64),
+            'max_voltage': headers_table['max_voltage'].astype(np.int64),
+            'save_delay': headers_table['save_delay'].astype(np.float64),
+            'start': start,
+            'end': end,
+            'offset': headers_offset + np.arange(len(headers_table), dtype=np.int64) * BinaryFormat.HEADER_DTYPE.itemsize,
+            'body_offset': readings_offset + start * BinaryFormat.READING_DTYPE.itemsize,
+            'end_offset': readings_offset + end * BinaryFormat.READING_DTYPE.itemsize,
+            'line_inx': start + np.arange(1, len(headers_table) + 1, dtype=np.int64),
+            'blank_lines_cnt': np.zeros(len(headers_table), dtype=np.int64)
+        }
+        readings = { column: WidenedColumn(readings_table[column], dtype) for column, dtype in ReadingsStore.READINGS_DTYPES.items() }
+        return cls(headers, readings)
+
+    @Profiler.measure('render')
+    def to_binary(self, file_path : str, header_inxs : List[int] = None) -> None:
+        '''Writing the headers to a binary file, each of them keeps readings up to the next written header'''
+        header_inxs = np.arange(self.headers_cnt) if header_inxs is None else np.array(header_inxs, dtype=np.int64)
+        first_reading = int(self.headers['start'][header_inxs[0]]) if len(header_inxs) != 0 else 0
+        last_reading = int(self.headers['end'][header_inxs[-1]]) if len(header_inxs) != 0 else 0
+
+        headers_table = np.empty(len(header_inxs), dtype=BinaryFormat.HEADER_DTYPE)
+        headers_table['datetime'] = self.headers['datetime'][header_inxs].astype('datetime64[s]').astype(np.int64)
+        for column in ('spokes_cnt', 'wheel_circ', 'max_voltage'):
+            headers_table[column] = ReadingsStore.check_range(file_path, column, self.headers[column][header_inxs], BinaryFormat.HEADER_DTYPE[column])
+        headers_table['save_delay'] = self.headers['save_delay'][header_inxs]
+        headers_table['start'] = self.headers['start'][header_inxs] - first_reading
+
+        # NOTE - Readings are checked while they are written, so the incomplete file is removed if some of them do not fit
+        try:
+            BinaryFormat.write_tables(file_path, headers_table, self.iter_readings_tables(file_path, first_reading, last_reading), last_reading - first_reading)
+        except BinaryFormatRangeError:
+            os.remove(file_path)
+            raise
+
+    def iter_readings_tables(self, file_path : str, first_reading : int, last_reading : int) -> Iterator[np.ndarray]:
+        '''Readings in the layout of the binary format, by blocks of BLOCK_SIZE readings'''
+        for block_start in range(first_reading, last_reading, ReadingsStore.BLOCK_SIZE):
+            block_end = min(block_start + ReadingsStore.BLOCK_SIZE, last_reading)
+            readings_table = np.empty(block_end - block_start, dtype=BinaryFormat.READING_DTYPE)
+
+            for column in ReadingsStore.READINGS_DTYPES:
+                readings_table[column] = ReadingsStore.check_range(file_path, column, self.readings[column][block_start:block_end], BinaryFormat.READING_DTYPE[column])
+            yield readings_table
+
+    @staticmethod
+    def check_range(file_path : str, column : str, values : np.ndarray, dtype : np.dtype) -> np.ndarray:
+        '''Values of the column if they fit into the field of the binary format'''
+        if len(values) != 0 and (values.min() < 0 or values.max() > np.iinfo(dtype).max):
+            raise BinaryFormatRangeError(file_path, column)
+        return values
+
+    def build_index(self) -> HeaderIndex:
+        '''Index of headers made from the store (for files that are not validated line by line)'''
+        start, end = self.headers['start'], self.headers['end']
+        last_millis = np.where(end > start, self.readings['millis_passed'][np.maximum(end - 1, 0)] if self.readings_cnt != 0 else 0, 0)
+        return HeaderIndex({
+            'datetime': self.headers['datetime'].astype(HeaderIndex.DTYPES['datetime']),
+            'offset': self.headers['offset'].astype(np.int64),
+            'line_inx': self.headers['line_inx'].astype(np.int64),
+            'last_millis': last_millis.astype(np.int64)
+        })
+
+    @classmethod
+    def from_arrays(cls, arrays : Dict[str, np.ndarray]):
+        '''Creating a store from arrays saved by to_arrays'''
+        headers = { column: arrays[f"headers.{column}"] for column in ReadingsStore.HEADERS_DTYPES }
+        readings = { column: arrays[f"readings.{column}"] for column in ReadingsStore.READINGS_DTYPES }
+        return cls(headers, readings)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        '''All columns with names for saving'''
+        arrays = { f"headers.{column}": values for column, values in self.headers.items() }
+        arrays.update({ f"readings.{column}": values for column, values in self.readings.items() })
+        return arrays
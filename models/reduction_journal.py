@@ -0,0 +1,94 @@
+'''ReductionJournal location'''
+
+import os
+from typing import List, Optional, Tuple
+import numpy as np
+
+class ReductionJournal:
+    '''Plan and last step of a file reduced in place, kept next to the file until the reduction is finished
+
+    Plan is the new beginning of the file (preamble) and the byte ranges that are moved after it. Step is the block that is being moved,
+    with a copy of its bytes if the block overlaps the place it is moved to, so the step can always be repeated after a crash.
+    '''
+
+    MAGIC = b'MARPRED1'
+    STEP_EXTENSION = 'step'
+
+    # NOTE - Plan: preamble size, ranges count; step: source offset, target offset, size, whether the bytes of the block follow
+    PLAN_DTYPE = np.dtype([('preamble_size', '<i8'), ('ranges_cnt', '<i8')])
+    STEP_DTYPE = np.dtype([('source_offset', '<i8'), ('target_offset', '<i8'), ('size', '<i8'), ('with_data', '<i8')])
+
+    def __init__(self, file_path : str) -> None:
+        directory, file_name = os.path.split(os.path.abspath(file_path))
+        self.file_path = file_path
+        self.path = os.path.join(directory, f".{file_name}.reduce")
+        self.step_path = f"{self.path}.{ReductionJournal.STEP_EXTENSION}"
+
+    def exists(self) -> bool:
+        '''Whether the reduction of the file was started and not finished'''
+        return os.path.isfile(self.path)
+
+    def save_plan(self, preamble : bytes, kept_ranges : List[Tuple[int, int]]) -> None:
+        '''Store the plan before the file is changed'''
+        plan = np.array([(len(preamble), len(kept_ranges))], dtype=ReductionJournal.PLAN_DTYPE)
+        ranges = np.array(kept_ranges, dtype='<i8').reshape(-1, 2)
+        ReductionJournal.write_durably(self.path, ReductionJournal.MAGIC + plan.tobytes() + preamble + ranges.tobytes())
+
+    def load_plan(self) -> Tuple[bytes, List[Tuple[int, int]]]:
+        '''Preamble and kept byte ranges of the started reduction'''
+        with open(self.path, 'rb') as file_r:
+            content = file_r.read()
+
+        offset = len(ReductionJournal.MAGIC)
+        plan = np.frombuffer(content, dtype=ReductionJournal.PLAN_DTYPE, count=1, offset=offset)[0]
+        offset += ReductionJournal.PLAN_DTYPE.itemsize
+        preamble = content[offset:offset + int(plan['preamble_size'])]
+        offset += int(plan['preamble_size'])
+        ranges = np.frombuffer(content, dtype='<i8', count=int(plan['ranges_cnt']) * 2, offset=offset).reshape(-1, 2)
+        return preamble, [(int(start), int(end)) for start, end in ranges]
+
+    def save_step(self, source_offset : int, target_offset : int, size : int, data : Optional[bytes] = None) -> None:
+        '''Store the block that is moved next (everything before its target offset is already in place)'''
+        step = np.array([(source_offset, target_offset, size, data is not None)], dtype=ReductionJournal.STEP_DTYPE)
+        ReductionJournal.write_durably(self.step_path, step.tobytes() + (data if data is not None else b''))
+
+    def load_step(self) -> Optional[Tuple[int, int, int, Optional[bytes]]]:
+        '''Source offset, target offset, size and saved bytes (None if they were not saved) of the last block, None if no block was moved'''
+        if not os.path.isfile(self.step_path):
+            return None
+
+        with open(self.step_path, 'rb') as file_r:
+            content = file_r.read()
+
+        step = np.frombuffer(content, dtype=ReductionJournal.STEP_DTYPE, count=1)[0]
+        data = content[ReductionJournal.STEP_DTYPE.itemsize:] if step['with_data'] else None
+        return int(step['source_offset']), int(step['target_offset']), int(step['size']), data
+
+    def remove(self) -> None:
+        '''Remove the journal of the finished reduction (the plan last, so a partly removed journal is still complete)'''
+        if os.path.isfile(self.step_path):
+            os.remove(self.step_path)
+        os.remove(self.path)
+
+    @staticmethod
+    def write_durably(file_path : str, content : bytes) -> None:
+        '''Replace the file with the content at once, the content is on the disk when the function returns'''
+        temporary_path = f"{file_path}.tmp"
+        with open(temporary_path, 'wb') as file_w:
+            file_w.write(content)
+            file_w.flush()
+            os.fsync(file_w.fileno())
+
+        os.replace(temporary_path, file_path)
+
+        # NOTE - Directory is synced too so that the replacement is kept (not possible on some systems)
+        try:
+            directory_descriptor = os.open(os.path.dirname(file_path), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(directory_descriptor)
+        except OSError:
+            pass
+        finally:
+            os.close(directory_descriptor)
@@ -0,0 +1,12 @@
+'''RideProfile location'''
+
+from dataclasses import dataclass
+
+@dataclass
+class RideProfile:
+    '''Manner of riding used to generate synthetic readings'''
+    cruise_speed_kmh: float
+    stop_probability: float
+    rides_per_day: int
+    ride_minutes_min: int
+    ride_minutes_max: int
@@ -0,0 +1,108 @@
+'''Rides location'''
+
+from datetime import datetime
+from typing import Dict
+import numpy as np
+from models.sections_readings import SectionsReadings
+from tools.accumulators import TravelDistanceAccumulator
+
+class Rides:
+    '''Rides of the file split by stops, so that values of every ride are found without the readings
+
+    Ride is a timeline of moving readings (with impulses) without stops, stop is a time of at least the minimal stop duration without moving readings
+    (readings without impulses, pauses between the readings or between the sections). Moving stretches are found in chunks of sections and joined into rides.
+    '''
+
+    DTYPES = {
+        'first_datetime': 'datetime64[ms]',
+        'last_datetime': 'datetime64[ms]',
+        'travel_distance': np.float64,
+        'speed_max': np.float64,
+        'voltage_first': np.float64,
+        'voltage_last': np.float64
+    }
+
+    def __init__(self, columns : Dict[str, np.ndarray]) -> None:
+        self.columns = columns
+
+    @property
+    def rides_cnt(self) -> int:
+        '''Number of rides'''
+        return len(self.columns['first_datetime'])
+
+    @property
+    def durations(self) -> np.ndarray:
+        '''Time from the first to the last moving reading of every ride (sec)'''
+        return (self.columns['last_datetime'] - self.columns['first_datetime']).astype(np.int64) / 1000
+
+    @property
+    def average_speeds(self) -> np.ndarray:
+        '''Travel distance of every ride divided by its duration (km/h)'''
+        durations = self.durations
+        return np.divide(self.columns['travel_distance'] * 3600, durations, out=np.zeros(len(durations)), where=durations != 0)
+
+    @classmethod
+    def from_store(cls, store, minimal_stop_duration : float, minimal_ride_duration : float):
+        '''Rides of the store, rides shorter than the minimal ride duration (sec) are left out
+
+        Sections are processed in chunks of the store (a chunk always has whole sections)
+        '''
+        stretches = store.collect_chunks(Rides.DTYPES, lambda readings: Rides.find_stretches(readings, minimal_stop_duration))
+        if len(stretches['first_datetime']) == 0:
+            return cls(stretches)
+
+        # NOTE - Next stretch continues the ride if it starts earlier than a stop after the end of the previous one
+        gaps = (stretches['first_datetime'][1:] - stretches['last_datetime'][:-1]).astype(np.int64)
+        is_ride_start = np.ones(len(stretches['first_datetime']), dtype=bool)
+        is_ride_start[1:] = (gaps >= minimal_stop_duration * 1000) | (gaps < 0)
+        ride_starts = np.flatnonzero(is_ride_start)
+        ride_ends = np.append(ride_starts[1:], len(is_ride_start)) - 1
+
+        rides = cls({
+            'first_datetime': stretches['first_datetime'][ride_starts],
+            'last_datetime': stretches['last_datetime'][ride_ends],
+            'travel_distance': np.add.reduceat(stretches['travel_distance'], ride_starts),
+            'speed_max': np.maximum.reduceat(stretches['speed_max'], ride_starts),
+            'voltage_first': stretches['voltage_first'][ride_starts],
+            'voltage_last': stretches['voltage_last'][ride_ends]
+        })
+
+        is_long = rides.durations >= minimal_ride_duration
+        order = np.argsort(rides.columns['first_datetime'][is_long], kind='stable')
+        return cls({ column: values[is_long][order] for column, values in rides.columns.items() })
+
+    @staticmethod
+    def find_stretches(readings : SectionsReadings, minimal_stop_duration : float) -> Dict[str, np.ndarray]:
+        '''Runs of consecutive moving readings of one section without stops inside them'''
+        sections, speeds_kmh, readings_datetimes = readings.sections, readings.speeds_kmh, readings.datetimes
+
+        # NOTE - Each pair of readings of one section belongs to the later reading
+        _, pairs_distances = TravelDistanceAccumulator.pairs_travel(readings.millis_passed, speeds_kmh)
+        readings_distances = np.zeros(len(sections))
+        readings_distances[1:] = np.where(sections[1:] == sections[:-1], pairs_distances, 0)
+
+        moving_inxs = np.flatnonzero(np.asarray(readings.impulse_cnt) != 0)
+        is_stretch_start = np.ones(len(moving_inxs), dtype=bool)
+        is_stretch_start[1:] = (np.diff(moving_inxs) != 1) | (sections[moving_inxs[1:]] != sections[moving_inxs[:-1]]) | \
+                               (np.diff(readings_datetimes[moving_inxs]).astype(np.int64) >= minimal_stop_duration * 1000)
+        stretch_starts = np.flatnonzero(is_stretch_start)
+        stretch_ends = np.append(stretch_starts[1:], len(moving_inxs)) - 1
+
+        if len(stretch_starts) == 0:
+            return { column: np.empty(0, dtype=dtype) for column, dtype in Rides.DTYPES.items() }
+
+        voltages_v = readings.voltages_v[moving_inxs]
+        return {
+            'first_datetime': readings_datetimes[moving_inxs[stretch_starts]],
+            'last_datetime': readings_datetimes[moving_inxs[stretch_ends]],
+            'travel_distance': np.add.reduceat(readings_distances[moving_inxs], stretch_starts),
+            'speed_max': np.maximum.reduceat(speeds_kmh[moving_inxs], stretch_starts),
+            'voltage_first': voltages_v[stretch_starts],
+            'voltage_last': voltages_v[stretch_ends]
+        }
+
+    def select(self, datetime_start : datetime, datetime_end : datetime) -> range:
+        '''Indexes of the rides starting within the interval'''
+        first_inx = int(np.searchsorted(self.columns['first_datetime'], np.datetime64(datetime_start, 'ms'), side='left'))
+        last_inx = int(np.searchsorted(self.columns['first_datetime'], np.datetime64(datetime_end, 'ms'), side='right'))
+        return range(first_inx, max(first_inx, last_inx))
@@ -0,0 +1,13 @@
+'''SectionValues location'''
+
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class SectionValues:
+    '''Calculated readings of one header section that fall within the requested interval'''
+    header_inx: int
+    millis_passed: np.ndarray
+    speeds_kmh: np.ndarray
+    voltages_v: np.ndarray
+    header_datetime: np.datetime64
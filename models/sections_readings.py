@@ -0,0 +1,14 @@
+'''SectionsReadings location'''
+
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class SectionsReadings:
+    '''Calculated readings of consecutive whole header sections, each reading with the index of its section and its time'''
+    sections: np.ndarray
+    millis_passed: np.ndarray
+    impulse_cnt: np.ndarray
+    speeds_kmh: np.ndarray
+    voltages_v: np.ndarray
+    datetimes: np.ndarray
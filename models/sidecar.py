@@ -0,0 +1,142 @@
+'''Sidecar location'''
+
+import os
+import hashlib
+import tempfile
+from typing import Dict
+import yaml
+import numpy as np
+from loguru import logger
+from models.npy_writer import NpyWriter
+
+class Sidecar:
+    '''Cached data stored next to the source file, invalidated when the source changes'''
+
+    SAMPLE_SIZE = 1 << 20
+    PART_EXTENSION = 'npy.part'
+
+    # NOTE - Entries saved by other versions are not used and not continued when the file grows
+    VERSION = 2
+
+    # NOTE - Entries read or written by this process, commands run one after another in it (alias groups) do not read them again
+    memory = {}
+
+    def __init__(self, file_path : str) -> None:
+        directory, file_name = os.path.split(os.path.abspath(file_path))
+        self.file_path = file_path
+        self.path = os.path.join(directory, f".{file_name}.marp")
+
+    def fingerprint(self) -> dict:
+        '''Key of the source file: size, modification time and hash of its first and last blocks'''
+        stat = os.stat(self.file_path)
+        return { 'version': Sidecar.VERSION, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': Sidecar.hash_sample(self.file_path, stat.st_size) }
+
+    @staticmethod
+    def hash_sample(file_path : str, size : int) -> str:
+        '''Hash of the first and last SAMPLE_SIZE bytes of the file (the whole file if it is smaller)'''
+        digest = hashlib.blake2b(digest_size=16)
+        with open(file_path, 'rb') as file_r:
+            digest.update(file_r.read(min(Sidecar.SAMPLE_SIZE, size)))
+            if size > Sidecar.SAMPLE_SIZE:
+                file_r.seek(max(Sidecar.SAMPLE_SIZE, size - Sidecar.SAMPLE_SIZE))
+                digest.update(file_r.read(size - file_r.tell()))
+        return digest.hexdigest()
+
+    def is_appended(self, fingerprint : dict, previous_fingerprint : dict) -> bool:
+        '''Whether the source file has only grown since the previous fingerprint (its former content is kept at the beginning)'''
+        return previous_fingerprint.get('version') == fingerprint['version'] and fingerprint['size'] > previous_fingerprint['size'] and \
+            Sidecar.hash_sample(self.file_path, previous_fingerprint['size']) == previous_fingerprint['hash']
+
+    def entry_path(self, name : str, extension='yaml') -> str:
+        '''Path of a single cache entry inside the sidecar directory'''
+        return os.path.join(self.path, f"{name}.{extension}")
+
+    def load(self, name : str, fingerprint : dict) -> dict:
+        '''Return cached data if it was saved for the same fingerprint, otherwise None'''
+        data = self.recall(name, fingerprint)
+        if data is not None:
+            return data
+
+        entry = self.load_entry(name)
+        if entry is not None and entry.get('fingerprint') == fingerprint:
+            return self.remember(name, fingerprint, entry.get('data'))
+        return None
+
+    def recall(self, name : str, fingerprint : dict):
+        '''Entry kept in the memory of the process for the same fingerprint (None if there is no such entry)'''
+        remembered = Sidecar.memory.get((self.path, name))
+        return remembered[1] if remembered is not None and remembered[0] == fingerprint else None
+
+    def remember(self, name : str, fingerprint : dict, value):
+        '''Keep the entry in the memory of the process and return it'''
+        Sidecar.memory[(self.path, name)] = (fingerprint, value)
+        return value
+
+    def load_fingerprint(self, name : str) -> dict:
+        '''Fingerprint for which the cached data was saved (None if there is no data)'''
+        entry = self.load_entry(name)
+        fingerprint = entry.get('fingerprint') if entry is not None else None
+        return fingerprint if isinstance(fingerprint, dict) and {'size', 'hash'} <= fingerprint.keys() else None
+
+    def load_entry(self, name : str) -> dict:
+        '''Cached data with its fingerprint as it is saved (None if it is missing or damaged)'''
+        try:
+            with open(self.entry_path(name), 'r', encoding='UTF-8') as file_r:
+                entry = yaml.safe_load(file_r)
+        except (OSError, yaml.YAMLError):
+            return None
+
+        return entry if isinstance(entry, dict) else None
+
+    def save(self, name : str, fingerprint : dict, data : dict) -> None:
+        '''Store data for the fingerprint (failures are not critical, the cache is simply not used)'''
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with open(self.entry_path(name), 'w', encoding='UTF-8') as file_w:
+                yaml.safe_dump({ 'fingerprint': fingerprint, 'data': data }, file_w, default_flow_style=False)
+        except OSError:
+            logger.warning(f"Failed to save cache next to the file {self.file_path}, it will be rebuilt next time")
+
+        self.remember(name, fingerprint, data)
+
+    def load_arrays(self, name : str, fingerprint : dict) -> Dict[str, np.ndarray]:
+        '''Return memory-mapped arrays if they were saved for the same fingerprint, otherwise None'''
+        arrays = self.recall(f"{name}.arrays", fingerprint)
+        data = self.load(name, fingerprint) if arrays is None else None
+        if arrays is not None or data is None:
+            return arrays
+
+        try:
+            return self.remember(f"{name}.arrays", fingerprint, { column: np.load(self.entry_path(f"{name}.{column}", 'npy'), mmap_mode='r') for column in data['columns'] })
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def open_writer(self, name : str, column : str, dtype : np.dtype) -> NpyWriter:
+        '''Writer of a column which is saved later with save_arrays without copying (in a temporary file if the sidecar cannot be written)'''
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            return NpyWriter(self.entry_path(f"{name}.{column}", Sidecar.PART_EXTENSION), dtype)
+        except OSError:
+            file_descriptor, file_path = tempfile.mkstemp(suffix=f".{Sidecar.PART_EXTENSION}")
+            os.close(file_descriptor)
+            return NpyWriter(file_path, dtype, is_temporary=True)
+
+    def save_arrays(self, name : str, fingerprint : dict, arrays : Dict[str, np.ndarray]) -> None:
+        '''Store arrays for the fingerprint, the description is written last so that a partial save is never used
+
+        Arrays mapped from files of open_writer are moved in place instead of being written again
+        '''
+        self.remember(f"{name}.arrays", fingerprint, arrays)
+
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            for column, values in arrays.items():
+                if isinstance(values, np.memmap) and values.filename is not None and values.filename.endswith(Sidecar.PART_EXTENSION) and os.path.exists(values.filename):
+                    os.replace(values.filename, self.entry_path(f"{name}.{column}", 'npy'))
+                else:
+                    np.save(self.entry_path(f"{name}.{column}", 'npy'), values)
+        except OSError:
+            logger.warning(f"Failed to save cache next to the file {self.file_path}, it will be rebuilt next time")
+            return
+
+        self.save(name, fingerprint, { 'columns': list(arrays) })
@@ -0,0 +1,40 @@
+'''SpeedSegments location'''
+
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class SpeedSegments:
+    '''Parts of one header section where the speed changes in one direction, found between turning points of the speeds'''
+    first_inxs: np.ndarray
+    last_inxs: np.ndarray
+    durations_sec: np.ndarray
+    accelerations: np.ndarray
+
+    @classmethod
+    def find(cls, millis_passed: np.ndarray, speeds_kmh: np.ndarray):
+        '''Segments of the readings of one section, speed that stays unchanged at a turning point does not belong to any segment'''
+        millis_passed, speeds_kmh = np.asarray(millis_passed, dtype=np.int64), np.asarray(speeds_kmh, dtype=np.float64)
+        directions = np.sign(np.diff(speeds_kmh))
+
+        # NOTE - Segment is a run of speed changes in one direction, readings with unchanged speed inside the run do not end it
+        changes_inxs = np.flatnonzero(directions != 0)
+        changes_directions = directions[changes_inxs]
+        turns = np.flatnonzero(changes_directions[1:] != changes_directions[:-1]) + 1
+        first_inxs = changes_inxs[np.concatenate(([0], turns))] if len(changes_inxs) != 0 else changes_inxs
+        last_inxs = changes_inxs[np.concatenate((turns - 1, [len(changes_inxs) - 1]))] + 1 if len(changes_inxs) != 0 else changes_inxs
+
+        durations_sec = np.abs(millis_passed[last_inxs] - millis_passed[first_inxs]) / 1000
+
+        # NOTE - Readings written at the same moment give no acceleration
+        is_timed = durations_sec != 0
+        first_inxs, last_inxs, durations_sec = first_inxs[is_timed], last_inxs[is_timed], durations_sec[is_timed]
+        accelerations = (speeds_kmh[last_inxs] - speeds_kmh[first_inxs]) * 1000 / 3600 / durations_sec
+        return cls(first_inxs, last_inxs, durations_sec, accelerations)
+
+    def select_accelerations(self, find_increase: bool) -> np.ndarray:
+        '''Accelerations of the segments with increasing (> 0) or decreasing (< 0) speed (m/s^2)'''
+        return self.accelerations[self.accelerations > 0] if find_increase else self.accelerations[self.accelerations < 0]
+
+    def __len__(self) -> int:
+        return len(self.accelerations)
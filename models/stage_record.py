@@ -0,0 +1,12 @@
+'''StageRecord location'''
+
+from dataclasses import dataclass
+
+@dataclass
+class StageRecord:
+    '''Measurements of one stage of a command, summed over all its calls'''
+    name: str
+    wall_sec: float = 0.0
+    lines_cnt: int = 0
+    peak_memory: int = 0
+    calls_cnt: int = 0
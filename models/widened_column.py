@@ -0,0 +1,16 @@
+'''WidenedColumn location'''
+
+import numpy as np
+
+class WidenedColumn:
+    '''Column of narrow values (such as a field of a memory-mapped table) which are widened only when they are taken'''
+
+    def __init__(self, values : np.ndarray, dtype : np.dtype) -> None:
+        self.values = values
+        self.dtype = np.dtype(dtype)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, key) -> np.ndarray:
+        return np.asarray(self.values[key]).astype(self.dtype)
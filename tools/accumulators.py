@@ -0,0 +1,317 @@
+'''Accumulators location'''
+
+from typing import Dict, List, Tuple
+import numpy as np
+from models.section_values import SectionValues
+from models.speed_segments import SpeedSegments
+from tools.downsampler import Downsampler
+
+class Accumulator:
+    '''Value that is calculated section by section during a single pass over the file'''
+
+    def update(self, section: SectionValues) -> None:
+        '''Taking into account readings of the next section'''
+        raise NotImplementedError
+
+    def merge(self, other) -> None:
+        '''Taking into account an accumulator of the same type filled with the following sections (in another process)'''
+        raise NotImplementedError
+
+    def update_days(self, rows: Dict[str, np.ndarray]) -> bool:
+        '''Taking into account rows of DayRollups instead of the readings (False if the value can not be found from them)'''
+        return False
+
+    def result(self):
+        '''Final value of the target'''
+        raise NotImplementedError
+
+class VoltageIntervalAccumulator(Accumulator):
+    '''Minimal and maximal voltage (v)'''
+
+    def __init__(self, minimal_voltage_search: int) -> None:
+        self.minimal_voltage_search = minimal_voltage_search
+        self.interval = {}
+
+    def update(self, section: SectionValues) -> None:
+        voltages_v = section.voltages_v[section.voltages_v >= self.minimal_voltage_search]
+
+        if len(voltages_v) != 0:
+            self.interval['min'] = min(self.interval.get('min', float(voltages_v.min())), float(voltages_v.min()))
+            self.interval['max'] = max(self.interval.get('max', float(voltages_v.max())), float(voltages_v.max()))
+
+    def merge(self, other) -> None:
+        for key, function in (('min', min), ('max', max)):
+            if key in other.interval:
+                self.interval[key] = function(self.interval.get(key, other.interval[key]), other.interval[key])
+
+    def update_days(self, rows: Dict[str, np.ndarray]) -> bool:
+        is_piece = rows['readings_cnt'] != 0
+        voltages_min, voltages_max = rows['voltage_min'][is_piece], rows['voltage_max'][is_piece]
+
+        # NOTE - Minimum of the voltages above the search limit is unknown if the day has voltages on both sides of it
+        if ((voltages_min < self.minimal_voltage_search) & (voltages_max >= self.minimal_voltage_search)).any():
+            return False
+
+        is_searched = voltages_min >= self.minimal_voltage_search
+        if is_searched.any():
+            self.merge(VoltageIntervalAccumulator.from_interval(self.minimal_voltage_search, float(voltages_min[is_searched].min()), float(voltages_max[is_searched].max())))
+        return True
+
+    def result(self) -> dict[str, float]:
+        return self.interval
+
+    @classmethod
+    def from_interval(cls, minimal_voltage_search: int, voltage_min: float, voltage_max: float):
+        '''Accumulator with an already found interval'''
+        accumulator = cls(minimal_voltage_search)
+        accumulator.interval = { 'min': voltage_min, 'max': voltage_max }
+        return accumulator
+
+class AverageSpeedAccumulator(Accumulator):
+    '''Average speed (km/h)'''
+
+    def __init__(self) -> None:
+        self.speed_sum = self.speed_cnt = 0
+
+    def update(self, section: SectionValues) -> None:
+        self.speed_sum += float(section.speeds_kmh.sum())
+        self.speed_cnt += len(section.speeds_kmh)
+
+    def merge(self, other) -> None:
+        self.speed_sum += other.speed_sum
+        self.speed_cnt += other.speed_cnt
+
+    def update_days(self, rows: Dict[str, np.ndarray]) -> bool:
+        self.speed_sum += float(rows['speed_sum'].sum())
+        self.speed_cnt += int(rows['readings_cnt'].sum())
+        return True
+
+    def result(self) -> float:
+        if self.speed_cnt != 0 and self.speed_sum != 0:
+            return self.speed_sum / self.speed_cnt
+        else:
+            return 0
+
+class TravelTimeAccumulator(Accumulator):
+    '''Travel time (sec)'''
+
+    def __init__(self) -> None:
+        self.travel_time_sec = 0
+
+    def update(self, section: SectionValues) -> None:
+        self.travel_time_sec += float(TravelDistanceAccumulator.pairs_travel(section.millis_passed, section.speeds_kmh)[0].sum())
+
+    def merge(self, other) -> None:
+        self.travel_time_sec += other.travel_time_sec
+
+    def update_days(self, rows: Dict[str, np.ndarray]) -> bool:
+        self.travel_time_sec += float(rows['travel_time'].sum())
+        return True
+
+    def result(self) -> float:
+        return self.travel_time_sec
+
+class TravelDistanceAccumulator(Accumulator):
+    '''Travel distance (km)'''
+
+    def __init__(self) -> None:
+        self.travel_distance_km = 0
+
+    def update(self, section: SectionValues) -> None:
+        self.travel_distance_km += float(TravelDistanceAccumulator.pairs_travel(section.millis_passed, section.speeds_kmh)[1].sum())
+
+    def merge(self, other) -> None:
+        self.travel_distance_km += other.travel_distance_km
+
+    def update_days(self, rows: Dict[str, np.ndarray]) -> bool:
+        self.travel_distance_km += float(rows['travel_distance'].sum())
+        return True
+
+    def result(self) -> float:
+        return self.travel_distance_km
+
+    @staticmethod
+    def pairs_travel(millis_passed: np.ndarray, speeds_kmh: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        '''Travel time (sec) and distance (km) of every pair of consecutive readings, speed of the later reading is used'''
+        times_sec = np.abs(np.diff(millis_passed)) / 1000
+        return times_sec, (times_sec / 60) * (speeds_kmh[1:] / 60)
+
+class AverageAccelerationAccumulator(Accumulator):
+    '''Average speed boost or decrease (m/s^2)'''
+
+    def __init__(self, find_increase: bool) -> None:
+        self.find_increase = find_increase
+        self.acceleration_sum = self.acceleration_cnt = 0
+
+    def update(self, section: SectionValues) -> None:
+        accelerations = SpeedSegments.find(section.millis_passed, section.speeds_kmh).select_accelerations(self.find_increase)
+        self.acceleration_sum += float(accelerations.sum())
+        self.acceleration_cnt += len(accelerations)
+
+    def merge(self, other) -> None:
+        self.acceleration_sum += other.acceleration_sum
+        self.acceleration_cnt += other.acceleration_cnt
+
+    def result(self) -> float:
+        if self.acceleration_sum != 0 and self.acceleration_cnt != 0:
+            return self.acceleration_sum / self.acceleration_cnt
+        else:
+            return 0
+
+class TimeBucketsAccumulator(Accumulator):
+    '''Speeds, voltages and travel values of the readings aggregated into buckets of fixed time (mean, minimum, maximum and count per bucket)'''
+
+    # NOTE - Size of the buckets in milliseconds, buckets start at whole seconds, minutes, hours and days
+    RESOLUTIONS = {
+        '1s': 1000,
+        '1m': 60 * 1000,
+        '1h': 60 * 60 * 1000,
+        '1d': 24 * 60 * 60 * 1000
+    }
+    COLUMNS = ('datetime', 'readings_cnt', 'speed_mean', 'speed_min', 'speed_max', 'voltage_mean', 'voltage_min', 'voltage_max', 'travel_time', 'travel_distance')
+
+    # NOTE - Runs of the parts are joined into one run per bucket once there are more of them (then once their number doubles)
+    MAXIMAL_RUNS_CNT = 1 << 16
+
+    def __init__(self, resolution: str) -> None:
+        self.bucket_millis = TimeBucketsAccumulator.RESOLUTIONS[resolution]
+        self.parts = []
+        self.runs_cnt = 0
+        self.joining_runs_cnt = TimeBucketsAccumulator.MAXIMAL_RUNS_CNT
+
+    def update(self, section: SectionValues) -> None:
+        if len(section.millis_passed) == 0:
+            return
+
+        readings_millis = section.header_datetime.astype(np.int64) + np.asarray(section.millis_passed, dtype=np.int64)
+        buckets = readings_millis // self.bucket_millis
+
+        # NOTE - Readings of a section are in time order, so every run of one bucket is reduced at once
+        is_run_start = np.ones(len(buckets), dtype=bool)
+        is_run_start[1:] = buckets[1:] != buckets[:-1]
+        run_starts = np.flatnonzero(is_run_start)
+
+        # NOTE - Each pair of readings belongs to the bucket of the later reading
+        pairs_times, pairs_distances = TravelDistanceAccumulator.pairs_travel(section.millis_passed, section.speeds_kmh)
+        travel_times, travel_distances = np.append(0.0, pairs_times), np.append(0.0, pairs_distances)
+
+        self.add_parts([{
+            'bucket': buckets[run_starts],
+            'readings_cnt': np.diff(np.append(run_starts, len(buckets))),
+            'speed_sum': np.add.reduceat(section.speeds_kmh, run_starts),
+            'speed_min': np.minimum.reduceat(section.speeds_kmh, run_starts),
+            'speed_max': np.maximum.reduceat(section.speeds_kmh, run_starts),
+            'voltage_sum': np.add.reduceat(section.voltages_v, run_starts),
+            'voltage_min': np.minimum.reduceat(section.voltages_v, run_starts),
+            'voltage_max': np.maximum.reduceat(section.voltages_v, run_starts),
+            'travel_time': np.add.reduceat(travel_times, run_starts),
+            'travel_distance': np.add.reduceat(travel_distances, run_starts)
+        }])
+
+    def merge(self, other) -> None:
+        self.add_parts(other.parts)
+
+    def add_parts(self, parts: List[Dict[str, np.ndarray]]) -> None:
+        '''Keeping runs of the next sections, all runs are joined by buckets if there are too many of them'''
+        self.parts.extend(parts)
+        self.runs_cnt += sum(len(part['bucket']) for part in parts)
+
+        if self.runs_cnt > self.joining_runs_cnt:
+            self.parts = [self.join()]
+            self.runs_cnt = len(self.parts[0]['bucket'])
+            self.joining_runs_cnt = max(TimeBucketsAccumulator.MAXIMAL_RUNS_CNT, self.runs_cnt * 2)
+
+    def join(self) -> Dict[str, np.ndarray]:
+        '''Runs of all parts joined into one run per bucket in time order'''
+        # NOTE - Bucket can have runs from several sections, they are joined after sorting
+        runs = { column: np.concatenate([part[column] for part in self.parts]) for column in self.parts[0] }
+        order = np.argsort(runs['bucket'], kind='stable')
+        runs = { column: values[order] for column, values in runs.items() }
+        bucket_starts = np.flatnonzero(np.append(True, runs['bucket'][1:] != runs['bucket'][:-1]))
+
+        reductions = { 'bucket': None, 'speed_min': np.minimum, 'speed_max': np.maximum, 'voltage_min': np.minimum, 'voltage_max': np.maximum }
+        return {
+            column: values[bucket_starts] if column == 'bucket' else reductions.get(column, np.add).reduceat(values, bucket_starts)
+            for column, values in runs.items()
+        }
+
+    def result(self) -> Dict[str, np.ndarray]:
+        '''Values of the buckets with readings in time order: start of the bucket, count, mean, minimum and maximum of speed and voltage, travel time and distance'''
+        if len(self.parts) == 0:
+            return { column: np.empty(0, dtype='datetime64[ms]' if column == 'datetime' else np.float64) for column in TimeBucketsAccumulator.COLUMNS }
+
+        buckets = self.join()
+        return {
+            'datetime': (buckets['bucket'] * self.bucket_millis).astype('datetime64[ms]'),
+            'readings_cnt': buckets['readings_cnt'],
+            'speed_mean': buckets['speed_sum'] / buckets['readings_cnt'],
+            'speed_min': buckets['speed_min'],
+            'speed_max': buckets['speed_max'],
+            'voltage_mean': buckets['voltage_sum'] / buckets['readings_cnt'],
+            'voltage_min': buckets['voltage_min'],
+            'voltage_max': buckets['voltage_max'],
+            'travel_time': buckets['travel_time'],
+            'travel_distance': buckets['travel_distance']
+        }
+
+class SeriesAccumulator(Accumulator):
+    '''Speed (km/h) or voltage (v) of the readings over time, reduced to the first, the last, the minimal and the maximal readings of every time bucket
+
+    Every point keeps whether the line has a break before it (readings further apart than the gap, or going back in time)
+    '''
+
+    # NOTE - Kept points are reduced again once there are more of them, so the accumulator stays small for intervals of any length
+    MAXIMAL_POINTS_CNT = 1 << 16
+
+    def __init__(self, column: str, bucket_millis: int, gap_millis: int) -> None:
+        self.column = column
+        self.bucket_millis = bucket_millis
+        self.gap_millis = gap_millis
+        self.parts = []
+        self.points_cnt = 0
+        self.joining_points_cnt = SeriesAccumulator.MAXIMAL_POINTS_CNT
+
+    def update(self, section: SectionValues) -> None:
+        if len(section.millis_passed) == 0:
+            return
+
+        readings_millis = section.header_datetime.astype(np.int64) + np.asarray(section.millis_passed, dtype=np.int64)
+        readings_values = section.speeds_kmh if self.column == 'speed' else section.voltages_v
+        readings_breaks = np.zeros(len(readings_millis), dtype=bool)
+        readings_breaks[1:] = np.abs(np.diff(readings_millis)) > self.gap_millis
+
+        chosen_inxs = Downsampler.min_max(readings_millis, readings_values, self.bucket_millis)
+        self.add_parts([{ 'millis': readings_millis[chosen_inxs], 'values': np.asarray(readings_values, dtype=np.float64)[chosen_inxs], 'breaks': Downsampler.select(readings_breaks, chosen_inxs) }])
+
+    def merge(self, other) -> None:
+        self.add_parts(other.parts)
+
+    def add_parts(self, parts: List[Dict[str, np.ndarray]]) -> None:
+        '''Keeping points of the next sections, all points are reduced again if there are too many of them'''
+        self.parts.extend(parts)
+        self.points_cnt += sum(len(part['millis']) for part in parts)
+
+        # NOTE - Points left after joining are not joined again until their number doubles
+        if self.points_cnt > self.joining_points_cnt:
+            self.parts = [self.join()]
+            self.points_cnt = len(self.parts[0]['millis'])
+            self.joining_points_cnt = max(SeriesAccumulator.MAXIMAL_POINTS_CNT, self.points_cnt * 2)
+
+    def join(self) -> Dict[str, np.ndarray]:
+        '''Points of all parts in time order, reduced by the buckets once more'''
+        if len(self.parts) == 0:
+            return { 'millis': np.empty(0, dtype=np.int64), 'values': np.empty(0), 'breaks': np.empty(0, dtype=bool) }
+
+        points = { column: np.concatenate([part[column] for part in self.parts]) for column in ('millis', 'values', 'breaks') }
+        order = np.argsort(points['millis'], kind='stable')
+        points = { column: values[order] for column, values in points.items() }
+
+        # NOTE - Points of different sections (and files) are apart only if there is a gap between them
+        points['breaks'][1:] |= np.diff(points['millis']) > self.gap_millis
+
+        chosen_inxs = Downsampler.min_max(points['millis'], points['values'], self.bucket_millis)
+        return { 'millis': points['millis'][chosen_inxs], 'values': points['values'][chosen_inxs], 'breaks': Downsampler.select(points['breaks'], chosen_inxs) }
+
+    def result(self) -> Dict[str, np.ndarray]:
+        '''Times (milliseconds since the epoch), values and breaks of the kept points in time order'''
+        return self.join()
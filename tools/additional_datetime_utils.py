@@ -3,10 +3,18 @@
 from datetime import datetime, timedelta, time
 from models.exceptions import InvalidDateTimePassedError, InvalidDatePassedError
 
+def parse_datetime(datetime_str: str) -> datetime:
+    '''Parse str using pattern dd.mm.yyyy-hh:mm:ss by slicing (strptime is used only for unusual layouts, raises ValueError)'''
+    if len(datetime_str) == 19 and datetime_str.isascii() and datetime_str[2] == datetime_str[5] == '.' and datetime_str[10] == '-' and datetime_str[13] == datetime_str[16] == ':' and \
+       (datetime_str[:2] + datetime_str[3:5] + datetime_str[6:10] + datetime_str[11:13] + datetime_str[14:16] + datetime_str[17:]).isdecimal():
+        return datetime(int(datetime_str[6:10]), int(datetime_str[3:5]), int(datetime_str[:2]), int(datetime_str[11:13]), int(datetime_str[14:16]), int(datetime_str[17:]))
+
+    return datetime.strptime(datetime_str, '%d.%m.%Y-%H:%M:%S')
+
 def is_datetime(datetime_str: str) -> bool:
     '''Return whether the string can be interpreted as a datetime'''
     try:
-        datetime.strptime(datetime_str, '%d.%m.%Y-%H:%M:%S')
+        parse_datetime(datetime_str)
         return True
     except ValueError:
         return False
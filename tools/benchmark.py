@@ -0,0 +1,101 @@
+'''Benchmark location'''
+
+import os
+import sys
+import glob
+import time
+import shutil
+import subprocess
+from datetime import timedelta
+from typing import Dict, List
+from models.sidecar import Sidecar
+from models.benchmark_result import BenchmarkResult
+from tools.line_scanner import LineScanner
+
+class Benchmark:
+    '''Timing commands on the same file, every command is called in a new process as by the user'''
+
+    MARP_PATH = os.path.join(os.path.split(os.path.abspath(__file__))[0], '..', 'marp.py')
+
+    # NOTE - Graph covers the first 30 days of the file, the window is not opened (Agg backend)
+    CASES = {
+        'check': ['check', '-i', '{input}'],
+        'show headers': ['show', '-i', '{input}', '-he'],
+        'show readings': ['show', '-i', '{input}', '-re'],
+        'show calculated readings': ['show', '-i', '{input}', '-cr'],
+        'calc voltage interval': ['calc', '-i', '{input}', '-vi'],
+        'calc accelerations': ['calc', '-i', '{input}', '-ac'],
+        'calc average acceleration': ['calc', '-i', '{input}', '-aa'],
+        'calc average deceleration': ['calc', '-i', '{input}', '-ad'],
+        'calc average speed': ['calc', '-i', '{input}', '-as'],
+        'calc travel time': ['calc', '-i', '{input}', '-tt'],
+        'calc travel distance': ['calc', '-i', '{input}', '-td'],
+        'calc all': ['calc', '-i', '{input}', '-al'],
+        'graph travel time': ['graph', '-i', '{input}', '-tt', '-d', '{date_start}', '{date_end}'],
+        'graph travel distance': ['graph', '-i', '{input}', '-td', '-d', '{date_start}', '{date_end}'],
+        'split': ['split', '-i', '{input}', '-p', '4'],
+        'reduce': ['reduce', '-i', '{input}']
+    }
+
+    def __init__(self, file_path: str, jobs: int = 1) -> None:
+        self.file_path = file_path
+        self.jobs = jobs
+        self.lines_cnt = Benchmark.count_lines(file_path)
+        self.arguments = { 'input': file_path, **Benchmark.get_dates(file_path) }
+
+    def run(self, cases: List[str]) -> List[BenchmarkResult]:
+        '''Time each case twice: with the cache of the file removed and with the cache left by the first call'''
+        results = []
+        for case in cases:
+            self.clean()
+            cold_sec, cold_succeeded = self.time_case(case)
+            warm_sec, warm_succeeded = self.time_case(case)
+            results.append(BenchmarkResult(case, self.lines_cnt, cold_sec, warm_sec, cold_succeeded and warm_succeeded))
+
+        self.clean()
+        return results
+
+    def time_case(self, case: str) -> tuple:
+        '''Time of a single call of the command and whether it finished without errors'''
+        command = [sys.executable, Benchmark.MARP_PATH, '--jobs', str(self.jobs)] + [argument.format(**self.arguments) for argument in Benchmark.CASES[case]]
+
+        start_time = time.perf_counter()
+        process = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env={ **os.environ, 'MPLBACKEND': 'Agg' }, check=False)
+        return time.perf_counter() - start_time, process.returncode == 0
+
+    def clean(self) -> None:
+        '''Remove the cache of the file and the files created by split and reduce'''
+        shutil.rmtree(Sidecar(self.file_path).path, ignore_errors=True)
+
+        file_base = os.path.splitext(self.file_path)[0]
+        for created_path in glob.glob(f"{glob.escape(file_base)}_part_*") + glob.glob(f"{glob.escape(file_base)}_reduced*"):
+            os.remove(created_path)
+
+    @staticmethod
+    def count_lines(file_path: str) -> int:
+        '''Number of lines in the file (counted without the checks, so that no cache is created)'''
+        with LineScanner(file_path) as scanner:
+            return sum(1 for _ in scanner.iter_lines())
+
+    @staticmethod
+    def get_dates(file_path: str) -> Dict[str, str]:
+        '''Interval of the graphs: 30 days starting with the date of the first header'''
+        with LineScanner(file_path) as scanner:
+            header_offset = scanner.find_header(0)
+            header = LineScanner.parse_line(next(scanner.iter_lines(header_offset))[2]) if header_offset != -1 else None
+
+        if header is None or isinstance(header, tuple):
+            return { 'date_start': '01.01.2000', 'date_end': '30.01.2000' }
+        return { 'date_start': header.datetime.strftime('%d.%m.%Y'), 'date_end': (header.datetime + timedelta(days=29)).strftime('%d.%m.%Y') }
+
+    @staticmethod
+    def format_report(results: List[BenchmarkResult]) -> List[str]:
+        '''Table of the results with lines per second'''
+        case_width = max(len(result.case) for result in results) if len(results) != 0 else 0
+        lines = [f"{'Command'.ljust(case_width)} | {'Cold (s)':>9} | {'Lines/s':>11} | {'Warm (s)':>9} | {'Lines/s':>11}"]
+        lines.append('-' * len(lines[0]))
+
+        for result in results:
+            line = f"{result.case.ljust(case_width)} | {result.cold_sec:9.3f} | {result.cold_lines_per_sec:11,.0f} | {result.warm_sec:9.3f} | {result.warm_lines_per_sec:11,.0f}"
+            lines.append(line if result.succeeded else line + " (failed)")
+        return lines
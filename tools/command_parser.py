@@ -1,38 +1,67 @@
 '''Main CommandParser location'''
 
-from argparse import ArgumentParser
-from tools.subparsers.show_subparser import ShowSubParser
-from tools.subparsers.check_subparser import CheckSubParser
-from tools.subparsers.reduce_subparser import ReduceSubParser
-from tools.subparsers.calc_subparser import CalcSubParser
-from tools.subparsers.template_subparser import TemplateSubParser
-from tools.subparsers.split_subparser import SplitSubParser
-from tools.subparsers.alias_subparser import AliasSubParser
-from tools.subparsers.graph_subparser import GraphSubParser
+from argparse import ArgumentParser, Action
+from typing import List
+from loguru import logger
+from tools.parallel import Parallel
+from tools.profiler import Profiler
+from tools.display_utils import Color
+from tools.command_registry import CommandRegistry
+
+class JobsAction(Action):
+    '''Setting the number of processes as soon as the option is parsed (files are validated while parsing the command)'''
+
+    def __call__(self, parser, namespace, values, option_string=None) -> None:
+        if values < 0:
+            parser.error(f"argument {option_string}: number of processes can not be negative")
+        Parallel.set_jobs(values)
+        setattr(namespace, self.dest, Parallel.jobs)
+
+class ProfileAction(Action):
+    '''Starting the profiler as soon as the option is parsed (files are validated while parsing the command)'''
+
+    def __call__(self, parser, namespace, values, option_string=None) -> None:
+        Profiler.start(values[0] if values else None)
+        setattr(namespace, 'profile', True)
 
 class CommandParser:
     '''Processing command line arguments'''
 
     @staticmethod
-    def create_parser() -> ArgumentParser:
-        '''Return the full parser'''
+    def create_parser(args: List[str]) -> ArgumentParser:
+        '''Return the parser for the arguments (only the called command is imported and gets its arguments)'''
         parser = ArgumentParser(
             prog='marp',
             description='Universal handler of data written by MaidModule. Runs from the command line on any OS',
             epilog='Ggorets0dev (nikgorets4work@gmail.com)'
         )
         parser.add_argument('-v', '--version', action='store_true', help='Version of Marp')
+        parser.add_argument('-nc', '--no-color', action='store_true', help='Display values without coloring (also disabled if the output is not a terminal)')
+        parser.add_argument('--profile', nargs=0, action=ProfileAction, default=False, help='Display time, processed lines and peak memory of every stage of the command (validation, parse, compute, render)')
+        parser.add_argument('--profile-stats', nargs=1, type=str, action=ProfileAction, metavar='PATH', help='Profile the command and also save cProfile statistics to the file (implies --profile)')
+        parser.add_argument('-j', '--jobs', type=int, action=JobsAction, default=1, help='Number of processes for parsing and calculations (0: all cores, default: 1)')
 
         # SECTION - Connecting subparsers (commands) to the main parser
         subparsers = parser.add_subparsers(dest='command', description='Commands available for use: ')
-        subparsers = ShowSubParser.add_subparser(subparsers)
-        subparsers = CheckSubParser.add_subparser(subparsers)
-        subparsers = ReduceSubParser.add_subparser(subparsers)
-        subparsers = CalcSubParser.add_subparser(subparsers)
-        subparsers = TemplateSubParser.add_subparser(subparsers)
-        subparsers = SplitSubParser.add_subparser(subparsers)
-        subparsers = AliasSubParser.add_subparser(subparsers)
-        subparsers = GraphSubParser.add_subparser(subparsers)
+        subparsers = CommandRegistry.add_subparsers(subparsers, CommandRegistry.find_command(args))
         # !SECTION
 
         return parser
+
+    @staticmethod
+    def run(args: List[str]) -> bool:
+        '''Parse and run a command in the current process (False if the arguments are not correct)'''
+        # NOTE - Parser exits after displaying the error or the help of the command
+        try:
+            namespace = CommandParser.create_parser(args).parse_args(args)
+        except SystemExit:
+            return False
+
+        if namespace.no_color:
+            Color.set_enabled(False)
+        if not namespace.command:
+            logger.error(f"Command is not specified: {' '.join(args)}")
+            return False
+
+        CommandRegistry.run(namespace)
+        return True
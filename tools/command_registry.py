@@ -0,0 +1,61 @@
+'''CommandRegistry location'''
+
+from argparse import _SubParsersAction, Namespace
+from importlib import import_module
+from typing import List, Optional
+
+class CommandRegistry:
+    '''Commands of marp by name, the module of a subparser (with everything it needs) is imported only when its command is called'''
+
+    # NOTE - Name of the command: module, subparser class and the method running the command (in the order of the help)
+    COMMANDS = {
+        'show': ('tools.subparsers.show_subparser', 'ShowSubParser', 'run_show'),
+        'check': ('tools.subparsers.check_subparser', 'CheckSubParser', 'run_check'),
+        'reduce': ('tools.subparsers.reduce_subparser', 'ReduceSubParser', 'run_reduce'),
+        'calc': ('tools.subparsers.calc_subparser', 'CalcSubParser', 'run_calc'),
+        'template': ('tools.subparsers.template_subparser', 'TemplateSubParser', 'run_templates'),
+        'split': ('tools.subparsers.split_subparser', 'SplitSubParser', 'run_split'),
+        'alias': ('tools.subparsers.alias_subparser', 'AliasSubParser', 'run_alias'),
+        'graph': ('tools.subparsers.graph_subparser', 'GraphSubParser', 'run_graph'),
+        'convert': ('tools.subparsers.convert_subparser', 'ConvertSubParser', 'run_convert'),
+        'generate': ('tools.subparsers.generate_subparser', 'GenerateSubParser', 'run_generate'),
+        'benchmark': ('tools.subparsers.benchmark_subparser', 'BenchmarkSubParser', 'run_benchmark'),
+        'shell': ('tools.subparsers.shell_subparser', 'ShellSubParser', 'run_shell'),
+        'serve': ('tools.subparsers.serve_subparser', 'ServeSubParser', 'run_serve')
+    }
+
+    # NOTE - Options of marp itself followed by a value (the value may be equal to a name of a command, e.g. --profile-stats show)
+    VALUE_OPTIONS = ('--profile-stats', '-j', '--jobs')
+
+    @staticmethod
+    def find_command(args: List[str]) -> Optional[str]:
+        '''Name of the called command, the first argument that is neither an option of marp nor its value (None if it is not a command)'''
+        args_iter = iter(args)
+        for arg in args_iter:
+            if arg in CommandRegistry.VALUE_OPTIONS:
+                next(args_iter, None)
+            elif not arg.startswith('-'):
+                return arg if arg in CommandRegistry.COMMANDS else None
+        return None
+
+    @staticmethod
+    def load_subparser(command: str) -> type:
+        '''Subparser class of the command (its module is imported on the first call)'''
+        module_name, class_name, _ = CommandRegistry.COMMANDS[command]
+        return getattr(import_module(module_name), class_name)
+
+    @staticmethod
+    def add_subparsers(subparsers: _SubParsersAction, command: Optional[str]) -> _SubParsersAction:
+        '''Connecting all commands to the main parser, only the called command gets its arguments (others are only listed)'''
+        for name in CommandRegistry.COMMANDS:
+            if name == command:
+                subparsers = CommandRegistry.load_subparser(name).add_subparser(subparsers)
+            else:
+                subparsers.add_parser(name)
+        return subparsers
+
+    @staticmethod
+    def run(namespace: Namespace) -> None:
+        '''Run the command of the parsed arguments'''
+        run_name = CommandRegistry.COMMANDS[namespace.command][2]
+        getattr(CommandRegistry.load_subparser(namespace.command), run_name)(namespace)
@@ -0,0 +1,112 @@
+'''DataGenerator location'''
+
+from datetime import datetime, timedelta
+from typing import List, TextIO
+import numpy as np
+from models.ride_profile import RideProfile
+
+class DataGenerator:
+    '''Generating files with synthetic headers and readings written as by MaidModule'''
+
+    PROFILES = {
+        'city': RideProfile(cruise_speed_kmh=18, stop_probability=0.3, rides_per_day=4, ride_minutes_min=10, ride_minutes_max=40),
+        'mixed': RideProfile(cruise_speed_kmh=25, stop_probability=0.15, rides_per_day=3, ride_minutes_min=15, ride_minutes_max=90),
+        'highway': RideProfile(cruise_speed_kmh=35, stop_probability=0.05, rides_per_day=2, ride_minutes_min=30, ride_minutes_max=120)
+    }
+    CORRUPTION_KINDS = ('garbage', 'broken_reading', 'time_violation')
+
+    SPOKES_CNT = 36
+    WHEEL_CIRC = 2070
+    MAX_VOLTAGE = 60
+    SAVE_DELAY = 0.5
+    BATTERY_VOLTAGE = (48.0, 54.0)
+
+    # NOTE - Target speed is held for a random number of readings and smoothed as it changes
+    SEGMENT_SIZE = (20, 240)
+    SMOOTHING_WINDOW = 8
+
+    def __init__(self, profile: str = 'mixed', duplicate_headers: float = 0.0, corruption: float = 0.0, seed: int = None, datetime_start: datetime = datetime(2023, 1, 1)) -> None:
+        self.profile = DataGenerator.PROFILES[profile]
+        self.duplicate_headers = duplicate_headers
+        self.corruption = corruption
+        self.random = np.random.default_rng(seed)
+        self.datetime_start = datetime_start
+
+    def generate(self, file_path: str, lines_cnt: int) -> int:
+        '''Write a file with about the specified number of lines (rides are cut at the end), return the number of written lines'''
+        written_lines_cnt = 0
+        ride_datetime = self.datetime_start + timedelta(hours=7)
+        rides_cnt = 0
+
+        with open(file_path, 'w', encoding='UTF-8') as file_w:
+            while written_lines_cnt < lines_cnt:
+                ride_minutes = int(self.random.integers(self.profile.ride_minutes_min, self.profile.ride_minutes_max + 1))
+                readings_cnt = min(int(ride_minutes * 60 / DataGenerator.SAVE_DELAY), lines_cnt - written_lines_cnt - 1)
+                written_lines_cnt += self.write_ride(file_w, ride_datetime, max(readings_cnt, 0))
+                rides_cnt += 1
+
+                # NOTE - Next ride starts after a break or on the next morning
+                ride_end = ride_datetime + timedelta(seconds=readings_cnt * DataGenerator.SAVE_DELAY)
+                if rides_cnt % self.profile.rides_per_day == 0:
+                    ride_datetime = datetime.combine(ride_end.date() + timedelta(days=1), datetime.min.time()) + timedelta(hours=7, minutes=int(self.random.integers(0, 60)))
+                else:
+                    ride_datetime = ride_end + timedelta(minutes=int(self.random.integers(30, 240)))
+                ride_datetime = ride_datetime.replace(microsecond=0) + timedelta(seconds=1)
+
+        return written_lines_cnt
+
+    def write_ride(self, file_w: TextIO, ride_datetime: datetime, readings_cnt: int) -> int:
+        '''Write a header and readings of one ride, return the number of written lines'''
+        header = "{H} " + f"{ride_datetime.strftime('%d.%m.%Y-%H:%M:%S')} ( {DataGenerator.SPOKES_CNT} | {DataGenerator.WHEEL_CIRC} | {DataGenerator.MAX_VOLTAGE} | {DataGenerator.SAVE_DELAY} )"
+        millis_passed = (np.arange(1, readings_cnt + 1) * DataGenerator.SAVE_DELAY * 1000).astype(np.int64)
+        impulse_cnt = self.generate_impulses(readings_cnt)
+        analog_voltage = self.generate_analog_voltages(impulse_cnt)
+
+        lines = [header] + [f"{{R}} {millis} | {impulses} | {analog}" for millis, impulses, analog in zip(millis_passed.tolist(), impulse_cnt.tolist(), analog_voltage.tolist())]
+
+        # NOTE - Device repeats the header after a reset, readings continue the same ride
+        if readings_cnt > 1 and self.random.random() < self.duplicate_headers:
+            lines.insert(int(self.random.integers(2, readings_cnt + 1)), header)
+            lines.pop()
+
+        if self.corruption > 0:
+            self.corrupt(lines)
+
+        file_w.write('\n'.join(lines) + '\n')
+        return len(lines)
+
+    def generate_impulses(self, readings_cnt: int) -> np.ndarray:
+        '''Impulse counts of a ride with speeds changing around the cruise speed of the profile and stops'''
+        targets_kmh, segments_cnt = [], 0
+        while segments_cnt < readings_cnt:
+            segment_size = int(self.random.integers(*DataGenerator.SEGMENT_SIZE))
+            is_stop = self.random.random() < self.profile.stop_probability
+            targets_kmh.append(np.full(segment_size, 0.0 if is_stop else self.profile.cruise_speed_kmh * self.random.uniform(0.6, 1.2)))
+            segments_cnt += segment_size
+
+        targets_kmh = np.concatenate(targets_kmh)[:readings_cnt] if readings_cnt != 0 else np.empty(0)
+        speeds_kmh = np.convolve(targets_kmh, np.ones(DataGenerator.SMOOTHING_WINDOW) / DataGenerator.SMOOTHING_WINDOW, mode='same')[:readings_cnt]
+
+        # NOTE - Inverse of CountedReading.calculate_speed
+        expected_impulses = speeds_kmh / (60 * 60 / DataGenerator.SAVE_DELAY) * 1_000_000 / DataGenerator.WHEEL_CIRC * DataGenerator.SPOKES_CNT
+        return self.random.poisson(np.maximum(expected_impulses, 0))
+
+    def generate_analog_voltages(self, impulse_cnt: np.ndarray) -> np.ndarray:
+        '''Analog values of a battery that discharges with the traveled distance'''
+        voltage_start = self.random.uniform(*DataGenerator.BATTERY_VOLTAGE)
+        voltages_v = voltage_start - np.cumsum(impulse_cnt) * 1e-5 + self.random.normal(0, 0.1, len(impulse_cnt))
+        return np.clip(np.round(voltages_v * 1023 / DataGenerator.MAX_VOLTAGE), 0, 1023).astype(np.int64)
+
+    def corrupt(self, lines: List[str]) -> None:
+        '''Replace some readings with lines that do not pass the checks'''
+        corrupted_cnt = int(self.random.binomial(len(lines) - 1, self.corruption))
+
+        for line_inx in self.random.choice(np.arange(1, len(lines)), size=corrupted_cnt, replace=False).tolist():
+            kind = DataGenerator.CORRUPTION_KINDS[int(self.random.integers(len(DataGenerator.CORRUPTION_KINDS)))]
+
+            if kind == 'garbage':
+                lines[line_inx] = ''.join(chr(code) for code in self.random.integers(33, 127, size=int(self.random.integers(1, 30))).tolist())
+            elif kind == 'broken_reading':
+                lines[line_inx] = lines[line_inx].rsplit(' | ', 1)[0]
+            elif lines[line_inx].startswith('{R}'):
+                lines[line_inx] = "{R} 0 | 0 | 0"
@@ -1,9 +1,22 @@
 '''Manipulating with text and values displayed'''
 
-from colorama import Fore, Style
+import sys
+from typing import List
+from colorama import Fore, Style, deinit
+from tools.profiler import Profiler
 
 class Color:
     '''Functionality related to text coloring'''
+
+    enabled = True
+
+    @staticmethod
+    def set_enabled(enabled: bool) -> None:
+        '''Turn coloring on or off for all following output (stdout is no longer filtered by colorama if it is off)'''
+        Color.enabled = enabled
+        if not enabled:
+            deinit()
+
     @staticmethod
     def cprint(msg: str, fore="", back="", style="", end='\n') -> None:
         '''Color and print text in the terminal'''
@@ -12,8 +25,38 @@ class Color:
     @staticmethod
     def colorize(msg: str, fore="", back="", style="") -> str:
         '''Color text in the terminal'''
+        if not Color.enabled:
+            return msg
         return f"{fore}{back}{style}{msg}{Style.RESET_ALL}"
 
+class BufferedOutput:
+    '''Collecting lines and writing them to stdout with a single call per batch'''
+
+    BATCH_SIZE = 1 << 13
+
+    def __init__(self) -> None:
+        self.lines = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.flush()
+
+    def write_lines(self, lines: List[str]) -> None:
+        '''Add lines to the batch, the batch is written when it is full'''
+        self.lines.extend(lines)
+        Profiler.count_lines(len(lines))
+        if len(self.lines) >= BufferedOutput.BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        '''Write all collected lines'''
+        if len(self.lines) != 0:
+            sys.stdout.write('\n'.join(self.lines) + '\n')
+            sys.stdout.flush()
+            self.lines.clear()
+
 class ConstantValueOutput:
     '''Storing information to output a constant value'''
     def __init__(self, description: str, value: str) -> None:
@@ -0,0 +1,77 @@
+'''Downsampler location'''
+
+from typing import Tuple
+import numpy as np
+
+class Downsampler:
+    '''Reducing long series of values to the number of points that can be drawn, keeping the shape of the line'''
+
+    @staticmethod
+    def lttb(values_x: np.ndarray, values_y: np.ndarray, points_cnt: int) -> np.ndarray:
+        '''Indexes of the points chosen by largest-triangle-three-buckets (the first and the last points are always kept)'''
+        series_len = len(values_x)
+        if points_cnt >= series_len or points_cnt < 3:
+            return np.arange(series_len)
+
+        values_x, values_y = np.asarray(values_x, dtype=np.float64), np.asarray(values_y, dtype=np.float64)
+
+        # NOTE - Points between the first and the last are split into buckets, one point is chosen from each of them
+        edges = np.linspace(1, series_len - 1, points_cnt - 1).astype(np.int64)
+        buckets_cnts = np.diff(edges)
+        means_x = np.add.reduceat(values_x[1:-1], edges[:-1] - 1) / buckets_cnts
+        means_y = np.add.reduceat(values_y[1:-1], edges[:-1] - 1) / buckets_cnts
+
+        chosen_inxs = np.empty(points_cnt, dtype=np.int64)
+        chosen_inxs[0], chosen_inxs[-1] = 0, series_len - 1
+        previous_inx = 0
+
+        for bucket_inx in range(points_cnt - 2):
+            start, end = edges[bucket_inx], edges[bucket_inx + 1]
+
+            # NOTE - Third point of the triangle is the mean of the next bucket (the last point for the last bucket)
+            next_x = means_x[bucket_inx + 1] if bucket_inx + 1 < points_cnt - 2 else values_x[-1]
+            next_y = means_y[bucket_inx + 1] if bucket_inx + 1 < points_cnt - 2 else values_y[-1]
+            previous_x, previous_y = values_x[previous_inx], values_y[previous_inx]
+
+            areas = np.abs((previous_x - next_x) * (values_y[start:end] - previous_y) - (previous_x - values_x[start:end]) * (next_y - previous_y))
+            previous_inx = start + int(np.argmax(areas))
+            chosen_inxs[bucket_inx + 1] = previous_inx
+
+        return chosen_inxs
+
+    @staticmethod
+    def min_max(millis: np.ndarray, values: np.ndarray, bucket_millis: int) -> np.ndarray:
+        '''Indexes of the first, the last, the minimal and the maximal points of every run of points within one time bucket (times in milliseconds)'''
+        if len(millis) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        buckets = millis // bucket_millis
+        run_starts = np.flatnonzero(np.append(True, buckets[1:] != buckets[:-1]))
+        run_ends = np.append(run_starts[1:], len(millis))
+        runs_inxs = np.repeat(np.arange(len(run_starts)), run_ends - run_starts)
+
+        extreme_inxs = []
+        for reduction in (np.minimum, np.maximum):
+            # NOTE - First point of every run that has the extreme value of the run
+            matching_inxs = np.flatnonzero(values == reduction.reduceat(values, run_starts)[runs_inxs])
+            matching_runs = runs_inxs[matching_inxs]
+            extreme_inxs.append(matching_inxs[np.append(True, matching_runs[1:] != matching_runs[:-1])])
+
+        return np.unique(np.concatenate((run_starts, run_ends - 1, *extreme_inxs)))
+
+    @staticmethod
+    def select(breaks: np.ndarray, chosen_inxs: np.ndarray) -> np.ndarray:
+        '''Breaks of the chosen points: a chosen point has a break before it if any of the points up to it since the previous chosen one had'''
+        breaks_cnts = np.cumsum(breaks)
+        chosen_breaks = np.empty(len(chosen_inxs), dtype=bool)
+        chosen_breaks[:1] = breaks_cnts[chosen_inxs[:1]] != 0
+        chosen_breaks[1:] = breaks_cnts[chosen_inxs[1:]] != breaks_cnts[chosen_inxs[:-1]]
+        return chosen_breaks
+
+    @staticmethod
+    def downsample(millis: np.ndarray, values: np.ndarray, breaks: np.ndarray, points_cnt: int) -> Tuple[np.ndarray, np.ndarray]:
+        '''About points_cnt points of the series (times in milliseconds), NaN is inserted before the points with a break so that the line is not drawn across it'''
+        chosen_inxs = Downsampler.lttb(millis, values, points_cnt)
+        break_inxs = np.flatnonzero(Downsampler.select(breaks, chosen_inxs)[1:]) + 1
+        chosen_millis, chosen_values = millis[chosen_inxs], values[chosen_inxs].astype(np.float64)
+        return np.insert(chosen_millis, break_inxs, chosen_millis[break_inxs - 1]), np.insert(chosen_values, break_inxs, np.nan)
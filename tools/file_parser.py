@@ -1,282 +1,509 @@
 '''FileParser location'''
 
 import os
-import codecs
-from copy import copy
-from datetime import datetime, timedelta
-from typing import Dict, List
+import mmap
+from datetime import datetime
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
 import yaml
+import numpy as np
 from loguru import logger
 from tools.additional_datetime_utils import is_datetime_in_interval
-from models.reading import Reading
+from tools.parallel import Parallel
+from tools.profiler import Profiler
+from tools.line_scanner import LineScanner
+from tools.readings_renderer import ReadingsRenderer
+from tools.rides_renderer import RidesRenderer
+from tools.display_utils import BufferedOutput
 from models.header import Header
-from models.counted_reading import CountedReading
 from models.config import Config
-from models.exceptions import ReadingWithoutHeaderError, ResourceNotFoundError
+from models.file_verdict import FileVerdict
+from models.sidecar import Sidecar
+from models.header_index import HeaderIndex
+from models.readings_store import ReadingsStore
+from models.binary_format import BinaryFormat
+from models.reduction_journal import ReductionJournal
+from models.exceptions import ResourceNotFoundError, UnfinishedReductionError
 
 class FileParser:
     '''Manipulation of files that do not perform calculations'''
 
+    COPY_BLOCK_SIZE = 1 << 20
+    COMPACTION_BLOCK_SIZE = 1 << 24
+
     @staticmethod
+    @Profiler.measure('render')
     def show_headers(file_path: str, datetime_start: datetime, datetime_end: datetime, raw=False, to_enumerate=False) -> None:
         '''Display all headers (ignore duplicates by date)'''
-        if not os.path.isfile(file_path):
-            raise ResourceNotFoundError(file_path) 
+        store = ReadingsStore.load(file_path)
 
         found_any = False
         last_header = Header.create_empty()
-        with open(file_path, 'r', encoding='UTF-8') as file_r:
-            while True:
-                line = file_r.readline()
-
-                if not line:
-                    break
-
-                elif Header.is_header(line):
-                    header = Header(line)
-                    if is_datetime_in_interval(header.datetime, datetime_start, datetime_end) and header.datetime.date != last_header.datetime.date:
-                        header.display(raw=raw, to_enumerate=to_enumerate)
-                        last_header = header
-                        found_any = True
-            
-            if not found_any:
-                logger.info('No headers was found on specified datetime')
+        for header_inx in FileParser.get_index(file_path).find_headers(datetime_start, datetime_end):
+            header = store.get_header(header_inx)
+            if is_datetime_in_interval(header.datetime, datetime_start, datetime_end) and header.datetime.date != last_header.datetime.date:
+                header.display(raw=raw, to_enumerate=to_enumerate)
+                last_header = header
+                found_any = True
+
+        if not found_any:
+            logger.info('No headers was found on specified datetime')
     
     @staticmethod
+    @Profiler.measure('render')
     def show_readings(file_path: str, datetime_start: datetime, datetime_end: datetime, config: Config, calculated=False, raw=False, to_enumerate=False) -> None:
-        '''Display all readings (raw or calculated)'''
-        if not os.path.isfile(file_path):
-            raise ResourceNotFoundError(file_path)
-        
-        found_any = False
-        last_header = None
-        with open(file_path, 'r', encoding='UTF-8') as file_r: 
-            while True:
-                line = file_r.readline()
-
-                if not line:
-                    break
-                
-                elif Header.is_header(line):
-                    last_header = Header(line)
-
-                elif Reading.is_reading(line) and last_header:
-                    found_any = True
-                    reading = Reading(line)
-                    reading_datetime = last_header.datetime + timedelta(milliseconds=reading.millis_passed)
-                    
-                    if reading_datetime > datetime_end:
-                        break
-
-                    elif reading_datetime < datetime_start:
-                        continue
+        '''Display all readings (raw or calculated), lines are formatted by sections and written in batches'''
+        store = ReadingsStore.load(file_path)
+        sections = FileParser.get_index(file_path).find_sections(datetime_start, datetime_end)
 
-                    if calculated:
-                        reading = CountedReading(reading, last_header.spokes_cnt, last_header.wheel_circ, last_header.max_voltage, last_header.save_delay)
-                        reading.time = reading_datetime.time()
-                        reading.display(normal_speed_interval=config.normal_speed_interval, normal_voltage_interval=config.normal_voltage_interval, raw=raw, to_enumerate=to_enumerate, decimal_places=3)
-                    else:
-                        reading.display(raw=raw, to_enumerate=to_enumerate)
+        with BufferedOutput() as output:
+            for header_inx, millis_passed, impulse_cnt, analog_voltage in store.iter_sections(datetime_start, datetime_end, sections):
+                if calculated:
+                    output.write_lines(ReadingsRenderer.format_counted_readings(store, header_inx, millis_passed, impulse_cnt, analog_voltage, config.normal_speed_interval, config.normal_voltage_interval, raw=raw, to_enumerate=to_enumerate, decimal_places=3))
+                else:
+                    output.write_lines(ReadingsRenderer.format_readings(millis_passed, impulse_cnt, analog_voltage, raw=raw, to_enumerate=to_enumerate))
+
+        # NOTE - Readings outside the interval also count as found, as long as the sections have any
+        if not any(start != end for start, end in map(store.section_bounds, sections)):
+            logger.info('No readings was found on specified datetime')
+
+    @staticmethod
+    @Profiler.measure('render')
+    def show_rides(file_path: str, datetime_start: datetime, datetime_end: datetime, config: Config, raw=False, to_enumerate=False) -> None:
+        '''Display values of the rides starting within the interval (found once and taken from the sidecar cache)'''
+        rides = ReadingsStore.load_rides(file_path, config.ride_detection['minimal_stop_duration'], config.ride_detection['minimal_ride_duration'])
+        rides_inxs = rides.select(datetime_start, datetime_end)
 
-            if not found_any:
-                logger.info('No readings was found on specified datetime')
+        with BufferedOutput() as output:
+            output.write_lines(RidesRenderer.format_rides(rides, rides_inxs, raw=raw, to_enumerate=to_enumerate))
+
+        if len(rides_inxs) == 0:
+            logger.info('No rides was found on specified datetime')
+
+    @staticmethod
+    def preload(file_path: str) -> int:
+        '''Load everything the commands take from the file (index, columns and day totals) into memory, return the number of lines'''
+        FileParser.get_index(file_path)
+        ReadingsStore.load(file_path)
+        ReadingsStore.load_rollups(file_path)
+        return FileParser.count_lines(file_path)
 
     @staticmethod
     def count_lines(file_path: str) -> int:
         '''Count lines in file'''
-        if os.path.isfile(file_path):
-            with open(file_path, 'r', encoding='UTF-8') as file_r:
-                return sum(1 for _ in file_r)
-        else:
+        return FileParser.get_verdict(file_path).lines_cnt
+
+    @staticmethod
+    @Profiler.measure('validation')
+    def get_verdict(file_path: str) -> FileVerdict:
+        '''Validation result of the file, taken from the sidecar cache if the file has not changed'''
+        if not os.path.isfile(file_path):
             raise ResourceNotFoundError(file_path)
 
+        # NOTE - Binary files are written only from validated files, every header and reading counts as a line
+        if BinaryFormat.is_binary(file_path):
+            store = ReadingsStore.load(file_path)
+            return FileVerdict(lines_cnt=store.headers_cnt + store.readings_cnt)
+
+        sidecar = Sidecar(file_path)
+        fingerprint = sidecar.fingerprint()
+        cached_verdict = sidecar.load('verdict', fingerprint)
+
+        if cached_verdict is not None:
+            return FileVerdict(**cached_verdict)
+
+        return FileParser.validate_and_save(sidecar, fingerprint)[0]
+
     @staticmethod
-    def validate_readings_by_time(file_path: str, log_success=True) -> bool:
-        '''Check whether each next date/time is later than the previous ones'''
-        bad_lines_inxs = []
-        line_inx = 0
-        new_section = False
-        last_header = last_reading = None
+    def get_verdicts(file_paths: List[str]) -> List[FileVerdict]:
+        '''Validation results of several files, files are checked at once by separate processes'''
+        return Parallel.map(FileParser.get_verdict, [(file_path,) for file_path in file_paths])
 
+    @staticmethod
+    @Profiler.measure('validation')
+    def get_index(file_path: str) -> HeaderIndex:
+        '''Index of headers of the file, taken from the sidecar cache if the file has not changed'''
         if not os.path.isfile(file_path):
-            raise ResourceNotFoundError(file_path) 
-
-        with open(file_path, 'r', encoding='UTF-8') as file_r:
-            while True:
-                line = file_r.readline()
-                line_inx += 1
-
-                if not line:                    
-                    if len(bad_lines_inxs) == 0:
-                        if log_success:
-                            logger.success(f"File {file_path} passed the time sequence check")
-                        return True
-
-                    elif len(bad_lines_inxs) != 0:
-                        logger.error(f"File {file_path} did not pass the validation, found inconsistencies with the time sequence in line(s) number: {', '.join(bad_lines_inxs)}")
-                        return False
-                
-                else:                    
-                    if Header.is_header(line):
-                        if (last_header is not None) and (last_header.datetime > Header(line).datetime):
-                            bad_lines_inxs.append(str(line_inx))
-                        last_header = Header(line)
-                        new_section = True
-
-                    elif Reading.is_reading(line):
-                        if (last_reading is not None) and (last_reading.millis_passed > Reading(line).millis_passed) and not new_section:
-                            bad_lines_inxs.append(str(line_inx))
-                        last_reading = Reading(line)
-                        new_section = False
+            raise ResourceNotFoundError(file_path)
+
+        if BinaryFormat.is_binary(file_path):
+            return ReadingsStore.load(file_path).build_index()
+
+        sidecar = Sidecar(file_path)
+        fingerprint = sidecar.fingerprint()
+        cached_index = sidecar.load_arrays('index', fingerprint)
+
+        if cached_index is not None:
+            return HeaderIndex(cached_index)
+
+        return FileParser.validate_and_save(sidecar, fingerprint)[1]
 
     @staticmethod
-    def validate_readings_by_pattern(file_path: str, log_success=True) -> bool:
-        '''Check if all lines of the file correspond to the Header or Reading patterns'''
-        bad_lines_inxs = []
-        line_inx = 0
-        last_header = None
+    def validate_and_save(sidecar: Sidecar, fingerprint: dict) -> Tuple[FileVerdict, HeaderIndex]:
+        '''Validate the file (only the appended part if the file has grown) and save the verdict and the index of headers in its sidecar'''
+        verdict, index = FileParser.validate_file(sidecar.file_path, FileParser.load_previous(sidecar, fingerprint))
+        sidecar.save_arrays('index', fingerprint, index.columns)
+        sidecar.save('verdict', fingerprint, verdict.to_dict())
+        return verdict, index
+
+    @staticmethod
+    def load_previous(sidecar: Sidecar, fingerprint: dict) -> Optional[Tuple[FileVerdict, HeaderIndex]]:
+        '''Verdict and index saved before new lines were appended to the file (None if the file was changed in another way)'''
+        previous_fingerprint = sidecar.load_fingerprint('verdict')
+        if previous_fingerprint is None or not sidecar.is_appended(fingerprint, previous_fingerprint):
+            return None
 
+        cached_verdict = sidecar.load('verdict', previous_fingerprint)
+        cached_index = sidecar.load_arrays('index', previous_fingerprint)
+        if cached_verdict is None or cached_index is None:
+            return None
+
+        # NOTE - Numbers of failed lines that were not kept cannot be restored, so the whole file is checked again
+        previous_verdict = FileVerdict(**cached_verdict)
+        return (previous_verdict, HeaderIndex(cached_index)) if not previous_verdict.is_truncated else None
+
+    @staticmethod
+    def validate_file(file_path: str, previous: Optional[Tuple[FileVerdict, HeaderIndex]] = None) -> Tuple[FileVerdict, HeaderIndex]:
+        '''Count lines, check encoding, patterns and time sequence in a single pass (the index of headers is built along the way)
+
+        If the result for the beginning of the file is passed, only lines starting from its last header are checked
+        '''
         if not os.path.isfile(file_path):
             raise ResourceNotFoundError(file_path)
-        
-        with open(file_path, 'r', encoding='UTF-8') as file_r:
-            while True:
-                line = file_r.readline()
-                line_inx += 1
-                
-                if not line and len(bad_lines_inxs) == 0:
-                    if log_success:
-                        logger.success(f"File {file_path} passed the pattern check")
-                    return True
-
-                elif not line and len(bad_lines_inxs) != 0:
-                    logger.error(f"File {file_path} did not pass the validation, found inconsistencies with the template in line(s) number: {', '.join(bad_lines_inxs)}")
-                    return False
-
-                elif line  == '\n' or line  == '':
+
+        verdict = FileVerdict()
+        index = { column: [] for column in HeaderIndex.DTYPES }
+        start_offset = 0
+
+        # NOTE - Appended lines may continue the last section, so it is checked again together with them
+        if previous is not None and previous[0].is_utf8 and previous[1].headers_cnt != 0:
+            previous_verdict, previous_index = previous
+            start_offset = int(previous_index.columns['offset'][-1])
+            first_line_inx = int(previous_index.columns['line_inx'][-1])
+
+            verdict.lines_cnt = first_line_inx - 1
+            verdict.pattern_bad_lines = [line_inx for line_inx in previous_verdict.pattern_bad_lines if line_inx < first_line_inx]
+            verdict.time_bad_lines = [line_inx for line_inx in previous_verdict.time_bad_lines if line_inx < first_line_inx]
+            verdict.pattern_bad_lines_cnt, verdict.time_bad_lines_cnt = len(verdict.pattern_bad_lines), len(verdict.time_bad_lines)
+            index = { column: previous_index.columns[column][:-1].tolist() for column in HeaderIndex.DTYPES }
+
+        # NOTE - Every part except the first one starts with a correct header, so parts are checked independently and merged as they are ready
+        for part_verdict, part_index in Parallel.imap(FileParser.validate_range, [(file_path, start, end) for start, end in Parallel.split_by_headers(file_path, start_offset)]):
+            if len(index['datetime']) != 0 and len(part_index['datetime']) != 0 and index['datetime'][-1] > part_index['datetime'][0]:
+                verdict.add_time_bad_line(verdict.lines_cnt + 1)
+
+            index['line_inx'].extend(verdict.lines_cnt + line_inx for line_inx in part_index['line_inx'])
+            for column in ('datetime', 'offset', 'last_millis'):
+                index[column].extend(part_index[column])
+
+            verdict.merge(part_verdict)
+            Profiler.count_lines(part_verdict.lines_cnt)
+
+        return verdict, HeaderIndex.from_lists(index)
+
+    @staticmethod
+    def validate_range(file_path: str, start_offset: int, end_offset: int) -> Tuple[FileVerdict, Dict[str, List]]:
+        '''Check lines of the byte range (line numbers are counted from the start of the range)'''
+        verdict = FileVerdict()
+        index = { column: [] for column in HeaderIndex.DTYPES }
+        new_section = False
+        last_header = last_millis_passed = None
+
+        with LineScanner(file_path) as scanner:
+            verdict.is_utf8 = scanner.is_utf8(start_offset, end_offset)
+
+            for line_inx, (line_offset, _, line) in enumerate(scanner.iter_lines(start_offset, end_offset), start=1):
+                verdict.lines_cnt = line_inx
+                if len(line) == 0:
                     continue
 
-                elif Header.is_header(line):
-                    last_header = Header(line)
+                record = LineScanner.parse_line(line)
+                if isinstance(record, tuple):
+                    if last_header is None:
+                        verdict.add_pattern_bad_line(line_inx)
+                    else:
+                        index['last_millis'][-1] = record[0]
+                    if last_millis_passed is not None and last_millis_passed > record[0] and not new_section:
+                        verdict.add_time_bad_line(line_inx)
+                    last_millis_passed = record[0]
+                    new_section = False
+
+                elif record is not None:
+                    if last_header is not None and last_header.datetime > record.datetime:
+                        verdict.add_time_bad_line(line_inx)
+                    last_header = record
+                    new_section = True
 
-                elif (not(Header.is_header(line)) and not(Reading.is_reading(line))) or (Reading.is_reading(line) and not last_header):
-                    bad_lines_inxs.append(str(line_inx))
+                    index['datetime'].append(record.datetime)
+                    index['offset'].append(line_offset)
+                    index['line_inx'].append(line_inx)
+                    index['last_millis'].append(0)
+
+                else:
+                    verdict.add_pattern_bad_line(line_inx)
+
+        return verdict, index
 
     @staticmethod
-    def reduce_readings(file_path: str) -> str:
-        '''Optimizing the file with readings, deleting unnecessary lines'''
-        REDUCED_FILE_NAME = os.path.splitext(file_path)[0] + "_reduced.txt"
-        last_header = None
+    def validate_readings_by_time(file_path: str, log_success=True) -> bool:
+        '''Check whether each next date/time is later than the previous ones'''
+        verdict = FileParser.get_verdict(file_path)
+
+        if verdict.passed_time:
+            if log_success:
+                logger.success(f"File {file_path} passed the time sequence check")
+            return True
 
+        logger.error(f"File {file_path} did not pass the validation, found inconsistencies with the time sequence in line(s) number: {FileVerdict.format_lines(verdict.time_bad_lines, verdict.time_bad_lines_cnt)}")
+        return False
+
+    @staticmethod
+    def validate_readings_by_pattern(file_path: str, log_success=True) -> bool:
+        '''Check if all lines of the file correspond to the Header or Reading patterns'''
+        verdict = FileParser.get_verdict(file_path)
+
+        if verdict.passed_pattern:
+            if log_success:
+                logger.success(f"File {file_path} passed the pattern check")
+            return True
+
+        logger.error(f"File {file_path} did not pass the validation, found inconsistencies with the template in line(s) number: {FileVerdict.format_lines(verdict.pattern_bad_lines, verdict.pattern_bad_lines_cnt)}")
+        return False
+
+    @staticmethod
+    @Profiler.measure('render')
+    def reduce_readings(file_path: str, in_place=False) -> str:
+        '''Optimizing the file with readings, deleting unnecessary lines (repeated headers, empty and unknown lines), the file itself is rewritten if in place'''
         if not os.path.isfile(file_path):
             raise ResourceNotFoundError(file_path)
 
-        if len(os.path.dirname(file_path)) == 0:
-            result_path = REDUCED_FILE_NAME
-        else:
-            result_path = os.path.join(os.path.dirname(file_path), REDUCED_FILE_NAME)
+        # NOTE - File reduced in place by an interrupted command is finished first, it is damaged until then
+        if ReductionJournal(file_path).exists():
+            if not in_place:
+                raise UnfinishedReductionError(file_path)
+
+            logger.warning(f"Reduction of the file {file_path} was interrupted, it is finished instead of a new one")
+            FileParser.finish_compaction(file_path)
+            return file_path
 
-        with open(file_path, 'r', encoding='UTF-8') as file_r, open(result_path, 'w', encoding='UTF-8') as file_w:
-            while True:
-                line = file_r.readline()
+        is_binary = BinaryFormat.is_binary(file_path)
+        preamble, kept_ranges = FileParser.find_binary_reduction(file_path) if is_binary else FileParser.find_text_reduction(file_path)
 
-                if not line:
-                    break
+        if in_place:
+            FileParser.compact_file(file_path, preamble, kept_ranges)
+            return file_path
 
-                elif Header.is_header(line):
-                    if not last_header or (last_header and last_header.datetime != Header(line).datetime):
-                        file_w.write(line)
-                    last_header = Header(line)
-                
-                elif Reading.is_reading(line):
-                    file_w.write(line)
+        REDUCED_FILE_NAME = os.path.splitext(os.path.basename(file_path))[0] + "_reduced" + (BinaryFormat.EXTENSION if is_binary else ".txt")
+        result_path = os.path.join(os.path.dirname(file_path), REDUCED_FILE_NAME)
+
+        with open(file_path, 'rb') as file_r, open(result_path, 'wb') as file_w:
+            file_w.write(preamble)
+            FileParser.copy_ranges(file_r, file_w, kept_ranges)
 
         return result_path
 
     @staticmethod
-    def parse_readings(file_path: str) -> Dict[Header, List[Reading]]:
-        '''Reading values from a file and transferring them to a list'''
-        headers_readings = {}
-        readings = []
-        line_inx = 0
-        last_header = None
+    def find_text_reduction(file_path: str) -> Tuple[bytes, List[Tuple[int, int]]]:
+        '''Byte ranges of the text file kept by the reduction: from the first header without repeated headers and lines that are neither headers nor readings
 
-        if not os.path.isfile(file_path):
-            raise ResourceNotFoundError(file_path)
+        Only lines with the header tag are parsed, the rest of the lines are classified by their bytes
+        '''
+        removed_ranges, first_offset = [], None
+        last_header_datetime = None
 
-        with open(file_path, 'r', encoding='UTF-8') as file_r:
-            while True:
-                line = file_r.readline()
-                line_inx += 1
+        with LineScanner(file_path) as scanner:
+            for offset, size, record in scanner.iter_headers():
+                if isinstance(record, tuple):
+                    continue
 
-                if not line:
-                    if len(readings) != 0:
-                        headers_readings[last_header] = readings
-                    break
+                if record is None or (first_offset is not None and record.datetime == last_header_datetime):
+                    removed_ranges.append((offset, offset + size))
+                elif first_offset is None:
+                    first_offset = offset
 
-                elif Reading.is_reading(line):
-                    if last_header is not None:
-                        readings.append(Reading(line))
-                    else:
-                        raise ReadingWithoutHeaderError(line_inx)
+                if isinstance(record, Header):
+                    last_header_datetime = record.datetime
 
-                elif Header.is_header(line):
-                    if (last_header is not None):
-                        headers_readings[last_header] = readings.copy()
-                        readings.clear()
-                    last_header = Header(line)
-        
-        return headers_readings
+            if first_offset is None:
+                return b'', []
+
+            removed_ranges.extend((offset, offset + size) for offset, size in scanner.iter_unknown_lines(first_offset))
+            return b'', FileParser.find_kept_ranges(sorted(removed_ranges), first_offset, scanner.size)
+
+    @staticmethod
+    def find_binary_reduction(file_path: str) -> Tuple[bytes, List[Tuple[int, int]]]:
+        '''Preamble and byte ranges of the binary file kept by the reduction (all records except repeated headers, readings stay with the previous header)'''
+        headers_table, readings_table = BinaryFormat.read_tables(file_path)
+        headers_datetimes = np.asarray(headers_table['datetime'])
+        repeated_inxs = np.flatnonzero(headers_datetimes[1:] == headers_datetimes[:-1]) + 1
+
+        header_size, headers_offset = BinaryFormat.HEADER_DTYPE.itemsize, BinaryFormat.PREAMBLE_DTYPE.itemsize
+        removed_ranges = [(headers_offset + header_inx * header_size, headers_offset + (header_inx + 1) * header_size) for header_inx in repeated_inxs.tolist()]
+
+        preamble = BinaryFormat.pack_preamble(len(headers_table) - len(repeated_inxs), len(readings_table))
+        return preamble, FileParser.find_kept_ranges(removed_ranges, headers_offset, os.path.getsize(file_path))
+
+    @staticmethod
+    def find_kept_ranges(removed_ranges: List[Tuple[int, int]], start_offset: int, end_offset: int) -> List[Tuple[int, int]]:
+        '''Byte ranges between the removed ones (sorted) within the bounds, neighbouring kept bytes are joined into one range'''
+        kept_ranges, offset = [], start_offset
+
+        for removed_start, removed_end in removed_ranges:
+            if removed_start > offset:
+                kept_ranges.append((offset, removed_start))
+            offset = max(offset, removed_end)
+
+        if offset < end_offset:
+            kept_ranges.append((offset, end_offset))
+        return kept_ranges
+
+    @staticmethod
+    def copy_ranges(file_r: BinaryIO, file_w: BinaryIO, ranges: List[Tuple[int, int]]) -> None:
+        '''Append byte ranges of one file to another, copied by the kernel where it is possible (without passing them through the process)'''
+        file_w.flush()
+        source_fd, target_fd = file_r.fileno(), file_w.fileno()
+        by_kernel = hasattr(os, 'copy_file_range')
+
+        for start, end in ranges:
+            offset = start
+            while offset < end:
+                # NOTE - Copying between some file systems is not supported, then ranges are copied by blocks
+                if by_kernel:
+                    try:
+                        copied_size = os.copy_file_range(source_fd, target_fd, end - offset, offset)
+                    except OSError:
+                        copied_size = 0
+
+                    if copied_size != 0:
+                        offset += copied_size
+                        continue
+                    by_kernel = False
+
+                block = memoryview(os.pread(source_fd, min(FileParser.COPY_BLOCK_SIZE, end - offset), offset))
+                offset += len(block)
+                while len(block) != 0:
+                    block = block[os.write(target_fd, block):]
 
     @staticmethod
+    def compact_file(file_path: str, preamble: bytes, kept_ranges: List[Tuple[int, int]]) -> None:
+        '''Move the kept byte ranges to the beginning of the file one after another and cut off the rest, no copy of the file is written'''
+        if len(preamble) + sum(end - start for start, end in kept_ranges) == os.path.getsize(file_path):
+            return
+
+        ReductionJournal(file_path).save_plan(preamble, kept_ranges)
+        FileParser.finish_compaction(file_path)
+
+    @staticmethod
+    def finish_compaction(file_path: str) -> None:
+        '''Move the ranges of the journal plan by blocks starting after the last step of the journal, then cut the file and remove the journal
+
+        Every block is written to the journal before it is moved and is on the disk before the next one, so after a crash only the last step is repeated
+        '''
+        journal = ReductionJournal(file_path)
+        preamble, kept_ranges = journal.load_plan()
+        result_size = len(preamble) + sum(end - start for start, end in kept_ranges)
+        step = journal.load_step()
+
+        with open(file_path, 'r+b') as file_rw:
+            # NOTE - Last step with nothing to move is written when all blocks are in place (the file may be cut already)
+            if step is None or step[2] != 0:
+                with mmap.mmap(file_rw.fileno(), 0) as file_map:
+                    file_map[:len(preamble)] = preamble
+                    done_offset = len(preamble)
+
+                    if step is not None:
+                        source_offset, target_offset, size, data = step
+                        if data is not None:
+                            file_map[target_offset:target_offset + size] = data
+                        else:
+                            file_map.move(target_offset, source_offset, size)
+                        done_offset = target_offset + size
+
+                    for source_offset, target_offset, size in FileParser.iter_compaction_blocks(kept_ranges, len(preamble), done_offset):
+                        # NOTE - Bytes of a block that overlaps its target are kept in the journal, otherwise they stay in place until the next block
+                        journal.save_step(source_offset, target_offset, size, file_map[source_offset:source_offset + size] if size > source_offset - target_offset else None)
+                        file_map.move(target_offset, source_offset, size)
+                        file_map.flush()
+
+                journal.save_step(result_size, result_size, 0)
+
+            file_rw.truncate(result_size)
+            os.fsync(file_rw.fileno())
+
+        journal.remove()
+
+    @staticmethod
+    def iter_compaction_blocks(kept_ranges: List[Tuple[int, int]], target_offset: int, done_offset: int) -> Iterator[Tuple[int, int, int]]:
+        '''Source offset, target offset and size of the blocks of the ranges that are not in place yet (targets from the done offset)'''
+        for start, end in kept_ranges:
+            skipped_size = min(max(done_offset - target_offset, 0), end - start)
+
+            if start != target_offset:
+                for block_offset in range(start + skipped_size, end, FileParser.COMPACTION_BLOCK_SIZE):
+                    block_size = min(FileParser.COMPACTION_BLOCK_SIZE, end - block_offset)
+                    yield block_offset, target_offset + block_offset - start, block_size
+            target_offset += end - start
+
+    @staticmethod
+    @Profiler.measure('render')
     def split_file(file_path: str, part_size: int) -> int:
         '''Divide file to parts'''
+        is_binary = BinaryFormat.is_binary(file_path)
         new_file_path = os.path.splitext(file_path)[0] + "_part_"
-        line_inx, part_inx = 0, 1
+        extension = BinaryFormat.EXTENSION if is_binary else '.txt'
+        line_inx = 0
 
-        if not os.path.isfile(file_path):
-            raise ResourceNotFoundError(file_path)
+        store = ReadingsStore.load(file_path)
+
+        parts = [[]]
+        last_header = None
 
-        file_w = open(new_file_path + str(part_inx) + '.txt', 'w', encoding='UTF-8')
-        last_header = current_header = None
-
-        with open(file_path, 'r', encoding='UTF-8') as file_r:
-            while True:
-                line = file_r.readline()
-
-                if not line:
-                    break
-
-                if Header.is_header(line):
-                    current_header = Header(line)
-
-                    if line_inx >= part_size and (not last_header or (last_header and Header(line).datetime.date() != last_header.datetime.date())):
-                        line_inx = 1
-                        part_inx += 1
-                        file_w.close()
-                        file_w = open(f"{new_file_path}{part_inx}.txt", 'w', encoding='UTF-8')
-                    
-                    file_w.write(line)
-                    line_inx += 1
-                    last_header = copy(current_header)
-
-                elif Reading.is_reading(line):
-                    file_w.write(line)
-                    line_inx += 1
-            
-            file_w.close()
+        for header_inx in range(store.headers_cnt):
+            current_header = store.get_header(header_inx)
+
+            if line_inx >= part_size and (not last_header or (last_header and current_header.datetime.date() != last_header.datetime.date())):
+                line_inx = 1
+                parts.append([])
+
+            start, end = store.section_bounds(header_inx)
+            parts[-1].append(header_inx)
+            line_inx += 1 + (end - start)
+            last_header = current_header
+
+        with LineScanner(file_path) as scanner:
+            for part_inx, header_inxs in enumerate(parts, start=1):
+                if is_binary:
+                    store.to_binary(f"{new_file_path}{part_inx}{extension}", header_inxs)
+                    continue
+
+                with open(f"{new_file_path}{part_inx}{extension}", 'wb') as file_w:
+                    for header_inx in header_inxs:
+                        FileParser.copy_section(store, header_inx, scanner, file_w)
         
-        return part_inx
+        return len(parts)
+
+    @staticmethod
+    def copy_section(store: ReadingsStore, header_inx: int, scanner: LineScanner, file_w: BinaryIO, with_header=True) -> None:
+        '''Copy header and readings of the section as they are written in the file (without empty lines)'''
+        offset, body_offset, end_offset = (int(store.headers[column][header_inx]) for column in ('offset', 'body_offset', 'end_offset'))
+
+        if with_header:
+            file_w.write(scanner.map[offset:body_offset])
+
+        if store.headers['blank_lines_cnt'][header_inx] == 0:
+            for block_offset in range(body_offset, end_offset, FileParser.COPY_BLOCK_SIZE):
+                file_w.write(scanner.map[block_offset:min(block_offset + FileParser.COPY_BLOCK_SIZE, end_offset)])
+        else:
+            for line_offset, size, line in scanner.iter_lines(body_offset, end_offset):
+                if len(line) != 0:
+                    file_w.write(scanner.map[line_offset:line_offset + size])
 
     @staticmethod
     def is_utf8(file_path: str) -> bool:
         '''Check if file is in UTF-8'''
         try:
-            with codecs.open(file_path, encoding='UTF-8', errors='strict') as file_r:
-                for _ in file_r:
-                    pass
-            return True
-        except (IOError, UnicodeDecodeError):
+            with LineScanner(file_path) as scanner:
+                return scanner.is_utf8()
+        except IOError:
             return False
 
     @staticmethod
@@ -0,0 +1,155 @@
+'''LineScanner location'''
+
+import os
+import re
+import mmap
+import codecs
+from itertools import accumulate
+from functools import lru_cache
+from typing import Iterator, Optional, Tuple, Union
+from models.header import Header
+from models.reading import Reading
+
+class LineScanner:
+    '''Reading lines of a file as bytes through a memory map (no decoding and no str per line)'''
+
+    HEADER_TAG = b'{H}'
+    LINE_END = b'\n'
+    BLOCK_SIZE = 1 << 20
+    HEADER_PARTS_CNT = len(Header.PATTERN.split(' '))
+    READING_PARTS_CNT = len(Reading.PATTERN.split(' '))
+
+    # NOTE - Line after a line break that has no header tag and no digits in the places of the values of Reading (same check as parse_line)
+    UNKNOWN_LINE = re.compile(LINE_END + rb'(?!' + re.escape(HEADER_TAG) + rb')(?!' + b' '.join([rb'[^ \n]*', rb'[0-9]+'] * (READING_PARTS_CNT // 2)) + rb'\r*(?:\n|\Z))[^\n]*')
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self.size = 0
+        self.map = b''
+        self.file_r = None
+
+    def __enter__(self):
+        self.file_r = open(self.file_path, 'rb')
+        self.size = os.fstat(self.file_r.fileno()).st_size
+
+        # NOTE - Empty file can not be mapped
+        if self.size != 0:
+            self.map = mmap.mmap(self.file_r.fileno(), 0, access=mmap.ACCESS_READ)
+        return self
+
+    def __exit__(self, *args) -> None:
+        if isinstance(self.map, mmap.mmap):
+            self.map.close()
+        self.file_r.close()
+
+    def iter_lines(self, start_offset: int = 0, end_offset: Optional[int] = None) -> Iterator[Tuple[int, int, bytes]]:
+        '''Offset, size with the line ending and content without it for every line of the byte range'''
+        end_offset = self.size if end_offset is None else end_offset
+        offset = start_offset
+
+        # NOTE - Lines are split by blocks ending at a line break, so that the work per line is done in C
+        while offset < end_offset:
+            block_end = self.find_block_end(offset, end_offset)
+            block = self.map[offset:block_end]
+            lines = block.split(LineScanner.LINE_END)
+            lines.pop()
+
+            sizes = [len(line) + 1 for line in lines]
+            if not block.endswith(LineScanner.LINE_END):
+                lines.append(block[block.rfind(LineScanner.LINE_END) + 1:])
+                sizes.append(len(lines[-1]))
+
+            if b'\r' in block:
+                lines = [line.rstrip(b'\r') for line in lines]
+
+            yield from zip(accumulate(sizes, initial=offset), sizes, lines)
+            offset = block_end
+
+    def find_block_end(self, offset: int, end_offset: int) -> int:
+        '''End of the block of whole lines starting at the offset'''
+        block_end = offset + LineScanner.BLOCK_SIZE
+        if block_end >= end_offset:
+            return end_offset
+
+        line_end = self.map.rfind(LineScanner.LINE_END, offset, block_end)
+        if line_end == -1:
+            line_end = self.map.find(LineScanner.LINE_END, block_end, end_offset)
+        return line_end + 1 if line_end != -1 else end_offset
+
+    def find_header(self, offset: int, end_offset: Optional[int] = None) -> int:
+        '''Offset of the first header line starting at or after the offset (-1 if there are none)'''
+        end_offset = self.size if end_offset is None else end_offset
+
+        if offset == 0 and self.map[:len(LineScanner.HEADER_TAG)] == LineScanner.HEADER_TAG:
+            return 0
+
+        tag_offset = self.map.find(LineScanner.LINE_END + LineScanner.HEADER_TAG, max(offset - 1, 0), end_offset)
+        return tag_offset + 1 if tag_offset != -1 else -1
+
+    def find_valid_header(self, offset: int, end_offset: Optional[int] = None) -> int:
+        '''Offset of the first line starting at or after the offset that is a correct header (-1 if there are none)'''
+        header_offset = self.find_header(offset, end_offset)
+
+        while header_offset != -1 and not isinstance(LineScanner.parse_line(self.get_line(header_offset)), Header):
+            header_offset = self.find_header(header_offset + 1, end_offset)
+        return header_offset
+
+    def iter_headers(self, start_offset: int = 0) -> Iterator[Tuple[int, int, Union[Header, Tuple[int, int, int], None]]]:
+        '''Offset, size with the line ending and parsed record (see parse_line) of every line with the header tag (other lines are not looked at)'''
+        header_offset = self.find_header(start_offset)
+
+        while header_offset != -1:
+            yield header_offset, self.find_line_end(header_offset) - header_offset, LineScanner.parse_line(self.get_line(header_offset))
+            header_offset = self.find_header(header_offset + 1)
+
+    def iter_unknown_lines(self, start_offset: int = 0) -> Iterator[Tuple[int, int]]:
+        '''Offset and size with the line ending of every line after the offset that is neither a reading nor a line with the header tag (empty lines too)'''
+        for match in LineScanner.UNKNOWN_LINE.finditer(self.map, max(start_offset - 1, 0)):
+            if match.start() + 1 < self.size:
+                yield match.start() + 1, min(match.end() + 1, self.size) - match.start() - 1
+
+    def find_line_end(self, offset: int) -> int:
+        '''Offset right after the line starting at the offset (with its line ending)'''
+        line_end = self.map.find(LineScanner.LINE_END, offset)
+        return line_end + 1 if line_end != -1 else self.size
+
+    def get_line(self, offset: int) -> bytes:
+        '''Content of the line starting at the offset (without the line ending)'''
+        line_end = self.map.find(LineScanner.LINE_END, offset)
+        return self.map[offset:line_end if line_end != -1 else self.size].rstrip(b'\r')
+
+    def is_utf8(self, start_offset: int = 0, end_offset: Optional[int] = None) -> bool:
+        '''Check if the byte range is in UTF-8 (decoded by blocks)'''
+        end_offset = self.size if end_offset is None else end_offset
+        decoder = codecs.getincrementaldecoder('UTF-8')(errors='strict')
+
+        try:
+            for block_offset in range(start_offset, end_offset, LineScanner.BLOCK_SIZE):
+                decoder.decode(self.map[block_offset:min(block_offset + LineScanner.BLOCK_SIZE, end_offset)])
+            decoder.decode(b'', final=True)
+            return True
+        except UnicodeDecodeError:
+            return False
+
+    @staticmethod
+    def parse_line(line: bytes) -> Union[Header, Tuple[int, int, int], None]:
+        '''Classify and parse the line in one step: Header, values of Reading (millis passed, impulse count, analog voltage) or None'''
+        line_parts = line.split(b' ')
+
+        if len(line_parts) == LineScanner.READING_PARTS_CNT:
+            if line_parts[1].isdigit() and line_parts[3].isdigit() and line_parts[5].isdigit():
+                return int(line_parts[1]), int(line_parts[3]), int(line_parts[5])
+            return None
+
+        if len(line_parts) == LineScanner.HEADER_PARTS_CNT:
+            return LineScanner.parse_header(line)
+        return None
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def parse_header(line: bytes) -> Optional[Header]:
+        '''Header of the line (None if the line is not Header), identical headers are parsed once since devices repeat them'''
+        try:
+            return Header.parse(line.decode('UTF-8'))
+        except UnicodeDecodeError:
+            return None
@@ -0,0 +1,78 @@
+'''Parallel location'''
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, List, Tuple
+from tools.line_scanner import LineScanner
+
+class Parallel:
+    '''Processing independent parts of a file (header sections) or independent files in several processes
+
+    Every process works alone (with a single job), so that files processed by separate processes are not divided again
+    '''
+
+    jobs = 1
+    MINIMAL_PART_SIZE = 4 << 20
+    MAXIMAL_PART_SIZE = 16 << 20
+
+    @staticmethod
+    def set_jobs(jobs: int) -> None:
+        '''Number of processes for all following operations (0 means all available cores)'''
+        Parallel.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+
+    @staticmethod
+    def split_by_headers(file_path: str, start_offset: int = 0) -> List[Tuple[int, int]]:
+        '''Byte ranges of the file (from the offset) for each process, every range except the first one starts with a header line
+
+        Ranges are not larger than MAXIMAL_PART_SIZE (unless a single section is larger), so that the result of a range is always small
+        '''
+        size = os.path.getsize(file_path)
+        parts_cnt = max(min(Parallel.jobs, (size - start_offset) // Parallel.MINIMAL_PART_SIZE), -(-(size - start_offset) // Parallel.MAXIMAL_PART_SIZE))
+
+        if parts_cnt <= 1:
+            return [(start_offset, size)]
+
+        cut_offsets = [start_offset]
+        with LineScanner(file_path) as scanner:
+            for part_inx in range(1, parts_cnt):
+                header_offset = scanner.find_valid_header(max(cut_offsets[-1] + 1, start_offset + (size - start_offset) * part_inx // parts_cnt))
+                if header_offset == -1:
+                    break
+                cut_offsets.append(header_offset)
+
+        cut_offsets.append(size)
+        return [(start, end) for start, end in zip(cut_offsets, cut_offsets[1:]) if start != end]
+
+    @staticmethod
+    def split_range(items: range) -> List[range]:
+        '''Consecutive parts of the range (sections) for each process'''
+        parts_cnt = max(1, min(Parallel.jobs, len(items)))
+        bounds = [items.start + len(items) * part_inx // parts_cnt for part_inx in range(parts_cnt + 1)]
+        return [range(start, end) for start, end in zip(bounds, bounds[1:])]
+
+    @staticmethod
+    def map(function: Callable, arguments: List[tuple]) -> List:
+        '''Results of the function for every set of arguments in the same order (in the current process if there is only one set)'''
+        return list(Parallel.imap(function, arguments))
+
+    @staticmethod
+    def imap(function: Callable, arguments: List[tuple]) -> Iterator:
+        '''Results of the function for every set of arguments in the same order, given out as soon as they are ready
+
+        Only two sets per process are submitted ahead, so that results which are not consumed yet do not pile up in memory
+        '''
+        if Parallel.jobs <= 1 or len(arguments) <= 1:
+            for function_arguments in arguments:
+                yield function(*function_arguments)
+            return
+
+        with ProcessPoolExecutor(max_workers=min(Parallel.jobs, len(arguments)), initializer=Parallel.set_jobs, initargs=(1,)) as executor:
+            futures = deque()
+            for function_arguments in arguments:
+                futures.append(executor.submit(function, *function_arguments))
+                if len(futures) >= 2 * Parallel.jobs:
+                    yield futures.popleft().result()
+
+            while len(futures) != 0:
+                yield futures.popleft().result()
@@ -0,0 +1,147 @@
+'''Profiler location'''
+
+import time
+import cProfile
+import sys
+from functools import wraps
+from contextlib import contextmanager
+from typing import Callable, Iterator, List
+from loguru import logger
+from models.stage_record import StageRecord
+
+# NOTE - Module is not available on Windows, peak memory is not displayed there
+try:
+    import resource
+except ImportError:
+    resource = None
+
+class Profiler:
+    '''Wall time, processed lines and peak memory of the stages of a command (enabled by the global --profile option)
+
+    Time of a nested stage is not counted in the stage that contains it, peak memory is the largest resident size of the process
+    reached by the end of the stage (without tracing every allocation, which would slow the command down several times)
+    '''
+
+    STAGES = ('validation', 'parse', 'compute', 'render')
+
+    enabled = False
+    start_time = 0.0
+    records = {}
+    stack = []
+    stats_path = None
+    cprofile = None
+
+    @staticmethod
+    def start(stats_path: str = None) -> None:
+        '''Start measuring, a cProfile is also recorded if the path for its statistics is passed'''
+        if not Profiler.enabled:
+            Profiler.enabled = True
+            Profiler.records = { name: StageRecord(name) for name in Profiler.STAGES }
+            Profiler.start_time = time.perf_counter()
+
+        if stats_path is not None and Profiler.cprofile is None:
+            Profiler.stats_path = stats_path
+            Profiler.cprofile = cProfile.Profile()
+            Profiler.cprofile.enable()
+
+    @staticmethod
+    @contextmanager
+    def stage(name: str) -> Iterator[StageRecord]:
+        '''Measure the code inside as a stage, processed lines are added to the returned record'''
+        if not Profiler.enabled:
+            yield StageRecord(name)
+            return
+
+        record = StageRecord(name)
+        frame = { 'record': record, 'nested_sec': 0.0 }
+        Profiler.stack.append(frame)
+        start_time = time.perf_counter()
+
+        try:
+            yield record
+        finally:
+            wall_sec = time.perf_counter() - start_time
+            Profiler.stack.pop()
+
+            if len(Profiler.stack) != 0:
+                Profiler.stack[-1]['nested_sec'] += wall_sec
+
+            total = Profiler.records.setdefault(name, StageRecord(name))
+            total.wall_sec += wall_sec - frame['nested_sec']
+            total.lines_cnt += record.lines_cnt
+            total.peak_memory = max(total.peak_memory, Profiler.get_peak_memory())
+            total.calls_cnt += 1
+
+    @staticmethod
+    def measure(name: str) -> Callable:
+        '''Decorator measuring every call of the function as a stage'''
+        def decorator(function: Callable) -> Callable:
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                if not Profiler.enabled:
+                    return function(*args, **kwargs)
+                with Profiler.stage(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def count_lines(lines_cnt: int) -> None:
+        '''Add processed lines to the stage that is measured now'''
+        if Profiler.enabled and len(Profiler.stack) != 0:
+            Profiler.stack[-1]['record'].lines_cnt += lines_cnt
+
+    @staticmethod
+    def finish() -> None:
+        '''Stop measuring, print the summary and save the cProfile statistics'''
+        if not Profiler.enabled:
+            return
+
+        if Profiler.cprofile is not None:
+            Profiler.cprofile.disable()
+            Profiler.cprofile.dump_stats(Profiler.stats_path)
+
+        total_sec = time.perf_counter() - Profiler.start_time
+        Profiler.enabled = False
+
+        print('\n'.join(Profiler.format_summary(total_sec, Profiler.get_peak_memory())))
+        if Profiler.cprofile is not None:
+            logger.success(f"Profile statistics saved to {Profiler.stats_path} (can be viewed with python -m pstats)")
+
+    @staticmethod
+    def format_summary(total_sec: float, total_peak_memory: int) -> List[str]:
+        '''Table of the stages, time outside of them is shown as other'''
+        records = list(Profiler.records.values())
+        other_sec = max(total_sec - sum(record.wall_sec for record in records), 0.0)
+
+        lines = [f"{'Stage':<10} | {'Calls':>5} | {'Time (s)':>9} | {'Share':>6} | {'Lines':>11} | {'Lines/s':>11} | {'Peak RSS (MB)':>13}"]
+        lines.append('-' * len(lines[0]))
+
+        for record in records:
+            lines_per_sec = f"{record.lines_cnt / record.wall_sec:,.0f}" if record.lines_cnt != 0 and record.wall_sec != 0 else '-'
+            lines.append(f"{record.name:<10} | {record.calls_cnt:>5} | {record.wall_sec:9.3f} | {Profiler.format_share(record.wall_sec, total_sec):>6} | {record.lines_cnt:>11,} | {lines_per_sec:>11} | {Profiler.format_memory(record.peak_memory):>13}")
+
+        lines.append(f"{'other':<10} | {'-':>5} | {other_sec:9.3f} | {Profiler.format_share(other_sec, total_sec):>6} | {'-':>11} | {'-':>11} | {'-':>13}")
+        lines.append('-' * len(lines[0]))
+        lines.append(f"{'total':<10} | {'-':>5} | {total_sec:9.3f} | {'100%':>6} | {'-':>11} | {'-':>11} | {Profiler.format_memory(total_peak_memory):>13}")
+        return lines
+
+    @staticmethod
+    def get_peak_memory() -> int:
+        '''Largest resident size of the process so far in bytes (0 if it is unknown)'''
+        if resource is None:
+            return 0
+
+        # NOTE - Linux reports kilobytes, macOS reports bytes
+        peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak_memory if sys.platform == 'darwin' else peak_memory * 1024
+
+    @staticmethod
+    def format_memory(memory: int) -> str:
+        '''Memory in megabytes'''
+        return f"{memory / (1 << 20):.1f}" if memory != 0 else '-'
+
+    @staticmethod
+    def format_share(stage_sec: float, total_sec: float) -> str:
+        '''Part of the total time in percent'''
+        return f"{stage_sec / total_sec * 100:.1f}%" if total_sec != 0 else '-'
@@ -0,0 +1,296 @@
+'''QueryServer location'''
+
+import os
+import json
+import threading
+import socket
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from http import HTTPStatus
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit, parse_qs
+from loguru import logger
+from models.config import Config
+from models.readable_file import ReadableFile
+from models.readings_store import ReadingsStore
+from models.exceptions import Error, InvalidQueryError
+from tools.file_parser import FileParser
+from tools.vectorized_calculator import VectorizedCalculator
+from tools.additional_datetime_utils import try_parse_datetime
+
+class QueryServer(HTTPServer):
+    '''HTTP server answering queries with JSON from files loaded into memory, requests are handled by a pool of threads and answers are cached'''
+
+    # NOTE - Path of the request: method building the answer
+    ENDPOINTS = {
+        '/files': 'get_files',
+        '/calc': 'get_calc',
+        '/headers': 'get_headers',
+        '/readings': 'get_readings',
+        '/graph': 'get_graph'
+    }
+    UNITS = {
+        'voltage_interval': 'v',
+        'average_acceleration': 'm/s^2',
+        'average_deceleration': 'm/s^2',
+        'average_speed': 'km/h',
+        'travel_time': 'sec',
+        'travel_distance': 'km'
+    }
+    GRAPH_COLUMNS = ('travel_time', 'travel_distance')
+
+    CACHE_SIZE = 256
+    READINGS_LIMIT = 10_000
+
+    def __init__(self, address: Tuple[str, int], resource_paths: List[str], workers_cnt: int) -> None:
+        super().__init__(address, QueryHandler)
+        self.resource_paths = resource_paths
+        self.config = Config.collect()
+        self.executor = ThreadPoolExecutor(max_workers=workers_cnt)
+
+        # NOTE - Answers by the query and the state of its files, the least recently used are dropped
+        self.cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+
+        # NOTE - Answers being calculated by the query, identical queries arriving meanwhile wait for them instead of calculating again
+        self.pending = {}
+
+        # NOTE - Every file is loaded by one query at a time, so a changed file is ingested only once while other queries go on
+        self.load_locks = {resource_path: threading.Lock() for resource_path in resource_paths}
+
+    def process_request(self, request: socket.socket, client_address: Tuple[str, int]) -> None:
+        '''Handle the request in a thread of the pool, the server keeps accepting connections'''
+        self.executor.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request: socket.socket, client_address: Tuple[str, int]) -> None:
+        '''Handling of the request in a thread of the pool'''
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        '''Close the socket and wait for the requests being handled'''
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+    def answer(self, path: str, params: Dict[str, List[str]]) -> bytes:
+        '''JSON answer to the query, taken from the cache if the requested files have not changed since it was calculated'''
+        if path not in QueryServer.ENDPOINTS:
+            raise InvalidQueryError(f"Unknown endpoint: {path} (available: {', '.join(QueryServer.ENDPOINTS)})", HTTPStatus.NOT_FOUND)
+
+        file_paths = self.select_files(params.get('file', []))
+        key = (path, tuple(sorted((name, tuple(values)) for name, values in params.items())), tuple(QueryServer.get_state(file_path) for file_path in file_paths))
+
+        cached_answer = self.recall(key)
+        if cached_answer is not None:
+            return cached_answer
+
+        with self.cache_lock:
+            future = self.pending.get(key)
+            is_calculating = future is None
+            if is_calculating:
+                future = self.pending[key] = Future()
+
+        if not is_calculating:
+            return future.result()
+
+        try:
+            # NOTE - Same query may have been answered before this one was marked as pending
+            answer = self.recall(key)
+            if answer is None:
+                self.load_files(file_paths)
+                answer = json.dumps(getattr(self, QueryServer.ENDPOINTS[path])(file_paths, params)).encode('UTF-8')
+
+                with self.cache_lock:
+                    self.cache[key] = answer
+                    if len(self.cache) > QueryServer.CACHE_SIZE:
+                        self.cache.popitem(last=False)
+
+            future.set_result(answer)
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        finally:
+            with self.cache_lock:
+                del self.pending[key]
+
+        return answer
+
+    def recall(self, key: tuple) -> bytes:
+        '''Cached answer of the query (None if it is not cached)'''
+        with self.cache_lock:
+            if key not in self.cache:
+                return None
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+    def load_files(self, file_paths: List[str]) -> None:
+        '''Check the files of the query again and load them into memory (taken from memory if they have not changed)'''
+        for file_path in file_paths:
+            with self.load_locks[file_path]:
+                ReadableFile.check(file_path)
+                FileParser.preload(file_path)
+
+    def select_files(self, names: List[str]) -> List[str]:
+        '''Files of the server requested by paths or names (all files if nothing is requested)'''
+        if len(names) == 0:
+            return self.resource_paths
+
+        file_paths = []
+        for name in names:
+            matches = [resource_path for resource_path in self.resource_paths if name in (resource_path, os.path.basename(resource_path))]
+            if len(matches) == 0:
+                raise InvalidQueryError(f"File is not served: {name}", HTTPStatus.NOT_FOUND)
+            file_paths.extend(match for match in matches if match not in file_paths)
+
+        return file_paths
+
+    @staticmethod
+    def get_state(file_path: str) -> Tuple[str, int, int]:
+        '''Size and modification time of the file, answers are calculated again when they change'''
+        stat = os.stat(file_path)
+        return file_path, stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def get_interval(params: Dict[str, List[str]]) -> Tuple[datetime, datetime]:
+        '''Interval of the query (dd.mm.yyyy or dd.mm.yyyy-hh:mm:ss), the end date includes the whole day'''
+        datetime_start = try_parse_datetime(params['start'][0]) if 'start' in params else datetime(2000, 1, 1)
+        datetime_end = try_parse_datetime(params['end'][0], last_day=True) if 'end' in params else datetime(3000, 1, 1)
+        return datetime_start, datetime_end
+
+    # SECTION - Endpoints
+    def get_files(self, file_paths: List[str], params: Dict[str, List[str]]) -> dict:
+        '''Served files with the numbers of lines and headers'''
+        return {'files': [{'path': file_path, 'lines': FileParser.count_lines(file_path), 'headers': FileParser.get_index(file_path).headers_cnt} for file_path in file_paths]}
+
+    def get_calc(self, file_paths: List[str], params: Dict[str, List[str]]) -> dict:
+        '''Values of the calc targets (all of them if none is requested), files are calculated together'''
+        targets = params.get('target', list(VectorizedCalculator.TARGETS))
+        unknown_targets = [target for target in targets if target not in VectorizedCalculator.TARGETS]
+        if len(unknown_targets) != 0:
+            raise InvalidQueryError(f"Unknown calculation target: {', '.join(unknown_targets)} (available: {', '.join(VectorizedCalculator.TARGETS)})")
+
+        datetime_start, datetime_end = QueryServer.get_interval(params)
+        accumulators = {target: VectorizedCalculator.create_accumulator(target, self.config.minimal_voltage_search) for target in targets}
+        VectorizedCalculator.accumulate_files(file_paths, datetime_start, datetime_end, list(accumulators.values()))
+
+        values = {}
+        for target, accumulator in accumulators.items():
+            result = accumulator.result()
+            if target == 'voltage_interval':
+                values[target] = {bound: float(value) for bound, value in result.items()} if len(result) != 0 else None
+            else:
+                values[target] = float(result)
+
+        return {'files': file_paths, 'start': datetime_start.isoformat(), 'end': datetime_end.isoformat(), 'values': values, 'units': {target: QueryServer.UNITS[target] for target in accumulators}}
+
+    def get_headers(self, file_paths: List[str], params: Dict[str, List[str]]) -> dict:
+        '''Headers written within the interval'''
+        datetime_start, datetime_end = QueryServer.get_interval(params)
+        files = []
+
+        for file_path in file_paths:
+            store = ReadingsStore.load(file_path)
+            headers = [store.get_header(header_inx) for header_inx in FileParser.get_index(file_path).find_headers(datetime_start, datetime_end)]
+            files.append({'path': file_path, 'headers': [{
+                'datetime': header.datetime.isoformat(),
+                'spokes_cnt': header.spokes_cnt,
+                'wheel_circ': header.wheel_circ,
+                'max_voltage': header.max_voltage,
+                'save_delay': header.save_delay
+            } for header in headers]})
+
+        return {'files': files}
+
+    def get_readings(self, file_paths: List[str], params: Dict[str, List[str]]) -> dict:
+        '''Readings within the interval by sections (columns of values), calculated speeds and voltages are added on request'''
+        datetime_start, datetime_end = QueryServer.get_interval(params)
+        is_calculated = params.get('calculated', ['0'])[0].lower() in ('1', 'true', 'yes')
+
+        try:
+            limit = int(params['limit'][0]) if 'limit' in params else QueryServer.READINGS_LIMIT
+        except ValueError:
+            raise InvalidQueryError("Parameter limit must be a number")
+        if not 0 < limit <= QueryServer.READINGS_LIMIT:
+            raise InvalidQueryError(f"Parameter limit must be from 1 to {QueryServer.READINGS_LIMIT}")
+
+        # NOTE - Answer is limited by the number of readings, the rest is left out and the answer is marked as truncated
+        files, readings_cnt, is_truncated = [], 0, False
+        for file_path in file_paths:
+            store = ReadingsStore.load(file_path)
+            sections = []
+
+            for header_inx, millis_passed, impulse_cnt, analog_voltage in store.iter_sections(datetime_start, datetime_end, FileParser.get_index(file_path).find_sections(datetime_start, datetime_end)):
+                if len(millis_passed) == 0:
+                    continue
+                elif readings_cnt == limit:
+                    is_truncated = True
+                    break
+
+                selected_cnt = min(len(millis_passed), limit - readings_cnt)
+                is_truncated = selected_cnt < len(millis_passed)
+                millis_passed, impulse_cnt, analog_voltage = millis_passed[:selected_cnt], impulse_cnt[:selected_cnt], analog_voltage[:selected_cnt]
+                readings_cnt += selected_cnt
+
+                section = {
+                    'datetime': store.get_header(header_inx).datetime.isoformat(),
+                    'millis_passed': millis_passed.tolist(),
+                    'impulse_cnt': impulse_cnt.tolist(),
+                    'analog_voltage': analog_voltage.tolist()
+                }
+                if is_calculated:
+                    section_values = VectorizedCalculator.get_section_values(store, header_inx, millis_passed, impulse_cnt, analog_voltage)
+                    section['speed_kmh'] = section_values.speeds_kmh.tolist()
+                    section['voltage_v'] = section_values.voltages_v.tolist()
+                sections.append(section)
+
+            files.append({'path': file_path, 'sections': sections})
+            if is_truncated:
+                break
+
+        return {'files': files, 'readings_cnt': readings_cnt, 'truncated': is_truncated}
+
+    def get_graph(self, file_paths: List[str], params: Dict[str, List[str]]) -> dict:
+        '''Travel time or distance by day as for the graph command, files are summed'''
+        column = params.get('column', [None])[0]
+        if column not in QueryServer.GRAPH_COLUMNS:
+            raise InvalidQueryError(f"Parameter column must be one of: {', '.join(QueryServer.GRAPH_COLUMNS)}")
+
+        datetime_start, datetime_end = QueryServer.get_interval(params)
+        days_values = VectorizedCalculator.sum_files_by_day(file_paths, datetime_start, datetime_end, column)
+        return {'column': column, 'unit': QueryServer.UNITS[column], 'days': [{'date': day.isoformat(), 'value': float(value)} for day, value in days_values.items()]}
+    # !SECTION
+
+class QueryHandler(BaseHTTPRequestHandler):
+    '''Answering GET requests to the QueryServer'''
+
+    server: QueryServer
+
+    def do_GET(self) -> None:
+        '''Answer of the endpoint or the error as JSON'''
+        url = urlsplit(self.path)
+
+        try:
+            status, body = HTTPStatus.OK, self.server.answer(url.path.rstrip('/') or '/', parse_qs(url.query))
+        except InvalidQueryError as error:
+            status, body = error.status, json.dumps({'error': error.name, 'code': error.code, 'message': error.message}).encode('UTF-8')
+        except Error as error:
+            status, body = HTTPStatus.BAD_REQUEST, json.dumps({'error': error.name, 'code': error.code}).encode('UTF-8')
+        except Exception as error:
+            logger.exception(error)
+            status, body = HTTPStatus.INTERNAL_SERVER_ERROR, json.dumps({'error': type(error).__name__}).encode('UTF-8')
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        '''Requests are logged with loguru as other messages'''
+        logger.info(f"{self.address_string()} {format % args}")
@@ -0,0 +1,82 @@
+'''ReadingsRenderer location'''
+
+from typing import Dict, List
+import numpy as np
+from colorama import Fore, Style
+from models.reading import Reading
+from models.counted_reading import CountedReading
+from models.readings_store import ReadingsStore
+from tools.display_utils import Color
+
+class ReadingsRenderer:
+    '''Formatting readings of a whole section at once (same text as Reading.display and CountedReading.display)'''
+
+    MILLIS_IN_DAY = 24 * 60 * 60 * 1000
+    BUCKET_COLUMNS = ('speed_mean', 'speed_min', 'speed_max', 'voltage_mean', 'voltage_min', 'voltage_max')
+
+    @staticmethod
+    def format_readings(millis_passed: np.ndarray, impulse_cnt: np.ndarray, analog_voltage: np.ndarray, raw=False, to_enumerate=False) -> List[str]:
+        '''Lines of raw readings'''
+        if raw:
+            lines = [f"{millis} | {impulses} | {analog}" for millis, impulses, analog in zip(millis_passed.tolist(), impulse_cnt.tolist(), analog_voltage.tolist())]
+        else:
+            lines = [f"millis_passed: {millis} ms, impulse_cnt: {impulses}, analog_voltage: {analog}" for millis, impulses, analog in zip(millis_passed.tolist(), impulse_cnt.tolist(), analog_voltage.tolist())]
+
+        return ReadingsRenderer.enumerate_lines(lines, Reading, to_enumerate)
+
+    @staticmethod
+    def format_counted_readings(store: ReadingsStore, header_inx: int, millis_passed: np.ndarray, impulse_cnt: np.ndarray, analog_voltage: np.ndarray,
+                                normal_speed_interval: dict[str, float], normal_voltage_interval: dict[str, float], raw=False, to_enumerate=False, decimal_places=2) -> List[str]:
+        '''Lines of readings with speed and voltage calculated using the configuration of the section header'''
+        speeds_kmh = CountedReading.calculate_speeds(impulse_cnt, int(store.headers['spokes_cnt'][header_inx]), int(store.headers['wheel_circ'][header_inx]), float(store.headers['save_delay'][header_inx]))
+        voltages_v = CountedReading.calculate_voltages(analog_voltage, int(store.headers['max_voltage'][header_inx]))
+
+        # NOTE - Time of day of every reading in milliseconds
+        header_datetime = store.headers['datetime'][header_inx]
+        header_millis = int((header_datetime - header_datetime.astype('datetime64[D]')).astype('timedelta64[ms]').astype(np.int64))
+        day_millis = (header_millis + millis_passed) % ReadingsRenderer.MILLIS_IN_DAY
+
+        is_anomalous_speed = (speeds_kmh < normal_speed_interval['min']) | (speeds_kmh > normal_speed_interval['max'])
+        is_anomalous_voltage = (voltages_v < normal_voltage_interval['min']) | (voltages_v > normal_voltage_interval['max'])
+        anomalous_speed = Color.colorize(" (Anomalous speed)", fore=Fore.RED, style=Style.BRIGHT)
+        anomalous_voltage = Color.colorize(" (Anomalous voltage)", fore=Fore.RED, style=Style.BRIGHT)
+
+        lines = []
+        for time_millis, millis, speed_kmh, voltage_v, speed_anomaly, voltage_anomaly in zip(day_millis.tolist(), millis_passed.tolist(), speeds_kmh.tolist(), voltages_v.tolist(), is_anomalous_speed.tolist(), is_anomalous_voltage.tolist()):
+            hours, minutes, seconds, microseconds = time_millis // 3_600_000, time_millis // 60_000 % 60, time_millis // 1000 % 60, time_millis % 1000 * 1000
+
+            if not raw:
+                line = f"time: {hours:02}:{minutes:02}:{seconds:02}:{microseconds:06}, millis_passed: {millis}, speed_kmh: {round(speed_kmh, decimal_places)} km/h, voltage_v: {round(voltage_v, decimal_places)} v"
+            else:
+                time = f"{hours:02}:{minutes:02}:{seconds:02}" + (f".{microseconds:06}" if microseconds != 0 else "")
+                line = f"{time} | {millis} | {round(speed_kmh, decimal_places)} | {round(voltage_v, decimal_places)}"
+
+            if speed_anomaly:
+                line += anomalous_speed
+            if voltage_anomaly:
+                line += anomalous_voltage
+            lines.append(line)
+
+        return ReadingsRenderer.enumerate_lines(lines, CountedReading, to_enumerate)
+
+    @staticmethod
+    def format_buckets(buckets: Dict[str, np.ndarray], raw=False, to_enumerate=False, decimal_places=3) -> List[str]:
+        '''Lines of resampled readings: start of the bucket, number of readings, mean, minimum and maximum of speed and voltage'''
+        values = zip(buckets['datetime'].astype('datetime64[s]').tolist(), buckets['readings_cnt'].tolist(), *(buckets[column].round(decimal_places).tolist() for column in ReadingsRenderer.BUCKET_COLUMNS))
+
+        if raw:
+            lines = [f"{bucket_datetime.strftime('%d.%m.%Y-%H:%M:%S')} | {readings_cnt} | {speed_mean} | {speed_min} | {speed_max} | {voltage_mean} | {voltage_min} | {voltage_max}"
+                     for bucket_datetime, readings_cnt, speed_mean, speed_min, speed_max, voltage_mean, voltage_min, voltage_max in values]
+        else:
+            lines = [f"time: {bucket_datetime.strftime('%d.%m.%Y %H:%M:%S')}, readings: {readings_cnt}, speed_kmh: {speed_mean} ({speed_min} - {speed_max}) km/h, voltage_v: {voltage_mean} ({voltage_min} - {voltage_max}) v"
+                     for bucket_datetime, readings_cnt, speed_mean, speed_min, speed_max, voltage_mean, voltage_min, voltage_max in values]
+
+        return ReadingsRenderer.enumerate_lines(lines, CountedReading, to_enumerate)
+
+    @staticmethod
+    def enumerate_lines(lines: List[str], displayed_class: type, to_enumerate: bool) -> List[str]:
+        '''Numbering lines continuing the display counter of the class'''
+        if to_enumerate:
+            lines = [f"{number}) {line}" for number, line in enumerate(lines, start=displayed_class.display_cnt)]
+        displayed_class.display_cnt += len(lines)
+        return lines
@@ -0,0 +1,37 @@
+'''RidesRenderer location'''
+
+from typing import List
+import numpy as np
+from colorama import Fore, Style
+from models.rides import Rides
+from tools.display_utils import Color
+
+class RidesRenderer:
+    '''Formatting values of rides, all lines at once'''
+
+    @staticmethod
+    def format_rides(rides: Rides, rides_inxs: range, raw=False, to_enumerate=False, decimal_places=2) -> List[str]:
+        '''Lines with the time, duration, distance, speeds and voltages of each of the rides'''
+        inxs = np.arange(rides_inxs.start, rides_inxs.stop)
+        first_datetimes = rides.columns['first_datetime'][inxs].astype('datetime64[s]').tolist()
+        last_datetimes = rides.columns['last_datetime'][inxs].astype('datetime64[s]').tolist()
+        values = zip(first_datetimes, last_datetimes, rides.durations[inxs].tolist(), rides.columns['travel_distance'][inxs].tolist(), rides.average_speeds[inxs].tolist(),
+                     rides.columns['speed_max'][inxs].tolist(), rides.columns['voltage_first'][inxs].tolist(), rides.columns['voltage_last'][inxs].tolist())
+
+        lines = []
+        for first_datetime, last_datetime, duration_sec, distance_km, average_speed_kmh, speed_max_kmh, voltage_first_v, voltage_last_v in values:
+            if raw:
+                lines.append(f"{first_datetime.strftime('%d.%m.%Y-%H:%M:%S')} | {last_datetime.strftime('%d.%m.%Y-%H:%M:%S')} | {round(duration_sec, 3)} | {round(distance_km, decimal_places)} | "
+                             f"{round(average_speed_kmh, decimal_places)} | {round(speed_max_kmh, decimal_places)} | {round(voltage_first_v, decimal_places)} | {round(voltage_last_v, decimal_places)}")
+                continue
+
+            # NOTE - Date of the end is displayed only for rides through midnight
+            end = last_datetime.strftime('%H:%M:%S') if last_datetime.date() == first_datetime.date() else last_datetime.strftime('%d.%m.%Y %H:%M:%S')
+            time_colored = Color.colorize(msg=f"[{first_datetime.strftime('%d.%m.%Y %H:%M:%S')} --> {end}]", fore=Fore.CYAN, style=Style.BRIGHT)
+            lines.append(f"{time_colored} duration: {round(duration_sec / 60, decimal_places)} min, distance: {round(distance_km, decimal_places)} km, "
+                         f"average speed: {round(average_speed_kmh, decimal_places)} km/h, max speed: {round(speed_max_kmh, decimal_places)} km/h, "
+                         f"voltage: {round(voltage_first_v, decimal_places)} --> {round(voltage_last_v, decimal_places)} v (drop: {round(voltage_first_v - voltage_last_v, decimal_places)} v)")
+
+        if to_enumerate:
+            lines = [f"{number}) {line}" for number, line in enumerate(lines, start=rides_inxs.start + 1)]
+        return lines
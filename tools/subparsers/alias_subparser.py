@@ -1,17 +1,24 @@
 '''AliasSubParser location'''
 
 import os
-import sys
-import subprocess
+import shlex
 from copy import copy
+from typing import List
 from argparse import _SubParsersAction, Namespace
 from colorama import Fore, Style
 from loguru import logger
 from tools.file_parser import FileParser
+from tools.command_parser import CommandParser
 from tools.display_utils import ConstantValueOutput, Color
 
 class AliasSubParser:
-    '''Processing aliases for commands'''
+    '''Processing aliases for commands
+
+    Aliases are run in the current process, so the steps of a group share files that are already checked and loaded
+    '''
+
+    # NOTE - Names of the aliases being launched, an alias can not launch itself
+    launched_names = []
 
     @classmethod
     def add_subparser(cls, subparsers: _SubParsersAction) -> _SubParsersAction:
@@ -19,7 +26,9 @@ class AliasSubParser:
         alias_subparser = subparsers.add_parser('alias', description='Processing aliases for commands, created by user')
         alias_subparser.add_argument('-s', '--show', action='store_true', help='Show all available aliases')
         alias_subparser.add_argument('-a', '--add', nargs=2, help='Add an alias (specify NAME and COMMAND; enter the subparser and its arguments as a command, the python interpreter and the name of the main script will be added automatically after launch call)')
-        alias_subparser.add_argument('-l', '--launch', nargs=1, help='Launch an alias (specify NAME)')
+        alias_subparser.add_argument('-g', '--group', nargs='+', metavar=('NAME', 'ALIAS'), help='Add a group of aliases launched one after another (specify NAME and names of the aliases)')
+        alias_subparser.add_argument('-l', '--launch', nargs=1, help='Launch an alias or a group (specify NAME)')
+        alias_subparser.add_argument('-i', '--input', nargs='+', help='Paths to files with readings used by every launched command instead of its own input')
         alias_subparser.add_argument('-d', '--delete', nargs=1, help='Delete an alias (specify NAME)')
         alias_subparser.add_argument('-r', '--reset', action='store_true', help='Delete aliases file (all aliases)')
         cls.SUBPARSER = alias_subparser
@@ -29,15 +38,16 @@ class AliasSubParser:
     def run_alias(cls, namespace: Namespace) -> None:
         '''Run if Alias subparser was called'''
         ALIASES_PATH = os.path.join(os.path.split(os.path.abspath(__file__))[0], '..', '..', 'aliases.yaml')
-        MAIN_SCRIPT_PATH = os.path.join(os.path.split(os.path.abspath(__file__))[0], '..', '..', 'marp.py')
-        
         ALIASES = FileParser.parse_aliases(ALIASES_PATH)
 
         if namespace.show:
             if ALIASES['exists']:
                 Color.cprint("All available aliases: ", fore=Fore.WHITE, style=Style.BRIGHT, end='\n')
                 for alias in ALIASES['data']:
-                    ConstantValueOutput(alias['name'], f"python marp.py {alias['cmd']}").display()
+                    if 'group' in alias:
+                        ConstantValueOutput(alias['name'], f"group of {', '.join(alias['group'])}").display()
+                    else:
+                        ConstantValueOutput(alias['name'], f"python marp.py {alias['cmd']}").display()
             else:
                 logger.info("No alias file (create an alias using --add)")
                 return
@@ -56,6 +66,24 @@ class AliasSubParser:
             FileParser.save_aliases(ALIASES_PATH, aliases)
             logger.success(f"Alias {name} successfully added")
 
+        elif namespace.group:
+            if len(namespace.group) < 2:
+                logger.error("Failed to add a group, specify its name and at least one alias")
+                return
+
+            name, steps = namespace.group[0], namespace.group[1:]
+            commands = { alias['name']: alias.get('cmd') for alias in ALIASES['data'] }
+
+            if name in commands:
+                logger.error("Failed to add a group, the name is already taken (firstly remove it with --delete)")
+                return
+            elif any(commands.get(step) is None for step in steps):
+                logger.error("Failed to add a group, only existing aliases of commands can be its steps")
+                return
+
+            FileParser.save_aliases(ALIASES_PATH, copy(ALIASES['data']) + [{ 'name': name, 'group': steps }])
+            logger.success(f"Group {name} of {len(steps)} aliases successfully added")
+
         elif namespace.launch:
             if not ALIASES['exists']:
                 logger.info("No alias file (create an alias using --add)")
@@ -66,14 +94,16 @@ class AliasSubParser:
                 return 
 
             try:
-                alias_activated = False
-                for alias in ALIASES['data']:
-                    if alias['name'] == namespace.launch[0]:
-                        alias_activated = True
-                        subprocess.run(f"{sys.executable} {MAIN_SCRIPT_PATH} {alias['cmd']}", check=True)
-                        break
-                if not alias_activated:
+                aliases = { alias['name']: alias for alias in ALIASES['data'] }
+                if namespace.launch[0] not in aliases:
                     logger.info("Failed to find an alias for the specified name")
+                    return
+
+                alias = aliases[namespace.launch[0]]
+                steps = [aliases[step] for step in alias['group']] if 'group' in alias else [alias]
+                for step in steps:
+                    if not AliasSubParser.launch(step['name'], step['cmd'], namespace.input):
+                        break
             except KeyError:
                 logger.error(f"Failed to retrieve aliases from file {ALIASES_PATH} (clean up aliases with --reset or delete file manually)")
 
@@ -85,7 +115,7 @@ class AliasSubParser:
                 if alias['name'] == name:
                     aliases.pop(inx)
                     if len(aliases) != 0:
-                        FileParser.write_aliases(ALIASES_PATH, aliases)
+                        FileParser.save_aliases(ALIASES_PATH, aliases)
                         logger.success(f"Successfully deleted an alias {name}")
                     else:
                         os.remove(ALIASES_PATH) 
@@ -103,3 +133,35 @@ class AliasSubParser:
         else:
             logger.error("Alias interraction not selected")
             cls.SUBPARSER.print_help()
+
+    @staticmethod
+    def launch(name: str, command: str, input_paths: List[str] = None) -> bool:
+        '''Run the command of the alias in the current process, with other input files if they are passed (False if it can not be run)'''
+        if name in AliasSubParser.launched_names:
+            logger.error(f"Alias {name} launches itself, launch is stopped")
+            return False
+
+        args = shlex.split(command)
+        if input_paths:
+            args = AliasSubParser.replace_input(args, input_paths)
+
+        AliasSubParser.launched_names.append(name)
+        try:
+            is_launched = CommandParser.run(args)
+        finally:
+            AliasSubParser.launched_names.pop()
+
+        if not is_launched:
+            logger.error(f"Failed to run the command of alias {name}: {command}")
+        return is_launched
+
+    @staticmethod
+    def replace_input(args: List[str], input_paths: List[str]) -> List[str]:
+        '''Arguments of the command with the values of its --input replaced by the paths'''
+        for inx, arg in enumerate(args):
+            if arg in ('-i', '--input'):
+                end_inx = inx + 1
+                while end_inx < len(args) and not args[end_inx].startswith('-'):
+                    end_inx += 1
+                return args[:inx + 1] + input_paths + args[end_inx:]
+        return args
@@ -0,0 +1,57 @@
+'''BenchmarkSubParser location'''
+
+import os
+import shutil
+import tempfile
+from argparse import _SubParsersAction, Namespace
+from loguru import logger
+from models.exceptions import ResourceNotFoundError
+from tools.benchmark import Benchmark
+from tools.data_generator import DataGenerator
+
+class BenchmarkSubParser:
+    '''Measuring the speed of commands'''
+
+    DEFAULT_LINES_CNT = 1_000_000
+    DEFAULT_SEED = 0
+
+    @staticmethod
+    def add_subparser(subparsers: _SubParsersAction) -> _SubParsersAction:
+        '''Creating a subparser'''
+        benchmark_subparser = subparsers.add_parser('benchmark', description='Timing every command on the same file (a copy of the file is used, cache is removed before the first call)')
+        benchmark_subparser.add_argument('-i', '--input', nargs=1, type=str, help='Path to the file with readings (default: generated file)')
+        benchmark_subparser.add_argument('-l', '--lines', nargs=1, type=int, default=[BenchmarkSubParser.DEFAULT_LINES_CNT], help=f"Number of lines in the generated file (default: {BenchmarkSubParser.DEFAULT_LINES_CNT})")
+        benchmark_subparser.add_argument('-rp', '--ride-profile', nargs=1, type=str, choices=list(DataGenerator.PROFILES), default=['mixed'], help='Manner of riding in the generated file (default: mixed)')
+        benchmark_subparser.add_argument('-s', '--seed', nargs=1, type=int, default=[BenchmarkSubParser.DEFAULT_SEED], help=f"Seed of the generated file (default: {BenchmarkSubParser.DEFAULT_SEED})")
+        benchmark_subparser.add_argument('-c', '--cases', nargs='+', type=str, choices=list(Benchmark.CASES), metavar='CASE', help=f"Commands to time (default: all): {', '.join(Benchmark.CASES)}")
+        benchmark_subparser.add_argument('-o', '--output', nargs=1, type=str, help='Path to the file to save the report to')
+        return subparsers
+
+    @staticmethod
+    def run_benchmark(namespace: Namespace) -> None:
+        '''Run if benchmark subparser was called'''
+        if namespace.input and not os.path.isfile(namespace.input[0]):
+            raise ResourceNotFoundError(namespace.input[0])
+        elif not namespace.input and namespace.lines[0] <= 0:
+            logger.error("Count of --lines must be more than 0")
+            return
+
+        with tempfile.TemporaryDirectory(prefix='marp_benchmark_') as directory:
+            file_path = os.path.join(directory, 'readings.txt')
+
+            if namespace.input:
+                shutil.copyfile(namespace.input[0], file_path)
+            else:
+                logger.info(f"Generating a file with {namespace.lines[0]} lines ({namespace.ride_profile[0]} profile, seed {namespace.seed[0]})")
+                DataGenerator(profile=namespace.ride_profile[0], seed=namespace.seed[0]).generate(file_path, namespace.lines[0])
+
+            benchmark = Benchmark(file_path, namespace.jobs)
+            logger.info(f"Timing {len(namespace.cases or Benchmark.CASES)} commands on {benchmark.lines_cnt} lines with {namespace.jobs} jobs")
+            report = Benchmark.format_report(benchmark.run(namespace.cases or list(Benchmark.CASES)))
+
+        print('\n'.join(report))
+
+        if namespace.output:
+            with open(namespace.output[0], 'w', encoding='UTF-8') as file_w:
+                file_w.write('\n'.join(report) + '\n')
+            logger.success(f"Report saved to {namespace.output[0]}")
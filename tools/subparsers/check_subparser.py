@@ -1,7 +1,9 @@
 '''CheckSubParser location'''
 
-from argparse import _SubParsersAction, Namespace, FileType
+from argparse import _SubParsersAction, Namespace
+from loguru import logger
 from tools.file_parser import FileParser
+from models.readable_file import ReadableFile
 
 class CheckSubParser:
     '''Checking files or other input data'''
@@ -10,7 +12,7 @@ class CheckSubParser:
     def add_subparser(subparsers: _SubParsersAction) -> _SubParsersAction:
         '''Creating a subparser'''
         check_subparser = subparsers.add_parser('check', description='Checking incoming data or files against patterns')
-        check_subparser.add_argument('-i', '--input', nargs=1, type=FileType(encoding='UTF-8'), required=True, help='Path to the file with readings')
+        check_subparser.add_argument('-i', '--input', nargs='+', type=str, required=True, help='Paths to files with readings, directories or glob patterns (files are checked at once)')
         check_subparser.add_argument('-p', '--pattern', action='store_true', help='Check that each line matches the header or reading pattern')
         check_subparser.add_argument('-t', '--time', action='store_true', help='Check whether each next date/time is later than the previous ones')
         return subparsers
@@ -18,17 +20,22 @@ class CheckSubParser:
     @staticmethod
     def run_check(namespace: Namespace) -> None:
         '''Run if Check subparser was called'''
-        file_path = namespace.input[0].name
-
-        # SECTION - Processing targets: --pattern --time
-        if namespace.pattern:
-            FileParser.validate_readings_by_pattern(file_path)
-
-        if namespace.time:
-            FileParser.validate_readings_by_time(file_path)
-            
-        else:
-            FileParser.validate_readings_by_time(file_path)
-            FileParser.validate_readings_by_pattern(file_path)
-        # !SECTION
-            
\ No newline at end of file
+        file_paths = ReadableFile.expand_paths(namespace.input)
+        verdicts = FileParser.get_verdicts(file_paths)
+
+        for file_path in file_paths:
+            # SECTION - Processing targets: --pattern --time
+            if namespace.pattern:
+                FileParser.validate_readings_by_pattern(file_path)
+
+            if namespace.time:
+                FileParser.validate_readings_by_time(file_path)
+
+            else:
+                FileParser.validate_readings_by_time(file_path)
+                FileParser.validate_readings_by_pattern(file_path)
+            # !SECTION
+
+        if len(file_paths) > 1:
+            passed_cnt = sum(verdict.is_valid for verdict in verdicts)
+            logger.info(f"Files passed all checks: {passed_cnt} of {len(file_paths)}")
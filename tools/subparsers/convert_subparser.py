@@ -0,0 +1,34 @@
+'''ConvertSubParser location'''
+
+import os
+from argparse import _SubParsersAction, Namespace
+from loguru import logger
+from models.readable_file import ReadableFile
+from models.readings_store import ReadingsStore
+from models.binary_format import BinaryFormat
+
+class ConvertSubParser:
+    '''Converting files to the binary format'''
+
+    @staticmethod
+    def add_subparser(subparsers: _SubParsersAction) -> _SubParsersAction:
+        '''Creating a subparser'''
+        convert_subparser = subparsers.add_parser('convert', description='Converting a file with readings to the compact binary format, which is read by all commands without parsing')
+        convert_subparser.add_argument('-i', '--input', nargs=1, type=ReadableFile, required=True, help='Path to the file with readings')
+        convert_subparser.add_argument('-o', '--output', nargs=1, type=str, help=f"Path to the resulting file (default: same name with {BinaryFormat.EXTENSION} extension)")
+        return subparsers
+
+    @staticmethod
+    def run_convert(namespace: Namespace) -> None:
+        '''Run if convert subparser was called'''
+        resource_path = namespace.input[0].name
+
+        if BinaryFormat.is_binary(resource_path):
+            logger.error(f"File {resource_path} is already in the binary format")
+            return
+
+        result_path = namespace.output[0] if namespace.output else os.path.splitext(resource_path)[0] + BinaryFormat.EXTENSION
+        ReadingsStore.load(resource_path).to_binary(result_path)
+
+        size_ratio = os.path.getsize(result_path) / max(os.path.getsize(resource_path), 1)
+        logger.success(f"File {resource_path} successfully converted ({round(size_ratio * 100, 1)}% of the original size), result available at: {result_path}")
@@ -0,0 +1,48 @@
+'''GenerateSubParser location'''
+
+from argparse import _SubParsersAction, Namespace
+from loguru import logger
+from tools.data_generator import DataGenerator
+from tools.additional_datetime_utils import try_parse_date
+
+class GenerateSubParser:
+    '''Generating files with synthetic readings'''
+
+    @staticmethod
+    def add_subparser(subparsers: _SubParsersAction) -> _SubParsersAction:
+        '''Creating a subparser'''
+        generate_subparser = subparsers.add_parser('generate', description='Generating a file with synthetic headers and readings for measurements and experiments')
+        generate_subparser.add_argument('-o', '--output', nargs=1, type=str, required=True, help='Path to the resulting file')
+        generate_subparser.add_argument('-l', '--lines', nargs=1, type=int, required=True, help='Number of lines in the file')
+
+        # NOTE - Content of the file
+        generate_subparser.add_argument('-rp', '--ride-profile', nargs=1, type=str, choices=list(DataGenerator.PROFILES), default=['mixed'], help='Manner of riding (default: mixed)')
+        generate_subparser.add_argument('-d', '--date', nargs=1, type=str, help='Date of the first ride (dd.mm.yyyy) (default: 01.01.2023)')
+        generate_subparser.add_argument('-dh', '--duplicate-headers', nargs=1, type=float, default=[0.0], help='Share of rides with a repeated header (from 0 to 1, default: 0)')
+        generate_subparser.add_argument('-c', '--corruption', nargs=1, type=float, default=[0.0], help='Share of lines that do not pass the checks (from 0 to 1, default: 0)')
+        generate_subparser.add_argument('-s', '--seed', nargs=1, type=int, help='Seed of the random generator to get the same file again')
+        return subparsers
+
+    @staticmethod
+    def run_generate(namespace: Namespace) -> None:
+        '''Run if generate subparser was called'''
+        result_path = namespace.output[0]
+
+        if namespace.lines[0] <= 0:
+            logger.error("Count of --lines must be more than 0")
+            return
+        elif not (0 <= namespace.duplicate_headers[0] <= 1 and 0 <= namespace.corruption[0] <= 1):
+            logger.error("Shares of --duplicate-headers and --corruption must be from 0 to 1")
+            return
+
+        generator = DataGenerator(
+            profile=namespace.ride_profile[0],
+            duplicate_headers=namespace.duplicate_headers[0],
+            corruption=namespace.corruption[0],
+            seed=namespace.seed[0] if namespace.seed else None
+        )
+        if namespace.date:
+            generator.datetime_start = try_parse_date(namespace.date[0])
+
+        lines_cnt = generator.generate(result_path, namespace.lines[0])
+        logger.success(f"File with {lines_cnt} lines successfully generated, result available at: {result_path}")
@@ -1,31 +1,48 @@
 '''GraphSubParser location'''
 
 from argparse import _SubParsersAction, Namespace
-from copy import copy
+from datetime import datetime
 from typing import List
 import matplotlib.pyplot as plt
 from loguru import logger
-from tools.additional_datetime_utils import try_parse_date, is_datetime_in_interval
-from tools.calculator import Calculator
+from tools.additional_datetime_utils import try_parse_date
 from models.readable_file import ReadableFile
-from models.header import Header
-from models.reading import Reading
-from models.counted_reading import CountedReading
+from tools.vectorized_calculator import VectorizedCalculator
+from tools.accumulators import TimeBucketsAccumulator
+from tools.downsampler import Downsampler
+from tools.profiler import Profiler
 from models.bar_graph_config import BarGraphConfig
+from models.line_graph_config import LineGraphConfig
 
 class GraphSubParser:
     '''Displaying values from a file with graphs'''
 
+    # NOTE - Labels of the bars by resolution, finer resolutions are limited by the number of bars
+    LABEL_FORMATS = {
+        '1s': '%d %b %H:%M:%S',
+        '1m': '%d %b %H:%M',
+        '1h': '%d %b %H:00',
+        '1d': '%d %b'
+    }
+    MAXIMAL_BARS_CNT = 200
+
+    # NOTE - Lines are reduced to about this number of points, readings further apart than the gap are not joined
+    MAXIMAL_POINTS_CNT = 3000
+    LINE_GAP_MILLIS = 60 * 1000
+
     @classmethod
     def add_subparser(cls, subparsers: _SubParsersAction) -> _SubParsersAction:
         '''Creating a subparser'''
         graph_subparser = subparsers.add_parser('graph', description='Displaying values from a file with bar graphs')
-        graph_subparser.add_argument('-i', '--input', nargs=1, type=ReadableFile, required=True, help='Path to the file with readings')
+        graph_subparser.add_argument('-i', '--input', nargs='+', type=str, required=True, help='Paths to files with readings, directories or glob patterns (files are processed together)')
         graph_subparser.add_argument('-tt', '--travel-time', action='store_true', help='Display the travel time by day')
         graph_subparser.add_argument('-td', '--travel-distance', action='store_true', help='Display the travel distance by day')
+        graph_subparser.add_argument('-sp', '--speed', action='store_true', help='Display the speed of the readings over time as a line (any interval)')
+        graph_subparser.add_argument('-vo', '--voltage', action='store_true', help='Display the voltage of the readings over time as a line (any interval)')
 
         # NOTE - Modes of search and visualization
         graph_subparser.add_argument('-d', '--date', nargs=2, type=str, required=True, help='Date to filter values (specify two for the interval) (dd.mm.yyyy)')
+        graph_subparser.add_argument('-rs', '--resolution', nargs=1, type=str, choices=list(TimeBucketsAccumulator.RESOLUTIONS), default=['1d'], help='Time covered by one bar (default: 1d)')
         graph_subparser.add_argument('-a', '--accuracy', nargs=1, type=int, help='Number of decimal places of the displayed values (min: 1, max: 5, default: 2)')
         
         cls.SUBPARSER = graph_subparser
@@ -34,124 +51,89 @@ class GraphSubParser:
     @classmethod
     def run_graph(cls, namespace: Namespace) -> None:
         '''Run if graph subparser was called'''
-        resource_path = namespace.input[0].name
+        resource_paths = [resource.name for resource in ReadableFile.collect(namespace.input)]
         decimal_places = namespace.accuracy[0] if namespace.accuracy and 1 < namespace.accuracy[0] <= 5 else 2
         datetime_start = try_parse_date(namespace.date[0])
         datetime_end = try_parse_date(namespace.date[1], last_day=True)
         bar_graph_config = BarGraphConfig() 
 
+        if namespace.speed or namespace.voltage:
+            GraphSubParser.draw_series(resource_paths, datetime_start, datetime_end, 'speed' if namespace.speed else 'voltage')
+            return
+
         if (datetime_end - datetime_start).days > 30:
             logger.error("Difference between the dates should not be more than a month, because otherwise the diagram will be inconvenient to view")
             return
 
         if namespace.travel_time:
-            travel_times, dates = [], []
-
-            travel_time_sec = 0
-            current_header = last_header = previous_reading = None
-            skip_header = False
-
-            with open(resource_path, 'r', encoding='UTF-8') as file_read:
-                while True:
-                    line = file_read.readline()
-
-                    if not line:
-                        if travel_time_sec != 0:
-                            travel_times.append(travel_time_sec)
-                            dates.append(current_header.datetime.strftime('%d %b'))
-                        break
-
-                    elif Header.is_header(line):
-                        last_header = copy(current_header)
-                        current_header = Header(line)
-
-                        if travel_time_sec != 0 and current_header.datetime.date() != last_header.datetime.date():
-                            travel_times.append(travel_time_sec)
-                            dates.append(last_header.datetime.strftime('%d %b'))
-                            travel_time_sec = 0
-
-                        skip_header = not is_datetime_in_interval(current_header.datetime, datetime_start, datetime_end)
-                        current_reading = previous_reading = None
-
-                    elif Reading.is_reading(line) and not skip_header and current_header:
-                        current_reading = CountedReading(Reading(line), current_header.spokes_cnt, current_header.wheel_circ, current_header.max_voltage, current_header.save_delay)
-
-                        if previous_reading:
-                            travel_time_sec += (abs(previous_reading.millis_passed - current_reading.millis_passed) / 1000)
-
-                        previous_reading = copy(current_reading)
-
-            if len(travel_times) != 0:
-                bar_graph_config.values_x = dates
-                bar_graph_config.values_y = travel_times
-                bar_graph_config.label_x = 'Day'
-                bar_graph_config.label_y = 'Travel time (sec)'
-                bar_graph_config.label_fig = "Travel time by day"
-            else:
-                logger.info("No travel time was found for specified conditions")
-                return
-
+            column, label_y, label_fig = 'travel_time', 'Travel time (sec)', "Travel time by day"
         elif namespace.travel_distance:
-            travel_distances, dates = [], []
-
-            travel_distance_km = 0
-            current_header = last_header = current_reading = previous_reading = None
-            skip_header = False
-
-            with open(resource_path, 'r', encoding='UTF-8') as file_read:
-                while True:
-                    line = file_read.readline()
-
-                    if not line:
-                        if travel_distance_km != 0:
-                            travel_distances.append(travel_distance_km)
-                            dates.append(current_header.datetime.strftime('%d %b'))
-                        break
-
-                    elif Header.is_header(line):
-                        last_header = copy(current_header)
-                        current_header = Header(line)
-                        
-                        if travel_distance_km != 0 and current_header.datetime.date() != last_header.datetime.date():
-                            travel_distances.append(travel_distance_km)
-                            dates.append(last_header.datetime.strftime('%d %b'))
-                            travel_distance_km = 0
-
-                        skip_header = not is_datetime_in_interval(current_header.datetime, datetime_start, datetime_end)
-                        current_reading = previous_reading = None
-
-                    elif Reading.is_reading(line) and not skip_header and current_header:
-                        current_reading = CountedReading(Reading(line), current_header.spokes_cnt, current_header.wheel_circ, current_header.max_voltage, current_header.save_delay)
-
-                        if previous_reading:
-                            travel_distance_km += Calculator.calculate_travel_distance(current_reading.speed_kmh, current_reading.millis_passed, previous_reading.millis_passed)
-
-                        previous_reading = copy(current_reading)
-
-            if len(travel_distances) != 0:
-                bar_graph_config.values_x = dates
-                bar_graph_config.values_y = travel_distances
-                bar_graph_config.label_x = 'Day'
-                bar_graph_config.label_y = 'Travel distance (km)'
-                bar_graph_config.label_fig = "Travel distance by day"
-            else:
-                logger.info("No travel distances were found for specified conditions")
-                return
-
+            column, label_y, label_fig = 'travel_distance', 'Travel distance (km)', "Travel distance by day"
         else:
-            logger.error("Display target not selected (--average-acceleration / --travel-distance)")
+            logger.error("Display target not selected (--travel-time / --travel-distance / --speed / --voltage)")
             cls.SUBPARSER.print_help()
             return
+
+        # NOTE - Days of several files are combined, values of the same day are summed, other resolutions are resampled from the readings
+        if namespace.resolution[0] == '1d':
+            bars_values = VectorizedCalculator.sum_files_by_day(resource_paths, datetime_start, datetime_end, column)
+        else:
+            buckets = VectorizedCalculator.resample_files(resource_paths, datetime_start, datetime_end, namespace.resolution[0])
+            bars_values = {bucket_datetime: value for bucket_datetime, value in zip(buckets['datetime'].astype('datetime64[s]').tolist(), buckets[column].tolist()) if value != 0}
+
+        if len(bars_values) > GraphSubParser.MAXIMAL_BARS_CNT:
+            logger.error(f"Graph would have {len(bars_values)} bars (maximum: {GraphSubParser.MAXIMAL_BARS_CNT}), choose a coarser --resolution or a shorter interval")
+            return
+        elif len(bars_values) == 0:
+            logger.info("No travel time was found for specified conditions" if namespace.travel_time else "No travel distances were found for specified conditions")
+            return
+
+        bar_graph_config.values_x = [bar_datetime.strftime(GraphSubParser.LABEL_FORMATS[namespace.resolution[0]]) for bar_datetime in bars_values]
+        bar_graph_config.values_y = list(bars_values.values())
+        bar_graph_config.label_x = 'Day' if namespace.resolution[0] == '1d' else 'Time'
+        bar_graph_config.label_y = label_y
+        bar_graph_config.label_fig = label_fig
     
-        fig, ax = plt.subplots(num=bar_graph_config.label_fig)
-        fig.set_figwidth = 100
-        fig.set_figheight = 100
-        plt.xlabel(bar_graph_config.label_x, weight='bold')
-        plt.ylabel(bar_graph_config.label_y, weight='bold')
-        ax.bar(bar_graph_config.values_x, bar_graph_config.values_y)
-        ax.set_facecolor('seashell')
-        fig.set_facecolor('floralwhite')
-        GraphSubParser.draw_values(bar_graph_config.values_x, bar_graph_config.values_y, decimal_places)
+        # NOTE - Time of the opened window is not measured
+        with Profiler.stage('render'):
+            fig, ax = plt.subplots(num=bar_graph_config.label_fig)
+            fig.set_figwidth = 100
+            fig.set_figheight = 100
+            plt.xlabel(bar_graph_config.label_x, weight='bold')
+            plt.ylabel(bar_graph_config.label_y, weight='bold')
+            ax.bar(bar_graph_config.values_x, bar_graph_config.values_y)
+            ax.set_facecolor('seashell')
+            fig.set_facecolor('floralwhite')
+            GraphSubParser.draw_values(bar_graph_config.values_x, bar_graph_config.values_y, decimal_places)
+        plt.show()
+
+    @staticmethod
+    def draw_series(resource_paths: List[str], datetime_start: datetime, datetime_end: datetime, column: str) -> None:
+        '''Line graph of the speed or voltage of the readings, long series are reduced by largest-triangle-three-buckets'''
+        series = VectorizedCalculator.get_series(resource_paths, datetime_start, datetime_end, column, GraphSubParser.MAXIMAL_POINTS_CNT, GraphSubParser.LINE_GAP_MILLIS)
+        if len(series['millis']) == 0:
+            logger.info("No readings were found for specified conditions")
+            return
+
+        with Profiler.stage('compute'):
+            points_millis, points_values = Downsampler.downsample(series['millis'], series['values'], series['breaks'], GraphSubParser.MAXIMAL_POINTS_CNT)
+
+        line_graph_config = LineGraphConfig()
+        line_graph_config.values_x = points_millis.astype('datetime64[ms]')
+        line_graph_config.values_y = points_values
+        line_graph_config.label_x = 'Time'
+        line_graph_config.label_y = 'Speed (km/h)' if column == 'speed' else 'Voltage (v)'
+        line_graph_config.label_fig = "Speed over time" if column == 'speed' else "Voltage over time"
+
+        # NOTE - Time of the opened window is not measured
+        with Profiler.stage('render'):
+            fig, ax = plt.subplots(num=line_graph_config.label_fig)
+            plt.xlabel(line_graph_config.label_x, weight='bold')
+            plt.ylabel(line_graph_config.label_y, weight='bold')
+            ax.plot(line_graph_config.values_x, line_graph_config.values_y, linewidth=0.8)
+            ax.set_facecolor('seashell')
+            fig.set_facecolor('floralwhite')
+            fig.autofmt_xdate()
         plt.show()
 
     @staticmethod
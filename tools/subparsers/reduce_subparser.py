@@ -2,7 +2,6 @@
 
 from argparse import _SubParsersAction, Namespace
 from loguru import logger
-from models.readable_file import ReadableFile
 from tools.file_parser import FileParser
 
 class ReduceSubParser:
@@ -12,15 +11,18 @@ class ReduceSubParser:
     def add_subparser(subparsers: _SubParsersAction) -> _SubParsersAction:
         '''Creating a subparser'''
         reduce_subparser = subparsers.add_parser('reduce', description='Reducing incoming data or files against patterns')
-        reduce_subparser.add_argument('-i', '--input', nargs=1, type=ReadableFile, required=True, help='Path to the file with readings')
+        reduce_subparser.add_argument('-i', '--input', nargs=1, type=str, required=True, help='Path to the file with readings (lines that are neither headers nor readings are removed too)')
+        reduce_subparser.add_argument('-ip', '--in-place', action='store_true', help='Rewrite the file itself instead of creating a reduced copy (no extra disk space is needed)')
         return subparsers
 
     @staticmethod
     def run_reduce(namespace: Namespace) -> None:
         '''Run if reduce subparser was called'''
-        file_path = FileParser.reduce_readings(file_path=namespace.input[0].name)
+        file_path = FileParser.reduce_readings(file_path=namespace.input[0], in_place=namespace.in_place)
     
-        if file_path is not None:
-            logger.success(f"File {namespace.input[0].name} successfully reduced, result available at: {file_path}")
+        if file_path is None:
+            logger.error("It was not possible to perform the reduction because the operation was interrupted")
+        elif namespace.in_place:
+            logger.success(f"File {namespace.input[0]} successfully reduced in place")
         else:
-            logger.error("It was not possible to perform the reduction because the operation was interrupted")
\ No newline at end of file
+            logger.success(f"File {namespace.input[0]} successfully reduced, result available at: {file_path}")
@@ -0,0 +1,50 @@
+'''ServeSubParser location'''
+
+import time
+from argparse import _SubParsersAction, Namespace
+from loguru import logger
+from models.readable_file import ReadableFile
+from tools.file_parser import FileParser
+from tools.query_server import QueryServer
+
+class ServeSubParser:
+    '''Local HTTP service answering queries with JSON from files that are checked and loaded once'''
+
+    HOST = '127.0.0.1'
+
+    @staticmethod
+    def add_subparser(subparsers: _SubParsersAction) -> _SubParsersAction:
+        '''Creating a subparser'''
+        serve_subparser = subparsers.add_parser('serve', description='Local HTTP server answering calc, show and graph queries with JSON from files loaded into memory once')
+        serve_subparser.add_argument('-i', '--input', nargs='+', type=str, required=True, help='Paths to files with readings, directories or glob patterns to serve')
+        serve_subparser.add_argument('-p', '--port', nargs=1, type=int, default=[8080], help='Port of the server on localhost (default: 8080)')
+        serve_subparser.add_argument('-w', '--workers', nargs=1, type=int, default=[8], help='Number of threads handling requests at once (default: 8)')
+        return subparsers
+
+    @staticmethod
+    def run_serve(namespace: Namespace) -> None:
+        '''Run if serve subparser was called'''
+        if namespace.workers[0] <= 0:
+            logger.error("Count of --workers must be more than 0")
+            return
+
+        start_time = time.perf_counter()
+        resource_paths = [resource.name for resource in ReadableFile.collect(namespace.input)]
+
+        # NOTE - Everything queries need is loaded now, answers are calculated from memory
+        lines_cnt = sum(FileParser.preload(resource_path) for resource_path in resource_paths)
+
+        try:
+            server = QueryServer((ServeSubParser.HOST, namespace.port[0]), resource_paths, namespace.workers[0])
+        except OSError as error:
+            logger.error(f"Failed to start the server on port {namespace.port[0]}: {error}")
+            return
+
+        logger.success(f"Loaded {len(resource_paths)} file(s) with {lines_cnt} lines in {round(time.perf_counter() - start_time, 3)} seconds, serving at http://{ServeSubParser.HOST}:{server.server_port} (Ctrl-C to stop)")
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print()
+        finally:
+            server.server_close()
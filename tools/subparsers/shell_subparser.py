@@ -0,0 +1,91 @@
+'''ShellSubParser location'''
+
+import time
+import shlex
+from argparse import _SubParsersAction, Namespace
+from typing import List
+from colorama import Fore, Style
+from loguru import logger
+from models.readable_file import ReadableFile
+from models.exceptions import Error
+from tools.file_parser import FileParser
+from tools.command_parser import CommandParser
+from tools.display_utils import Color
+
+# NOTE - Module is not available on Windows, the prompt works without history there
+try:
+    import readline
+except ImportError:
+    readline = None
+
+class ShellSubParser:
+    '''Interactive queries to files that are checked and loaded once'''
+
+    PROMPT = 'marp> '
+    EXIT_COMMANDS = ('exit', 'quit')
+
+    # NOTE - Commands that get the files of the shell if their input is not specified (only those taking several files, others need their own input)
+    INPUT_COMMANDS = ('show', 'calc', 'graph', 'check')
+
+    @staticmethod
+    def add_subparser(subparsers: _SubParsersAction) -> _SubParsersAction:
+        '''Creating a subparser'''
+        shell_subparser = subparsers.add_parser('shell', description='Interactive prompt for commands (show, calc, graph...) answered from files loaded into memory once')
+        shell_subparser.add_argument('-i', '--input', nargs='+', type=str, required=True, help='Paths to files with readings, directories or glob patterns used by commands without their own input')
+        return subparsers
+
+    @staticmethod
+    def run_shell(namespace: Namespace) -> None:
+        '''Run if shell subparser was called'''
+        start_time = time.perf_counter()
+        resource_paths = [resource.name for resource in ReadableFile.collect(namespace.input)]
+
+        # NOTE - Everything commands need is loaded now, following queries take it from memory
+        lines_cnt = sum(FileParser.preload(resource_path) for resource_path in resource_paths)
+
+        logger.success(f"Loaded {len(resource_paths)} file(s) with {lines_cnt} lines in {round(time.perf_counter() - start_time, 3)} seconds, enter commands as for marp ({' / '.join(ShellSubParser.EXIT_COMMANDS)} to leave)")
+
+        while True:
+            try:
+                query = input(ShellSubParser.PROMPT).strip()
+            except (EOFError, KeyboardInterrupt):
+                print()
+                break
+
+            if query in ShellSubParser.EXIT_COMMANDS:
+                break
+            elif len(query) != 0:
+                ShellSubParser.run_query(query, resource_paths)
+
+    @staticmethod
+    def run_query(query: str, resource_paths: List[str]) -> None:
+        '''Run the command of the query and display the time it took'''
+        try:
+            args = ShellSubParser.add_input(shlex.split(query), resource_paths)
+        except ValueError as error:
+            logger.error(f"Failed to read the command: {error}")
+            return
+
+        if len(args) != 0 and args[0] == 'shell':
+            logger.error("Shell is already running")
+            return
+
+        start_time = time.perf_counter()
+        try:
+            CommandParser.run(args)
+        except Error:
+            pass
+        except KeyboardInterrupt:
+            print()
+        except Exception as error:
+            # NOTE - Unexpected failure of one query should not close the shell with the loaded files
+            logger.exception(error)
+
+        Color.cprint(msg=f"Time spent: {round(time.perf_counter() - start_time, 3)} seconds", fore=Fore.WHITE, style=Style.DIM)
+
+    @staticmethod
+    def add_input(args: List[str], resource_paths: List[str]) -> List[str]:
+        '''Arguments of the command with the files of the shell if the command needs an input and does not have one'''
+        if len(args) == 0 or args[0] not in ShellSubParser.INPUT_COMMANDS or '-i' in args or '--input' in args:
+            return args
+        return [args[0], '-i', *resource_paths, *args[1:]]
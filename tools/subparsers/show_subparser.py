@@ -2,11 +2,17 @@
 
 from argparse import _SubParsersAction, Namespace
 from datetime import datetime
+from typing import List
 from loguru import logger
 from tools.file_parser import FileParser
+from tools.vectorized_calculator import VectorizedCalculator
+from tools.accumulators import TimeBucketsAccumulator
+from tools.readings_renderer import ReadingsRenderer
+from tools.profiler import Profiler
 from tools.additional_datetime_utils import try_parse_datetime
 from models.config import Config
 from models.readable_file import ReadableFile
+from tools.display_utils import ConstantValueOutput, BufferedOutput
 
 class ShowSubParser:
     '''Output files or other data'''
@@ -15,17 +21,19 @@ class ShowSubParser:
     def add_subparser(cls, subparsers: _SubParsersAction) -> _SubParsersAction:
         '''Creating a subparser'''
         show_subparser = subparsers.add_parser('show', description='Displaying values on the screen without calculating any information')
-        show_subparser.add_argument('-i', '--input', nargs=1, type=ReadableFile, required=True, help='Path to the file with readings')
+        show_subparser.add_argument('-i', '--input', nargs='+', type=str, required=True, help='Paths to files with readings, directories or glob patterns (files are processed together)')
         
         # NOTE - One of this targets must be specified
         show_subparser.add_argument('-he', '--header', action='store_true', help='Display the headers available by day (repetitions are ignored)')
         show_subparser.add_argument('-re', '--reading', action='store_true', help='Display all available raw readings')
         show_subparser.add_argument('-cr', '--calculated-reading', action='store_true', help='Display readings with already calculated speed and voltage')
         show_subparser.add_argument('-lc', '--line-count', action='store_true', help='Display number of lines in file')
+        show_subparser.add_argument('-ri', '--rides', action='store_true', help='Display rides split by stops (duration, distance, speeds and voltage drop of each), found once and cached')
 
         # NOTE - Modes of visualisation
         show_subparser.add_argument('-r', '--raw', action='store_true', help='Display values without visual processing')
         show_subparser.add_argument('-e', '--enumerate', action='store_true', help='Number displayed values')
+        show_subparser.add_argument('-rs', '--resolution', nargs=1, type=str, choices=list(TimeBucketsAccumulator.RESOLUTIONS), help='Display calculated readings by buckets of time (mean, minimum and maximum of each bucket) instead of every reading')
         show_subparser.add_argument('-d', '--date-time', nargs='+', help='Readings or headers written in specified day and time (specify two for the range) (dd.mm.yyyy or dd.mm.yyyy-hh:mm:ss)')
         
         cls.SUBPARSER = show_subparser
@@ -34,7 +42,7 @@ class ShowSubParser:
     @classmethod
     def run_show(cls, namespace: Namespace) -> None:
         '''Run if Show subparser was called'''
-        resource_path = namespace.input[0].name
+        resource_paths = [resource.name for resource in ReadableFile.collect(namespace.input)]
         config = Config.collect()
 
         # NOTE - Check the correctness of the passed arguments --date-time
@@ -46,17 +54,58 @@ class ShowSubParser:
             return
 
 
-        # SECTION - Processing targets: --header --reading --calculated-reading --line-count
+        # SECTION - Processing targets: --header --reading --calculated-reading --line-count --rides
         if namespace.line_count:
-            print(f"Lines in requested file: {FileParser.count_lines(file_path=resource_path)}")
-        
+            lines_cnts = [FileParser.count_lines(file_path=resource_path) for resource_path in resource_paths]
+            if len(resource_paths) > 1:
+                for resource_path, lines_cnt in zip(resource_paths, lines_cnts):
+                    print(f"Lines in {resource_path}: {lines_cnt}")
+                print(f"Lines in requested files: {sum(lines_cnts)}")
+            else:
+                print(f"Lines in requested file: {lines_cnts[0]}")
+
         elif namespace.header:
-            FileParser.show_headers(file_path=resource_path, datetime_start=datetime_start, datetime_end=datetime_end, raw=namespace.raw, to_enumerate=namespace.enumerate)
+            for resource_path in resource_paths:
+                ShowSubParser.show_title(resource_paths, resource_path)
+                FileParser.show_headers(file_path=resource_path, datetime_start=datetime_start, datetime_end=datetime_end, raw=namespace.raw, to_enumerate=namespace.enumerate)
+
+        elif namespace.resolution and not namespace.calculated_reading:
+            logger.error("Only calculated readings can be displayed with --resolution (--calculated-reading)")
+
+        elif namespace.resolution:
+            for resource_path in resource_paths:
+                ShowSubParser.show_title(resource_paths, resource_path)
+                ShowSubParser.show_buckets(resource_path, datetime_start, datetime_end, namespace.resolution[0], raw=namespace.raw, to_enumerate=namespace.enumerate)
 
         elif namespace.reading or namespace.calculated_reading:
-            FileParser.show_readings(file_path=resource_path, datetime_start=datetime_start, datetime_end=datetime_end, calculated=namespace.calculated_reading, raw=namespace.raw, to_enumerate=namespace.enumerate, config=config)
+            for resource_path in resource_paths:
+                ShowSubParser.show_title(resource_paths, resource_path)
+                FileParser.show_readings(file_path=resource_path, datetime_start=datetime_start, datetime_end=datetime_end, calculated=namespace.calculated_reading, raw=namespace.raw, to_enumerate=namespace.enumerate, config=config)
+
+        elif namespace.rides:
+            for resource_path in resource_paths:
+                ShowSubParser.show_title(resource_paths, resource_path)
+                FileParser.show_rides(file_path=resource_path, datetime_start=datetime_start, datetime_end=datetime_end, config=config, raw=namespace.raw, to_enumerate=namespace.enumerate)
 
         else:
-            logger.error("Display target not selected --header / --reading / --calculated-reading / --line-count)")
+            logger.error("Display target not selected --header / --reading / --calculated-reading / --line-count / --rides)")
             cls.SUBPARSER.print_help()
-        # !SECTION
\ No newline at end of file
+        # !SECTION
+
+    @staticmethod
+    @Profiler.measure('render')
+    def show_buckets(resource_path: str, datetime_start: datetime, datetime_end: datetime, resolution: str, raw=False, to_enumerate=False) -> None:
+        '''Output of calculated readings of the file resampled to buckets of the resolution'''
+        buckets = VectorizedCalculator.resample_files([resource_path], datetime_start, datetime_end, resolution)
+
+        with BufferedOutput() as output:
+            output.write_lines(ReadingsRenderer.format_buckets(buckets, raw=raw, to_enumerate=to_enumerate))
+
+        if len(buckets['datetime']) == 0:
+            logger.info('No readings was found on specified datetime')
+
+    @staticmethod
+    def show_title(resource_paths: List[str], resource_path: str) -> None:
+        '''Output of the file name before its values (only if several files are requested)'''
+        if len(resource_paths) > 1:
+            ConstantValueOutput('File', resource_path).display()
@@ -0,0 +1,163 @@
+'''VectorizedCalculator location'''
+
+from copy import deepcopy
+from datetime import date, datetime
+from typing import Dict, List, Tuple
+import numpy as np
+from models.readings_store import ReadingsStore
+from models.section_values import SectionValues
+from models.counted_reading import CountedReading
+from tools.file_parser import FileParser
+from tools.parallel import Parallel
+from tools.profiler import Profiler
+from tools.accumulators import Accumulator, TimeBucketsAccumulator, SeriesAccumulator, VoltageIntervalAccumulator, AverageAccelerationAccumulator, AverageSpeedAccumulator, TravelTimeAccumulator, TravelDistanceAccumulator
+
+class VectorizedCalculator:
+    '''Calculation of values over whole header sections with NumPy'''
+
+    # NOTE - Targets of calc computed by accumulators (in the order of the output)
+    TARGETS = ('voltage_interval', 'average_acceleration', 'average_deceleration', 'average_speed', 'travel_time', 'travel_distance')
+
+    BUCKETS_PER_POINT = 4
+
+    @staticmethod
+    def create_accumulator(target: str, minimal_voltage_search: int) -> Accumulator:
+        '''Empty accumulator of the calc target'''
+        if target == 'voltage_interval':
+            return VoltageIntervalAccumulator(minimal_voltage_search)
+        elif target == 'average_acceleration':
+            return AverageAccelerationAccumulator(find_increase=True)
+        elif target == 'average_deceleration':
+            return AverageAccelerationAccumulator(find_increase=False)
+        elif target == 'average_speed':
+            return AverageSpeedAccumulator()
+        elif target == 'travel_time':
+            return TravelTimeAccumulator()
+        elif target == 'travel_distance':
+            return TravelDistanceAccumulator()
+        raise ValueError(f"Unknown calculation target: {target}")
+
+    @staticmethod
+    def get_section_values(store: ReadingsStore, header_inx: int, millis_passed: np.ndarray, impulse_cnt: np.ndarray, analog_voltage: np.ndarray) -> SectionValues:
+        '''Speeds and voltages of the readings using the configuration of the section header'''
+        speeds_kmh = CountedReading.calculate_speeds(impulse_cnt, int(store.headers['spokes_cnt'][header_inx]), int(store.headers['wheel_circ'][header_inx]), float(store.headers['save_delay'][header_inx]))
+        voltages_v = CountedReading.calculate_voltages(analog_voltage, int(store.headers['max_voltage'][header_inx]))
+        return SectionValues(header_inx, millis_passed, speeds_kmh, voltages_v, store.headers['datetime'][header_inx].astype('datetime64[ms]'))
+
+    @staticmethod
+    @Profiler.measure('compute')
+    def accumulate(file_path: str, datetime_start: datetime, datetime_end: datetime, accumulators: List[Accumulator]) -> None:
+        '''Update all accumulators from the rollups of whole days, the rest of them in a single pass over the sections of the file
+
+        Parts of the sections are processed in parallel
+        '''
+        sections = FileParser.get_index(file_path).find_sections(datetime_start, datetime_end)
+        rows = ReadingsStore.load_rollups(file_path).select(sections, datetime_start, datetime_end)
+
+        if rows is not None:
+            accumulators = [accumulator for accumulator in accumulators if not accumulator.update_days(rows)]
+            if len(accumulators) == 0:
+                Profiler.count_lines(int(rows['readings_cnt'].sum()))
+                return
+
+        parts = Parallel.split_range(sections)
+
+        if len(parts) <= 1:
+            VectorizedCalculator.accumulate_sections(file_path, datetime_start, datetime_end, sections, accumulators)
+            return
+
+        # NOTE - Every part gets empty copies of the accumulators, results are merged in file order
+        for part_accumulators in Parallel.map(VectorizedCalculator.accumulate_sections, [(file_path, datetime_start, datetime_end, part, deepcopy(accumulators)) for part in parts]):
+            for accumulator, part_accumulator in zip(accumulators, part_accumulators):
+                accumulator.merge(part_accumulator)
+
+    @staticmethod
+    @Profiler.measure('compute')
+    def accumulate_files(file_paths: List[str], datetime_start: datetime, datetime_end: datetime, accumulators: List[Accumulator]) -> None:
+        '''Update all accumulators with several files, files are processed at once by separate processes'''
+        if len(file_paths) == 1:
+            VectorizedCalculator.accumulate(file_paths[0], datetime_start, datetime_end, accumulators)
+            return
+
+        for file_accumulators in Parallel.map(VectorizedCalculator.accumulate_file, [(file_path, datetime_start, datetime_end, deepcopy(accumulators)) for file_path in file_paths]):
+            for accumulator, file_accumulator in zip(accumulators, file_accumulators):
+                accumulator.merge(file_accumulator)
+
+    @staticmethod
+    def accumulate_file(file_path: str, datetime_start: datetime, datetime_end: datetime, accumulators: List[Accumulator]) -> List[Accumulator]:
+        '''Update accumulators with the file and return them'''
+        VectorizedCalculator.accumulate(file_path, datetime_start, datetime_end, accumulators)
+        return accumulators
+
+    @staticmethod
+    def accumulate_sections(file_path: str, datetime_start: datetime, datetime_end: datetime, sections: range, accumulators: List[Accumulator]) -> List[Accumulator]:
+        '''Update accumulators with the specified sections and return them'''
+        store = ReadingsStore.load(file_path)
+
+        for header_inx, millis_passed, impulse_cnt, analog_voltage in store.iter_sections(datetime_start, datetime_end, sections):
+            section = VectorizedCalculator.get_section_values(store, header_inx, millis_passed, impulse_cnt, analog_voltage)
+            Profiler.count_lines(len(millis_passed))
+            for accumulator in accumulators:
+                accumulator.update(section)
+
+        return accumulators
+
+    @staticmethod
+    def sum_by_day(file_path: str, datetime_start: datetime, datetime_end: datetime, column: str) -> Dict[date, float]:
+        '''Total of the rollups column (travel time or distance) for each day of the headers within the interval'''
+        store = ReadingsStore.load(file_path)
+        sections = FileParser.get_index(file_path).find_headers(datetime_start, datetime_end)
+        days_values = {}
+
+        for header_inx, section_value in zip(sections, ReadingsStore.load_rollups(file_path).sum_sections(sections, column).tolist()):
+            day = store.get_header(header_inx).datetime.date()
+            days_values[day] = days_values.get(day, 0) + section_value
+
+        return days_values
+
+    @staticmethod
+    @Profiler.measure('compute')
+    def sum_files_by_day(file_paths: List[str], datetime_start: datetime, datetime_end: datetime, column: str) -> Dict[date, float]:
+        '''Totals of several files for each day (values of the same day are summed), days without a value are left out'''
+        days_values = {}
+        for file_days_values in Parallel.map(VectorizedCalculator.sum_by_day, [(file_path, datetime_start, datetime_end, column) for file_path in file_paths]):
+            for day, value in file_days_values.items():
+                days_values[day] = days_values.get(day, 0) + value
+
+        return {day: days_values[day] for day in sorted(days_values) if days_values[day] != 0}
+
+    @staticmethod
+    def resample_files(file_paths: List[str], datetime_start: datetime, datetime_end: datetime, resolution: str) -> Dict[str, np.ndarray]:
+        '''Values of the readings within the interval by buckets of the resolution (1s, 1m, 1h or 1d), buckets of several files are joined'''
+        accumulator = TimeBucketsAccumulator(resolution)
+        VectorizedCalculator.accumulate_files(file_paths, datetime_start, datetime_end, [accumulator])
+        return accumulator.result()
+
+    @staticmethod
+    def get_series(file_paths: List[str], datetime_start: datetime, datetime_end: datetime, column: str, points_cnt: int, gap_millis: int) -> Dict[str, np.ndarray]:
+        '''Speed (km/h) or voltage (v) of the readings within the interval reduced to a few points of every time bucket (see SeriesAccumulator), enough for points_cnt points'''
+        first_millis, last_millis = VectorizedCalculator.find_time_span(file_paths, datetime_start, datetime_end)
+
+        # NOTE - Readings fill only a part of the buckets (rides), so there are several buckets for every point that is drawn
+        accumulator = SeriesAccumulator(column, max((last_millis - first_millis) // (points_cnt * VectorizedCalculator.BUCKETS_PER_POINT), 1), gap_millis)
+        VectorizedCalculator.accumulate_files(file_paths, datetime_start, datetime_end, [accumulator])
+        return accumulator.result()
+
+    @staticmethod
+    def find_time_span(file_paths: List[str], datetime_start: datetime, datetime_end: datetime) -> Tuple[int, int]:
+        '''First and last moments (milliseconds since the epoch) of the sections of the files within the interval, found from the indexes of headers'''
+        sections_starts, sections_ends = [], []
+
+        for file_path in file_paths:
+            index = FileParser.get_index(file_path)
+            sections = index.find_sections(datetime_start, datetime_end)
+            if len(sections) != 0:
+                headers_millis = index.columns['datetime'][sections.start:sections.stop].astype('datetime64[ms]').astype(np.int64)
+                sections_starts.append(int(headers_millis.min()))
+                sections_ends.append(int((headers_millis + index.columns['last_millis'][sections.start:sections.stop]).max()))
+
+        if len(sections_starts) == 0:
+            return 0, 0
+
+        start_millis, end_millis = (int(np.datetime64(moment, 'ms').astype(np.int64)) for moment in (datetime_start, datetime_end))
+        return max(min(sections_starts), start_millis), max(min(max(sections_ends), end_millis), start_millis)